@@ -15,6 +15,7 @@ sys.path.append(str(Path(__file__).parent.parent))
 
 from app.core.config import settings
 from app.db import Base
+from app.db.url import to_asyncpg_url
 
 # Import all models to ensure they're registered
 from app.models.user import User
@@ -24,9 +25,8 @@ from app.models.subject import Subject
 config = context.config
 
 # Convert the database URL to async version+
-database_url = settings.DATABASE_URL
-if database_url.startswith("postgresql://"):
-    database_url = database_url.replace("postgresql://", "postgresql+asyncpg://", 1)
+database_url = to_asyncpg_url(settings.DATABASE_URL)
+if database_url != settings.DATABASE_URL:
     logger.info("Converted DATABASE_URL to use asyncpg driver")
 
 # Set the database URL from settings
@@ -15,7 +15,7 @@ efficient vector similarity search operations.
 from alembic import op
 import sqlalchemy as sa
 from sqlalchemy.dialects import postgresql
-from pgvector.sqlalchemy import Vector
+from pgvector.sqlalchemy import HALFVEC
 from typing import Union, Sequence
 
 # revision identifiers, used by Alembic.
@@ -24,6 +24,44 @@ down_revision: Union[str, Sequence[str], None] = '45bc5e0d1181'
 branch_labels: Union[str, Sequence[str], None] = None
 depends_on: Union[str, Sequence[str], None] = None
 
+# document_embeddings is hash-partitioned on chunk_id into this many partitions
+EMBEDDING_PARTITIONS = 8
+
+
+def _pgvector_version() -> tuple:
+    """Return the installed pgvector version as a tuple of ints, e.g. (0, 7, 0)."""
+    version = op.get_bind().execute(
+        sa.text("SELECT extversion FROM pg_extension WHERE extname = 'vector'")
+    ).scalar()
+    if not version:
+        return (0,)
+    return tuple(int(part) for part in version.split('.') if part.isdigit())
+
+
+def _hnsw_supports_include() -> bool:
+    """Check whether the installed hnsw access method accepts INCLUDE columns."""
+    return bool(op.get_bind().execute(
+        sa.text(
+            "SELECT pg_indexam_has_property(oid, 'can_include') "
+            "FROM pg_am WHERE amname = 'hnsw'"
+        )
+    ).scalar())
+
+
+def _create_partitioned_index(index_name: str, index_definition: str) -> None:
+    """
+    Create an index on every document_embeddings partition and attach it to the parent.
+
+    Building each partition's index separately keeps every HNSW graph small
+    and lets each build use the parallel maintenance workers.
+    """
+    op.execute(f"CREATE INDEX {index_name} ON ONLY document_embeddings USING {index_definition}")
+    for i in range(EMBEDDING_PARTITIONS):
+        op.execute(
+            f"CREATE INDEX {index_name}_p{i} ON document_embeddings_p{i} USING {index_definition}"
+        )
+        op.execute(f"ALTER INDEX {index_name} ATTACH PARTITION {index_name}_p{i}")
+
 
 def upgrade() -> None:
     """
@@ -63,7 +101,7 @@ def upgrade() -> None:
         sa.Column('processing_error', sa.Text(), nullable=True),
         sa.Column('processing_started_at', sa.DateTime(timezone=True), nullable=True),
         sa.Column('processing_completed_at', sa.DateTime(timezone=True), nullable=True),
-        sa.Column('metadata_', sa.JSON(), nullable=True, default={}),
+        sa.Column('metadata_', postgresql.JSONB(), nullable=True, default={}),
         sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
         sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
         sa.PrimaryKeyConstraint('id'),
@@ -72,7 +110,7 @@ def upgrade() -> None:
     )
     
     # Create indexes for documents table
-    op.create_index('ix_documents_id', 'documents', ['id'])
+    # (the primary keys already provide a unique index on id)
     op.create_index('ix_documents_subject_id', 'documents', ['subject_id'])
     op.create_index('ix_documents_owner_id', 'documents', ['owner_id'])
     op.create_index('ix_documents_processing_status', 'documents', ['processing_status'])
@@ -80,13 +118,19 @@ def upgrade() -> None:
     # Create document_chunks table
     op.create_table(
         'document_chunks',
-        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('id', sa.BigInteger(), nullable=False),
         sa.Column('document_id', postgresql.UUID(as_uuid=True), nullable=False),
         sa.Column('chunk_index', sa.Integer(), nullable=False),
         sa.Column('chunk_text', sa.Text(), nullable=False),
         sa.Column('start_char', sa.Integer(), nullable=True),
         sa.Column('end_char', sa.Integer(), nullable=True),
-        sa.Column('metadata_', sa.JSON(), nullable=True, default={}),
+        sa.Column('metadata_', postgresql.JSONB(), nullable=True, default={}),
+        # Full-text search vector kept in sync by Postgres, for hybrid (keyword + vector) search
+        sa.Column(
+            'chunk_tsv',
+            postgresql.TSVECTOR(),
+            sa.Computed("to_tsvector('english', chunk_text)", persisted=True),
+        ),
         sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
         sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
         sa.PrimaryKeyConstraint('id'),
@@ -94,41 +138,85 @@ def upgrade() -> None:
     )
     
     # Create indexes for document_chunks table
-    op.create_index('ix_document_chunks_id', 'document_chunks', ['id'])
     op.create_index('ix_document_chunks_document_id', 'document_chunks', ['document_id'])
     # Composite index for efficient chunk ordering within a document
     op.create_index('ix_document_chunks_doc_index', 'document_chunks', ['document_id', 'chunk_index'])
+    # GIN index for full-text queries on the chunk text
+    op.create_index('ix_document_chunks_tsv', 'document_chunks', ['chunk_tsv'], postgresql_using='gin')
     
     # Create document_embeddings table
+    # The table is hash-partitioned on chunk_id: every partition holds its own,
+    # smaller HNSW graph, so index builds and reindexes run per partition.
+    # Partitioned tables require the partition key in the primary key.
+    # chunk_id is BIGINT from the start: the type of a partition key column
+    # cannot be altered later.
     op.create_table(
         'document_embeddings',
-        sa.Column('id', sa.Integer(), nullable=False),
-        sa.Column('chunk_id', sa.Integer(), nullable=False),
-        sa.Column('embedding_vector', Vector(1536), nullable=False),  # Dimension for OpenAI ada-002
+        sa.Column('id', sa.BigInteger(), nullable=False, autoincrement=True),
+        sa.Column('chunk_id', sa.BigInteger(), nullable=False),
+        # Stored as half precision (FP16): half the storage and index size of vector(1536)
+        sa.Column('embedding_vector', HALFVEC(1536), nullable=False),  # Dimension for OpenAI ada-002
         sa.Column('model_name', sa.String(length=100), nullable=False, server_default='text-embedding-ada-002'),
         sa.Column('model_version', sa.String(length=50), nullable=True),
         sa.Column('embedding_dimension', sa.Integer(), nullable=False, server_default='1536'),
         sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
-        sa.PrimaryKeyConstraint('id'),
+        sa.PrimaryKeyConstraint('id', 'chunk_id'),
         sa.ForeignKeyConstraint(['chunk_id'], ['document_chunks.id'], ondelete='CASCADE'),
         sa.UniqueConstraint('chunk_id'),  # One embedding per chunk
+        postgresql_partition_by='HASH (chunk_id)',
     )
+    for i in range(EMBEDDING_PARTITIONS):
+        op.execute(
+            f"CREATE TABLE document_embeddings_p{i} PARTITION OF document_embeddings "
+            f"FOR VALUES WITH (modulus {EMBEDDING_PARTITIONS}, remainder {i})"
+        )
     
     # Create indexes for document_embeddings table
-    op.create_index('ix_document_embeddings_id', 'document_embeddings', ['id'])
     op.create_index('ix_document_embeddings_chunk_id', 'document_embeddings', ['chunk_id'])
     
-    # Create vector similarity search index using IVFFlat
-    # This index significantly speeds up similarity searches
-    # We use vector_cosine_ops for cosine similarity (most common for text)
-    # Note: For production with >1M vectors, consider using HNSW instead
+    # Binary-quantized shadow column, kept in sync by Postgres itself.
+    # It backs a compact Hamming-distance index used to prefilter candidates
+    # before rescoring them against the full halfvec column.
     op.execute("""
-        CREATE INDEX ix_document_embeddings_vector 
-        ON document_embeddings 
-        USING ivfflat (embedding_vector vector_cosine_ops)
-        WITH (lists = 100);
+        ALTER TABLE document_embeddings
+        ADD COLUMN embedding_bits bit(1536)
+        GENERATED ALWAYS AS (binary_quantize(embedding_vector)::bit(1536)) STORED;
     """)
     
+    # Create vector similarity search index using HNSW
+    # HNSW needs no training step (unlike IVFFlat) and keeps a better
+    # recall/QPS trade-off while documents are continuously ingested.
+    # We use halfvec_cosine_ops for cosine similarity (most common for text)
+    # Parallel HNSW builds are only available from pgvector 0.6 onwards,
+    # so the build memory/worker settings are applied only when supported.
+    build_settings_applied = _pgvector_version() >= (0, 6)
+    if build_settings_applied:
+        op.execute("SET maintenance_work_mem = '2GB'")
+        op.execute("SET max_parallel_maintenance_workers = 7")
+    # Search-time recall is tuned per transaction with hnsw.ef_search
+    # (see app.crud.document.set_ef_search) rather than globally.
+    # Cover chunk_id when the access method allows it, so ANN lookups can
+    # skip the heap fetch. Current pgvector releases do not support INCLUDE
+    # on hnsw, in which case the plain index is created instead.
+    include_clause = "INCLUDE (chunk_id)" if _hnsw_supports_include() else ""
+    _create_partitioned_index(
+        'ix_document_embeddings_vector',
+        f"hnsw (embedding_vector halfvec_cosine_ops) {include_clause} "
+        "WITH (m = 24, ef_construction = 128)",
+    )
+    
+    # HNSW index over the binary column for the optional prefilter pass
+    _create_partitioned_index(
+        'ix_document_embeddings_bits',
+        "hnsw (embedding_bits bit_hamming_ops)",
+    )
+    
+    # The build settings are session-wide: don't carry them into the
+    # migrations that run after this one
+    if build_settings_applied:
+        op.execute("RESET maintenance_work_mem")
+        op.execute("RESET max_parallel_maintenance_workers")
+    
     print("✅ Document tables created successfully with pgvector support")
 
 
@@ -141,20 +229,21 @@ def downgrade() -> None:
     """
     
     # Drop indexes first (in reverse order of creation)
+    # The HNSW vector indexes are created with raw SQL, so drop them the same way
+    op.execute('DROP INDEX IF EXISTS ix_document_embeddings_bits')
     op.execute('DROP INDEX IF EXISTS ix_document_embeddings_vector')
     op.drop_index('ix_document_embeddings_chunk_id', table_name='document_embeddings')
-    op.drop_index('ix_document_embeddings_id', table_name='document_embeddings')
     
+    op.drop_index('ix_document_chunks_tsv', table_name='document_chunks')
     op.drop_index('ix_document_chunks_doc_index', table_name='document_chunks')
     op.drop_index('ix_document_chunks_document_id', table_name='document_chunks')
-    op.drop_index('ix_document_chunks_id', table_name='document_chunks')
     
     op.drop_index('ix_documents_processing_status', table_name='documents')
     op.drop_index('ix_documents_owner_id', table_name='documents')
     op.drop_index('ix_documents_subject_id', table_name='documents')
-    op.drop_index('ix_documents_id', table_name='documents')
     
     # Drop tables (in reverse order due to foreign key constraints)
+    # Dropping the partitioned parent also drops its partitions
     op.drop_table('document_embeddings')
     op.drop_table('document_chunks')
     op.drop_table('documents')
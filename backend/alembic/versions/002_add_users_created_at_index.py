@@ -0,0 +1,31 @@
+"""Add index on users.created_at
+
+Revision ID: 002_add_users_created_at_index
+Revises: 001_add_documents
+Create Date: 2025-09-15 10:00:00.000000
+
+The admin dashboard counts registrations over time ranges
+(today, last 7 days, last 30 days). Without an index on
+users.created_at each of these aggregates scans the whole table.
+"""
+from alembic import op
+from typing import Union, Sequence
+
+# revision identifiers, used by Alembic.
+revision = '002_add_users_created_at_index'
+down_revision: Union[str, Sequence[str], None] = '001_add_documents'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create a descending B-tree index on users.created_at."""
+    op.execute(
+        'CREATE INDEX IF NOT EXISTS ix_users_created_at '
+        'ON users USING btree (created_at DESC)'
+    )
+
+
+def downgrade() -> None:
+    """Drop the users.created_at index."""
+    op.execute('DROP INDEX IF EXISTS ix_users_created_at')
@@ -0,0 +1,33 @@
+"""Add composite index on subjects (owner_id, created_at DESC)
+
+Revision ID: 003_add_subjects_owner_created_index
+Revises: 002_add_users_created_at_index
+Create Date: 2025-09-15 11:00:00.000000
+
+Subjects are listed per owner, newest first (e.g. the admin
+"user subjects" view). The composite index turns that lookup
+into a single index scan with no sort node.
+"""
+from alembic import op
+import sqlalchemy as sa
+from typing import Union, Sequence
+
+# revision identifiers, used by Alembic.
+revision = '003_add_subjects_owner_created_index'
+down_revision: Union[str, Sequence[str], None] = '002_add_users_created_at_index'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create the (owner_id, created_at DESC) index on subjects."""
+    op.create_index(
+        'ix_subjects_owner_created',
+        'subjects',
+        ['owner_id', sa.text('created_at DESC')],
+    )
+
+
+def downgrade() -> None:
+    """Drop the (owner_id, created_at DESC) index on subjects."""
+    op.drop_index('ix_subjects_owner_created', table_name='subjects')
@@ -0,0 +1,33 @@
+"""Widen document_chunks / document_embeddings ids to BIGINT
+
+Revision ID: 004_bigint_chunk_embedding_ids
+Revises: 003_add_subjects_owner_created_index
+Create Date: 2025-09-16 09:00:00.000000
+
+Chunks and embeddings are created in bulk for every uploaded document,
+so their surrogate keys can outgrow the 32-bit INTEGER range on large
+corpora. The id columns (and the embeddings -> chunks foreign key) are
+created as BIGINT in 001_add_documents: document_embeddings is
+hash-partitioned on chunk_id, and PostgreSQL cannot change the type of a
+partition key column afterwards. This migration widens the id sequences.
+"""
+from alembic import op
+from typing import Union, Sequence
+
+# revision identifiers, used by Alembic.
+revision = '004_bigint_chunk_embedding_ids'
+down_revision: Union[str, Sequence[str], None] = '003_add_subjects_owner_created_index'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Change the chunk/embedding id sequences to BIGINT."""
+    op.execute('ALTER SEQUENCE IF EXISTS document_chunks_id_seq AS bigint')
+    op.execute('ALTER SEQUENCE IF EXISTS document_embeddings_id_seq AS bigint')
+
+
+def downgrade() -> None:
+    """Revert the chunk/embedding id sequences to INTEGER."""
+    op.execute('ALTER SEQUENCE IF EXISTS document_embeddings_id_seq AS integer')
+    op.execute('ALTER SEQUENCE IF EXISTS document_chunks_id_seq AS integer')
@@ -0,0 +1,46 @@
+"""Add documents.file_hash and the embedding_cache table
+
+Revision ID: 005_add_file_hash_and_embedding_cache
+Revises: 004_bigint_chunk_embedding_ids
+Create Date: 2025-09-17 10:00:00.000000
+
+Duplicate uploads are detected by content hash rather than by filename,
+and chunk embeddings are cached by (content hash, model, dimension) so
+identical text is never sent to the embedding provider twice.
+"""
+from alembic import op
+import sqlalchemy as sa
+from pgvector.sqlalchemy import HALFVEC
+from typing import Union, Sequence
+
+# revision identifiers, used by Alembic.
+revision = '005_add_file_hash_and_embedding_cache'
+down_revision: Union[str, Sequence[str], None] = '004_bigint_chunk_embedding_ids'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add the file_hash column and create the embedding_cache table."""
+    op.add_column('documents', sa.Column('file_hash', sa.String(length=64), nullable=True))
+    op.execute(
+        "UPDATE documents SET file_hash = metadata_->>'file_hash' "
+        "WHERE metadata_ ? 'file_hash'"
+    )
+    op.create_index('ix_documents_file_hash', 'documents', ['file_hash'])
+
+    op.create_table('embedding_cache',
+    sa.Column('content_hash', sa.String(length=64), nullable=False),
+    sa.Column('model_name', sa.String(length=100), nullable=False),
+    sa.Column('embedding_dimension', sa.Integer(), nullable=False),
+    sa.Column('embedding_vector', HALFVEC(1536), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('content_hash', 'model_name', 'embedding_dimension')
+    )
+
+
+def downgrade() -> None:
+    """Drop the embedding_cache table and the file_hash column."""
+    op.drop_table('embedding_cache')
+    op.drop_index('ix_documents_file_hash', table_name='documents')
+    op.drop_column('documents', 'file_hash')
@@ -0,0 +1,33 @@
+"""Add token_version to users
+
+Revision ID: 006_add_users_token_version
+Revises: 005_add_file_hash_and_embedding_cache
+Create Date: 2025-09-22 10:00:00.000000
+
+Access tokens now carry the user's identity (active flag, role and
+token version) so most requests are authorized without loading the
+user. Bumping token_version invalidates the refresh tokens issued
+before a role, status or credential change.
+"""
+from alembic import op
+import sqlalchemy as sa
+from typing import Union, Sequence
+
+# revision identifiers, used by Alembic.
+revision = '006_add_users_token_version'
+down_revision: Union[str, Sequence[str], None] = '005_add_file_hash_and_embedding_cache'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add users.token_version, starting at 0 for existing users."""
+    op.add_column(
+        'users',
+        sa.Column('token_version', sa.Integer(), nullable=False, server_default='0'),
+    )
+
+
+def downgrade() -> None:
+    """Drop users.token_version."""
+    op.drop_column('users', 'token_version')
@@ -0,0 +1,47 @@
+"""Store the S3 key of profile pictures instead of their URL
+
+Revision ID: 007_users_profile_picture_key
+Revises: 006_add_users_token_version
+Create Date: 2025-09-24 10:00:00.000000
+
+The public URL is derived from the key when a user is serialized, so the
+bucket, region or a CDN in front of it can change without rewriting rows,
+and deleting a picture no longer parses the key back out of its URL.
+"""
+from alembic import op
+import sqlalchemy as sa
+from typing import Union, Sequence
+
+from app.core.config import settings
+
+# revision identifiers, used by Alembic.
+revision = '007_users_profile_picture_key'
+down_revision: Union[str, Sequence[str], None] = '006_add_users_token_version'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Replace users.profile_picture_url with users.profile_picture_key."""
+    op.add_column('users', sa.Column('profile_picture_key', sa.String(length=500), nullable=True))
+    # Stored URLs are virtual-hosted-style: the key is everything after the host
+    op.execute(
+        "UPDATE users SET profile_picture_key = "
+        "regexp_replace(profile_picture_url, '^https?://[^/]+/', '') "
+        "WHERE profile_picture_url IS NOT NULL"
+    )
+    op.drop_column('users', 'profile_picture_url')
+
+
+def downgrade() -> None:
+    """Restore users.profile_picture_url from the stored keys."""
+    op.add_column('users', sa.Column('profile_picture_url', sa.String(length=500), nullable=True))
+    op.execute(
+        sa.text(
+            "UPDATE users SET profile_picture_url = :base || profile_picture_key "
+            "WHERE profile_picture_key IS NOT NULL"
+        ).bindparams(
+            base=f"https://{settings.AWS_BUCKET_NAME}.s3.{settings.AWS_REGION}.amazonaws.com/"
+        )
+    )
+    op.drop_column('users', 'profile_picture_key')
@@ -0,0 +1,39 @@
+"""Add (subject_id / owner_id, created_at DESC, id DESC) indexes on documents
+
+Revision ID: 008_add_documents_keyset_indexes
+Revises: 007_users_profile_picture_key
+Create Date: 2025-09-26 10:00:00.000000
+
+Document lists are paginated with a (created_at, id) keyset cursor,
+newest first, per subject and per owner. These indexes serve each page
+with a single index range scan and no sort, at any page depth.
+"""
+from alembic import op
+import sqlalchemy as sa
+from typing import Union, Sequence
+
+# revision identifiers, used by Alembic.
+revision = '008_add_documents_keyset_indexes'
+down_revision: Union[str, Sequence[str], None] = '007_users_profile_picture_key'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create the keyset pagination indexes on documents."""
+    op.create_index(
+        'ix_documents_subject_created_id',
+        'documents',
+        ['subject_id', sa.text('created_at DESC'), sa.text('id DESC')],
+    )
+    op.create_index(
+        'ix_documents_owner_created_id',
+        'documents',
+        ['owner_id', sa.text('created_at DESC'), sa.text('id DESC')],
+    )
+
+
+def downgrade() -> None:
+    """Drop the keyset pagination indexes on documents."""
+    op.drop_index('ix_documents_owner_created_id', table_name='documents')
+    op.drop_index('ix_documents_subject_created_id', table_name='documents')
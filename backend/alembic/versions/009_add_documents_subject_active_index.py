@@ -0,0 +1,36 @@
+"""Add a partial index for listing a subject's non-failed documents
+
+Revision ID: 009_add_documents_subject_active_index
+Revises: 008_add_documents_keyset_indexes
+Create Date: 2025-09-29 10:00:00.000000
+
+Subject document lists hide failed documents by default. A partial
+(subject_id, created_at DESC, id DESC) index restricted to those rows
+returns each page in order without a sort, and without visiting and
+discarding failed documents. Listings that include failed documents
+keep using ix_documents_subject_created_id.
+"""
+from alembic import op
+import sqlalchemy as sa
+from typing import Union, Sequence
+
+# revision identifiers, used by Alembic.
+revision = '009_add_documents_subject_active_index'
+down_revision: Union[str, Sequence[str], None] = '008_add_documents_keyset_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create the partial index on non-failed documents."""
+    op.create_index(
+        'ix_documents_subject_active_created_id',
+        'documents',
+        ['subject_id', sa.text('created_at DESC'), sa.text('id DESC')],
+        postgresql_where=sa.text("processing_status <> 'failed'"),
+    )
+
+
+def downgrade() -> None:
+    """Drop the partial index on non-failed documents."""
+    op.drop_index('ix_documents_subject_active_created_id', table_name='documents')
@@ -0,0 +1,36 @@
+"""Default created_at / updated_at to now() in the database
+
+Revision ID: 010_server_side_timestamps
+Revises: 009_add_documents_subject_active_index
+Create Date: 2025-09-30 10:00:00.000000
+
+Timestamps of the TimestampMixin tables are now generated by PostgreSQL
+instead of being computed in Python and sent with every write, so bulk
+inserts can omit the columns. UPDATEs issued through SQLAlchemy set
+updated_at = now() themselves, so no trigger is needed.
+"""
+from alembic import op
+import sqlalchemy as sa
+from typing import Union, Sequence
+
+# revision identifiers, used by Alembic.
+revision = '010_server_side_timestamps'
+down_revision: Union[str, Sequence[str], None] = '009_add_documents_subject_active_index'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TIMESTAMPED_TABLES = ('users', 'subjects', 'documents', 'document_chunks')
+
+
+def upgrade() -> None:
+    """Set DEFAULT now() on the timestamp columns."""
+    for table in TIMESTAMPED_TABLES:
+        for column in ('created_at', 'updated_at'):
+            op.alter_column(table, column, server_default=sa.text('now()'))
+
+
+def downgrade() -> None:
+    """Drop the server defaults of the timestamp columns."""
+    for table in TIMESTAMPED_TABLES:
+        for column in ('created_at', 'updated_at'):
+            op.alter_column(table, column, server_default=None)
@@ -0,0 +1,56 @@
+"""Make a file's content hash unique within a subject
+
+Revision ID: 011_unique_documents_subject_file_hash
+Revises: 010_server_side_timestamps
+Create Date: 2025-10-01 10:00:00.000000
+
+Duplicate uploads are looked up by (subject_id, file_hash). A composite
+unique index answers that lookup with a single index probe and lets the
+database reject two concurrent uploads of the same file, which the
+application-level check alone cannot. It replaces the single-column
+ix_documents_file_hash, which no query uses on its own.
+
+Duplicates that predate the constraint keep their rows: only the hash of
+every copy but the oldest is cleared.
+"""
+from alembic import op
+from typing import Union, Sequence
+
+# revision identifiers, used by Alembic.
+revision = '011_unique_documents_subject_file_hash'
+down_revision: Union[str, Sequence[str], None] = '010_server_side_timestamps'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Clear duplicate hashes, then swap the file_hash index for a unique one."""
+    op.execute(
+        """
+        UPDATE documents SET file_hash = NULL
+        WHERE id IN (
+            SELECT id FROM (
+                SELECT id, row_number() OVER (
+                    PARTITION BY subject_id, file_hash
+                    ORDER BY created_at, id
+                ) AS copy_number
+                FROM documents
+                WHERE file_hash IS NOT NULL
+            ) AS copies
+            WHERE copy_number > 1
+        )
+        """
+    )
+    op.create_index(
+        'ix_documents_subject_file_hash',
+        'documents',
+        ['subject_id', 'file_hash'],
+        unique=True,
+    )
+    op.drop_index('ix_documents_file_hash', table_name='documents')
+
+
+def downgrade() -> None:
+    """Restore the single-column file_hash index."""
+    op.create_index('ix_documents_file_hash', 'documents', ['file_hash'])
+    op.drop_index('ix_documents_subject_file_hash', table_name='documents')
@@ -0,0 +1,47 @@
+"""Make a chunk's position unique within its document
+
+Revision ID: 012_unique_document_chunks_position
+Revises: 011_unique_documents_subject_file_hash
+Create Date: 2025-10-02 10:00:00.000000
+
+Chunk batches are inserted with ON CONFLICT (document_id, chunk_index)
+DO NOTHING, so a retried ingestion skips the chunks it already stored
+instead of duplicating them. That needs a unique constraint on the pair,
+which replaces the plain ix_document_chunks_doc_index.
+
+Duplicated positions left by earlier retries are removed first, keeping
+the oldest chunk of each (its embedding is kept with it).
+"""
+from alembic import op
+from typing import Union, Sequence
+
+# revision identifiers, used by Alembic.
+revision = '012_unique_document_chunks_position'
+down_revision: Union[str, Sequence[str], None] = '011_unique_documents_subject_file_hash'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Drop duplicated chunks, then replace the index with a unique constraint."""
+    op.execute(
+        """
+        DELETE FROM document_chunks AS duplicate
+        USING document_chunks AS original
+        WHERE duplicate.document_id = original.document_id
+          AND duplicate.chunk_index = original.chunk_index
+          AND duplicate.id > original.id
+        """
+    )
+    op.create_unique_constraint(
+        'uq_document_chunks_document_chunk_index',
+        'document_chunks',
+        ['document_id', 'chunk_index'],
+    )
+    op.drop_index('ix_document_chunks_doc_index', table_name='document_chunks')
+
+
+def downgrade() -> None:
+    """Restore the non-unique (document_id, chunk_index) index."""
+    op.create_index('ix_document_chunks_doc_index', 'document_chunks', ['document_id', 'chunk_index'])
+    op.drop_constraint('uq_document_chunks_document_chunk_index', 'document_chunks', type_='unique')
@@ -0,0 +1,48 @@
+"""Add per-status document indexes and the subjects keyset index
+
+Revision ID: 013_add_status_and_subject_keyset_indexes
+Revises: 012_unique_document_chunks_position
+Create Date: 2025-10-03 10:00:00.000000
+
+Document statistics group a subject's (or a user's) documents by
+processing_status and sum file_size and total_chunks. (subject_id,
+processing_status) and (owner_id, processing_status) indexes that INCLUDE
+both summed columns answer them with index-only scans.
+
+Subject lists are paged by id, newest first, so an (owner_id, id DESC)
+index returns each page without a sort; ix_subjects_owner_created only
+matches the created_at ordering.
+"""
+from alembic import op
+import sqlalchemy as sa
+from typing import Union, Sequence
+
+# revision identifiers, used by Alembic.
+revision = '013_add_status_and_subject_keyset_indexes'
+down_revision: Union[str, Sequence[str], None] = '012_unique_document_chunks_position'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create the per-status document indexes and the subjects keyset index."""
+    op.create_index(
+        'ix_documents_subject_status',
+        'documents',
+        ['subject_id', 'processing_status'],
+        postgresql_include=['file_size', 'total_chunks'],
+    )
+    op.create_index(
+        'ix_documents_owner_status',
+        'documents',
+        ['owner_id', 'processing_status'],
+        postgresql_include=['file_size', 'total_chunks'],
+    )
+    op.create_index('ix_subjects_owner_id_desc', 'subjects', ['owner_id', sa.text('id DESC')])
+
+
+def downgrade() -> None:
+    """Drop the indexes."""
+    op.drop_index('ix_subjects_owner_id_desc', table_name='subjects')
+    op.drop_index('ix_documents_owner_status', table_name='documents')
+    op.drop_index('ix_documents_subject_status', table_name='documents')
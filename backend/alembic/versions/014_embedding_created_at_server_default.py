@@ -0,0 +1,34 @@
+"""Default the embedding tables' created_at to now() in the database
+
+Revision ID: 014_embedding_created_at_server_default
+Revises: 013_add_status_and_subject_keyset_indexes
+Create Date: 2025-10-04 10:00:00.000000
+
+document_embeddings and embedding_cache stamp created_at through a server
+default, like the TimestampMixin tables (see 010), instead of computing it
+in Python for every inserted row. The default set on the partitioned
+document_embeddings table applies to all its partitions.
+"""
+from alembic import op
+import sqlalchemy as sa
+from typing import Union, Sequence
+
+# revision identifiers, used by Alembic.
+revision = '014_embedding_created_at_server_default'
+down_revision: Union[str, Sequence[str], None] = '013_add_status_and_subject_keyset_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+EMBEDDING_TABLES = ('document_embeddings', 'embedding_cache')
+
+
+def upgrade() -> None:
+    """Set DEFAULT now() on created_at."""
+    for table in EMBEDDING_TABLES:
+        op.alter_column(table, 'created_at', server_default=sa.text('now()'))
+
+
+def downgrade() -> None:
+    """Drop the created_at server defaults."""
+    for table in EMBEDDING_TABLES:
+        op.alter_column(table, 'created_at', server_default=None)
@@ -0,0 +1,102 @@
+"""
+Router factory for resources owned by a single user.
+
+Every owned resource exposes the same create / read / update / delete
+endpoints, each scoped to the current user. Rather than repeating those
+handlers per resource, `make_owned_router` builds them once at import time
+from the resource's schemas and CRUD object. The handlers are ordinary
+closures: FastAPI reads the schema types from their annotations, so no
+per-request dispatch is involved.
+"""
+
+from typing import Any, Callable, Optional, Type
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.dependencies import CurrentIdentity, get_db, get_current_active_user
+
+
+def make_owned_router(
+    schema_read: Type[BaseModel],
+    schema_create: Type[BaseModel],
+    schema_update: Type[BaseModel],
+    crud: Any,
+    resource_name: str,
+    on_delete: Optional[Callable[[int], None]] = None
+) -> APIRouter:
+    """
+    Build the create, read, update and delete endpoints of an owned resource.
+
+    Ownership is enforced inside each statement: a resource owned by another
+    user is reported as not found.
+
+    Args:
+        schema_read (Type[BaseModel]): Response schema of the resource.
+        schema_create (Type[BaseModel]): Request schema for creation.
+        schema_update (Type[BaseModel]): Request schema for partial updates.
+        crud: CRUD object providing `create(db, obj_in, owner_id)`,
+            `get_for_owner(db, <id>, owner_id)`,
+            `update_by_id(db, <id>, obj_in, owner_id)` and
+            `delete_by_id(db, <id>, owner_id)`, where the ID is passed
+            positionally.
+        resource_name (str): Human-readable name used in messages (e.g. "Subject").
+        on_delete (Optional[Callable[[int], None]]): Called with the resource's
+            ID after it has been deleted, e.g. to invalidate caches.
+
+    Returns:
+        APIRouter: A router exposing `POST /`, and `GET`, `PUT` and `DELETE`
+                   on `/{item_id}`.
+    """
+    router = APIRouter()
+    not_found = f"{resource_name} not found"
+    # Resource-specific route names keep OpenAPI operation IDs distinct
+    # between resources built by this factory
+    suffix = resource_name.lower().replace(" ", "_")
+
+    @router.post("/", response_model=schema_read, name=f"create_{suffix}")
+    async def create_item(
+        item_in: schema_create,
+        db: AsyncSession = Depends(get_db),
+        current_user: CurrentIdentity = Depends(get_current_active_user)
+    ):
+        return await crud.create(db, obj_in=item_in, owner_id=current_user.id)
+
+    @router.get("/{item_id}", response_model=schema_read, name=f"read_{suffix}")
+    async def read_item(
+        item_id: int,
+        db: AsyncSession = Depends(get_db),
+        current_user: CurrentIdentity = Depends(get_current_active_user)
+    ):
+        item = await crud.get_for_owner(db, item_id, owner_id=current_user.id)
+        if not item:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=not_found)
+        return item
+
+    @router.put("/{item_id}", response_model=schema_read, name=f"update_{suffix}")
+    async def update_item(
+        item_id: int,
+        item_in: schema_update,
+        db: AsyncSession = Depends(get_db),
+        current_user: CurrentIdentity = Depends(get_current_active_user)
+    ):
+        item = await crud.update_by_id(db, item_id, obj_in=item_in, owner_id=current_user.id)
+        if not item:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=not_found)
+        return item
+
+    @router.delete("/{item_id}", name=f"delete_{suffix}")
+    async def delete_item(
+        item_id: int,
+        db: AsyncSession = Depends(get_db),
+        current_user: CurrentIdentity = Depends(get_current_active_user)
+    ):
+        deleted = await crud.delete_by_id(db, item_id, owner_id=current_user.id)
+        if not deleted:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=not_found)
+        if on_delete is not None:
+            on_delete(item_id)
+        return {"msg": f"{resource_name} deleted successfully"}
+
+    return router
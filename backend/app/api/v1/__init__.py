@@ -1,3 +1,3 @@
-from app.api.v1 import auth, users, subjects, documents, quizzes
+from app.api.v1 import auth, users, subjects, admin, documents, quizzes
 
-__all__ = ["auth", "users", "subjects", "documents", "quizzes"]
+__all__ = ["auth", "users", "subjects", "admin", "documents", "quizzes"]
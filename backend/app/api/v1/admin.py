@@ -1,10 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
+from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_, cast, Date
+from sqlalchemy import select, func, and_, cast, Date, tuple_, event
 from datetime import datetime, timedelta, timezone
 from typing import List, Optional
-from app.core.dependencies import get_db
+from app.core.dependencies import CurrentIdentity, get_db
 from app.core.admin_dependencies import get_admin_user, get_super_admin_user
+from app.core.cache import TTLCache
 from app.models.user import User as UserModel, UserRole
 from app.models.subject import Subject as SubjectModel
 from app.schemas.admin import (
@@ -18,51 +20,78 @@ from app.schemas.admin import (
 
 router = APIRouter()
 
+# Validating the whole page at once amortizes schema/validator lookups
+# compared with calling UserAdmin.model_validate once per row
+_USERS_ADAPTER = TypeAdapter(List[UserAdmin])
+
+# Dashboard aggregates don't need to be real-time: cache them briefly so
+# admin polling doesn't recompute every count on each request
+DASHBOARD_CACHE_KEY = "dashboard:v1"
+_dashboard_cache = TTLCache(ttl_seconds=60)
+
+
+@event.listens_for(UserModel, "after_insert")
+@event.listens_for(UserModel, "after_update")
+@event.listens_for(UserModel, "after_delete")
+def _invalidate_dashboard_cache(mapper, connection, target):
+    """Drop cached dashboard aggregates whenever a user row changes."""
+    _dashboard_cache.delete(DASHBOARD_CACHE_KEY)
+
+
 @router.get("/dashboard", response_model=AdminDashboard)
 async def get_dashboard(
     db: AsyncSession = Depends(get_db),
-    admin_user: UserModel = Depends(get_admin_user)
+    admin_user: CurrentIdentity = Depends(get_admin_user)
 ):
     """Get admin dashboard statistics"""
     
-    # Get total users count
-    total_users_result = await db.execute(select(func.count(UserModel.id)))
-    total_users = total_users_result.scalar() or 0
-    
-    # Get active users count
-    active_users_result = await db.execute(
-        select(func.count(UserModel.id)).where(UserModel.is_active == True)
+    cached_dashboard = _dashboard_cache.get(DASHBOARD_CACHE_KEY)
+    if cached_dashboard is not None:
+        return cached_dashboard
+    
+    # Take "now" once so every time window refers to the same instant
+    now = datetime.now(timezone.utc)
+    # Half-open range for "today" keeps the predicate sargable so the
+    # planner can use ix_users_created_at (casting the column would not)
+    today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    tomorrow_start = today_start + timedelta(days=1)
+    week_ago = now - timedelta(days=7)
+    thirty_days_ago = now - timedelta(days=30)
+    
+    # Compute all scalar counters in a single round-trip:
+    # count(*) FILTER (WHERE ...) for the user counters and a scalar
+    # subquery for the subjects total
+    total_subjects_subquery = (
+        select(func.count()).select_from(SubjectModel).scalar_subquery()
     )
-    active_users = active_users_result.scalar() or 0
-    
-    # Get total subjects count
-    total_subjects_result = await db.execute(select(func.count(SubjectModel.id)))
-    total_subjects = total_subjects_result.scalar() or 0
-    
-    # Get registrations today
-    today = datetime.now(timezone.utc).date()
-    today_registrations_result = await db.execute(
-        select(func.count(UserModel.id)).where(
-            cast(UserModel.created_at, Date) == today
-        )
+    counters_result = await db.execute(
+        select(
+            func.count().label('total_users'),
+            func.count().filter(UserModel.is_active == True).label('active_users'),
+            func.count().filter(
+                UserModel.created_at >= today_start,
+                UserModel.created_at < tomorrow_start
+            ).label('today_registrations'),
+            func.count().filter(
+                UserModel.created_at >= week_ago
+            ).label('week_registrations'),
+            total_subjects_subquery.label('total_subjects'),
+        ).select_from(UserModel)
     )
-    today_registrations = today_registrations_result.scalar() or 0
+    counters = counters_result.one()
     
-    # Get registrations this week
-    week_ago = datetime.now(timezone.utc) - timedelta(days=7)
-    week_registrations_result = await db.execute(
-        select(func.count(UserModel.id)).where(
-            UserModel.created_at >= week_ago
-        )
-    )
-    week_registrations = week_registrations_result.scalar() or 0
+    total_users = counters.total_users or 0
+    active_users = counters.active_users or 0
+    total_subjects = counters.total_subjects or 0
+    today_registrations = counters.today_registrations or 0
+    week_registrations = counters.week_registrations or 0
     
     # Get daily registrations for the last 30 days
-    thirty_days_ago = datetime.now(timezone.utc) - timedelta(days=30)
+    # (the range filter uses the index; the cast only buckets matched rows)
     daily_registrations_result = await db.execute(
         select(
             cast(UserModel.created_at, Date).label('date'),
-            func.count(UserModel.id).label('count')
+            func.count().label('count')
         )
         .where(UserModel.created_at >= thirty_days_ago)
         .group_by(cast(UserModel.created_at, Date))
@@ -78,7 +107,7 @@ async def get_dashboard(
     role_distribution_result = await db.execute(
         select(
             UserModel.role,
-            func.count(UserModel.id).label('count')
+            func.count().label('count')
         )
         .group_by(UserModel.role)
     )
@@ -87,7 +116,7 @@ async def get_dashboard(
         row.role.value: row.count for row in role_distribution_result
     }
     
-    return AdminDashboard(
+    dashboard = AdminDashboard(
         total_users=total_users,
         active_users=active_users,
         total_subjects=total_subjects,
@@ -96,6 +125,9 @@ async def get_dashboard(
         daily_registrations=daily_registrations,
         role_distribution=role_distribution
     )
+    _dashboard_cache.set(DASHBOARD_CACHE_KEY, dashboard)
+    
+    return dashboard
 
 @router.get("/users", response_model=UserList)
 async def get_users(
@@ -104,13 +136,26 @@ async def get_users(
     search: Optional[str] = None,
     role: Optional[UserRole] = None,
     is_active: Optional[bool] = None,
+    cursor_created_at: Optional[datetime] = None,
+    cursor_id: Optional[int] = None,
     db: AsyncSession = Depends(get_db),
-    admin_user: UserModel = Depends(get_admin_user)
+    admin_user: CurrentIdentity = Depends(get_admin_user)
 ):
-    """Get paginated list of users with optional filters"""
-    
-    # Build query
-    query = select(UserModel)
+    """
+    Get paginated list of users with optional filters.
+    
+    Pages are ordered by (created_at, id) descending. Pass the
+    `next_cursor_created_at` / `next_cursor_id` values of the previous
+    response to fetch the next page with keyset pagination, which costs
+    the same regardless of depth. `skip` is kept for backward compatibility
+    but is deprecated and ignored when a cursor is provided.
+    """
+    if (cursor_created_at is None) != (cursor_id is None):
+        raise HTTPException(
+            status_code=400,
+            detail="cursor_created_at and cursor_id must be provided together"
+        )
+    use_cursor = cursor_created_at is not None
     
     # Apply filters
     filters = []
@@ -128,47 +173,85 @@ async def get_users(
     if is_active is not None:
         filters.append(UserModel.is_active == is_active)
     
+    filtered_count = select(func.count()).select_from(UserModel).where(*filters)
+    
+    if use_cursor:
+        # The keyset predicate narrows the rows, so the window count would
+        # only see the remaining pages: count the filtered set in a scalar
+        # subquery instead (still a single round-trip)
+        total_column = filtered_count.correlate(None).scalar_subquery()
+    else:
+        # The total is computed alongside the page with a window function
+        # so the filters are evaluated only once
+        total_column = func.count().over()
+    
+    query = select(UserModel, total_column.label('total'))
+    
     if filters:
         query = query.where(and_(*filters))
     
-    # Get total count
-    count_query = select(func.count()).select_from(query.subquery())
-    total_result = await db.execute(count_query)
-    total = total_result.scalar() or 0
+    if use_cursor:
+        query = query.where(
+            tuple_(UserModel.created_at, UserModel.id)
+            < tuple_(cursor_created_at, cursor_id)
+        )
+    
+    # Get paginated results together with the total count
+    query = query.order_by(UserModel.created_at.desc(), UserModel.id.desc())
+    if not use_cursor:
+        query = query.offset(skip)
+    query = query.limit(limit)
     
-    # Get paginated results
-    query = query.offset(skip).limit(limit).order_by(UserModel.created_at.desc())
     result = await db.execute(query)
-    users = result.scalars().all()
+    rows = result.all()
+    
+    users = [user for user, _ in rows]
+    if rows:
+        total = rows[0].total
+    elif use_cursor or skip > 0:
+        # A page past the last row has no rows to carry the count, so
+        # count the filtered set separately
+        total = await db.scalar(filtered_count)
+    else:
+        total = 0
+    
+    # Only hand out a cursor when the page is full (there may be more rows)
+    last_user = users[-1] if len(users) == limit else None
     
     return UserList(
-        users=[UserAdmin.model_validate(user) for user in users],
+        users=_USERS_ADAPTER.validate_python(users, from_attributes=True),
         total=total,
-        page=skip // limit + 1,
-        size=limit
+        # Page numbers only make sense for offset pagination
+        page=None if use_cursor else skip // limit + 1,
+        size=limit,
+        next_cursor_created_at=last_user.created_at if last_user else None,
+        next_cursor_id=last_user.id if last_user else None
     )
 
 @router.get("/users/{user_id}", response_model=UserAdmin)
 async def get_user(
     user_id: int,
     db: AsyncSession = Depends(get_db),
-    admin_user: UserModel = Depends(get_admin_user)
+    admin_user: CurrentIdentity = Depends(get_admin_user)
 ):
     """Get detailed information about a specific user"""
     
+    # Fetch the user and their subjects count in a single round-trip
+    subjects_count_subquery = (
+        select(func.count())
+        .where(SubjectModel.owner_id == user_id)
+        .scalar_subquery()
+    )
     result = await db.execute(
-        select(UserModel).where(UserModel.id == user_id)
+        select(UserModel, subjects_count_subquery.label('subjects_count'))
+        .where(UserModel.id == user_id)
     )
-    user = result.scalar_one_or_none()
+    row = result.one_or_none()
     
-    if not user:
+    if not row:
         raise HTTPException(status_code=404, detail="User not found")
     
-    # Get user's subjects count
-    subjects_count_result = await db.execute(
-        select(func.count(SubjectModel.id)).where(SubjectModel.owner_id == user_id)
-    )
-    subjects_count = subjects_count_result.scalar() or 0
+    user, subjects_count = row
     
     user_data = UserAdmin.model_validate(user)
     user_data.subjects_count = subjects_count
@@ -181,7 +264,7 @@ async def update_user_status(
     user_id: int,
     status_update: UserStatusUpdate,
     db: AsyncSession = Depends(get_db),
-    admin_user: UserModel = Depends(get_admin_user)
+    admin_user: CurrentIdentity = Depends(get_admin_user)
 ):
     """Toggle user's active status"""
     
@@ -207,9 +290,11 @@ async def update_user_status(
             detail="Only super admins can modify other super admin accounts"
         )
     
-    user.is_active = status_update.is_active
+    if user.is_active != status_update.is_active:
+        user.is_active = status_update.is_active
+        # Sessions must be re-established to pick up the new status
+        user.revoke_tokens()
     await db.commit()
-    await db.refresh(user)
     
     return UserAdmin.model_validate(user)
 
@@ -219,7 +304,7 @@ async def update_user_role(
     user_id: int,
     role_update: UserRoleUpdate,
     db: AsyncSession = Depends(get_db),
-    super_admin: UserModel = Depends(get_super_admin_user)
+    super_admin: CurrentIdentity = Depends(get_super_admin_user)
 ):
     """Update user's role (super admin only)"""
     
@@ -238,9 +323,11 @@ async def update_user_role(
             detail="You cannot change your own role"
         )
     
-    user.role = role_update.role
+    if user.role != role_update.role:
+        user.role = role_update.role
+        # The role is a token claim: revoke tokens carrying the old one
+        user.revoke_tokens()
     await db.commit()
-    await db.refresh(user)
     
     return UserAdmin.model_validate(user)
 
@@ -249,7 +336,7 @@ async def update_user_role(
 async def get_user_subjects(
     user_id: int,
     db: AsyncSession = Depends(get_db),
-    admin_user: UserModel = Depends(get_admin_user)
+    admin_user: CurrentIdentity = Depends(get_admin_user)
 ):
     """Get all subjects for a specific user"""
     
@@ -1,3 +1,4 @@
+import asyncio
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -6,10 +7,25 @@ from app.core.security import create_access_token, create_refresh_token, decode_
 from app.crud.user import user_crud
 from app.schemas.auth import Token, LoginRequest, PasswordResetRequest
 from app.schemas.user import UserCreate, User
+from app.models.user import User as UserModel
 
 router = APIRouter()
 
 
+async def _issue_tokens(user: UserModel) -> tuple[str, str]:
+    """Sign the access and refresh tokens concurrently off the event loop."""
+    # convert user.id to string for JWT consistency
+    claims = {"sub": str(user.id), "tv": user.token_version}
+    # The access token also carries what authorization needs, so requests
+    # are authorized without loading the user (see get_current_identity)
+    access_claims = {**claims, "act": user.is_active, "rol": user.role.value}
+    access_token, refresh_token = await asyncio.gather(
+        asyncio.to_thread(create_access_token, data=access_claims),
+        asyncio.to_thread(create_refresh_token, data=claims),
+    )
+    return access_token, refresh_token
+
+
 @router.post("/register", response_model=User)
 async def register(
     user_in: UserCreate,
@@ -50,9 +66,7 @@ async def login(
     if not user_crud.is_active(user):
         raise HTTPException(status_code=400, detail="Inactive user")
     
-    # convert user.id to string for JWT consistency
-    access_token = create_access_token(data={"sub": str(user.id)})
-    refresh_token = create_refresh_token(data={"sub": str(user.id)})
+    access_token, refresh_token = await _issue_tokens(user)
     
     return {
         "access_token": access_token,
@@ -74,7 +88,13 @@ async def refresh_token(
             detail="Invalid refresh token"
         )
     
-    user_id = payload.get("sub")
+    try:
+        user_id = int(payload.get("sub"))
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid refresh token"
+        )
     user = await user_crud.get(db, user_id=user_id)
     if not user:
         raise HTTPException(
@@ -82,9 +102,16 @@ async def refresh_token(
             detail="User not found"
         )
     
-    # convert user.id to string for JWT consistency
-    access_token = create_access_token(data={"sub": str(user.id)})
-    new_refresh_token = create_refresh_token(data={"sub": str(user.id)})
+    # Tokens issued before the user's tokens were revoked are rejected
+    if payload.get("tv", 0) != user.token_version:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Refresh token has been revoked"
+        )
+    if not user_crud.is_active(user):
+        raise HTTPException(status_code=400, detail="Inactive user")
+    
+    access_token, new_refresh_token = await _issue_tokens(user)
     
     return {
         "access_token": access_token,
@@ -6,8 +6,14 @@ and managing documents with their vector embeddings.
 """
 
 import os
+import asyncio
+import base64
+import struct
+import functools
+import hashlib
 import logging
-from typing import List, Optional, Dict, Any
+import tempfile
+from typing import List, Optional, Dict, Any, Tuple
 from uuid import UUID
 from datetime import datetime, timezone
 
@@ -18,17 +24,26 @@ from fastapi import (
     UploadFile, 
     File,
     Query,
-    BackgroundTasks,
+    Request,
+    Response,
     status
 )
+from pydantic import TypeAdapter
+from sqlalchemy.engine import Row
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.dependencies import get_db, get_current_active_user
+from app.core.dependencies import (
+    CurrentIdentity,
+    get_db,
+    get_current_active_user,
+    require_document_access,
+    require_subject_owner
+)
 from app.core.config import settings
-from app.models.user import User as UserModel
+from app.core.executors import get_cpu_pool
 from app.models.document import Document, ProcessingStatus
 from app.crud.document import document_crud, document_chunk_crud
-from app.crud.subject import subject_crud
 from app.schemas.document import (
     DocumentResponse,
     DocumentListResponse,
@@ -38,9 +53,11 @@ from app.schemas.document import (
     ChunkingConfig,
     DocumentChunkResponse
 )
-from app.services.document_parser import document_parser, DocumentParsingError
-from app.services.text_chunker import text_chunker
-from app.services.embedding_service import get_embedding_service
+from app.services.document_parser import parse_document_file, DocumentParsingError
+from app.services.text_chunker import chunk_text, text_chunker
+from app.services.embedding_service import TRANSIENT_DB_ERRORS, get_embedding_service
+from app.services import progress
+from app.services.ingest_queue import IngestJob, get_ingest_queue
 from app.schemas.quiz import QuizGenerationRequest, QuizResponse
 from app.services.quiz_generation import QuizGenerationService, QuizGenerationError
 
@@ -48,59 +65,340 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Compiled once: validating a whole list is cheaper than one model per row
+_DOCUMENTS_ADAPTER = TypeAdapter(List[DocumentResponse])
+_CHUNKS_ADAPTER = TypeAdapter(List[DocumentChunkResponse])
+
+# Errors worth retrying the whole processing pipeline for
+TRANSIENT_PROCESSING_ERRORS = TRANSIENT_DB_ERRORS
+
+# Statuses in which no worker is adding or embedding a document's chunks
+SETTLED_STATUSES = frozenset({
+    ProcessingStatus.PENDING,
+    ProcessingStatus.COMPLETED,
+    ProcessingStatus.FAILED,
+})
+
+# Constraints an upload's INSERT can violate after the up-front checks passed
+DUPLICATE_FILE_CONSTRAINT = "ix_documents_subject_file_hash"
+SUBJECT_FOREIGN_KEY = "documents_subject_id_fkey"
+
+# Uploads are streamed to disk in fixed-size reads so memory use per upload
+# stays constant regardless of the file size
+UPLOAD_READ_CHUNK_SIZE = 64 * 1024
+
+# Chunking functions pre-bound to the deployment's chunk size and overlap,
+# one per strategy; built once per worker process
+SPECIALIZED_CHUNKERS = {
+    strategy: functools.partial(
+        chunk_text,
+        strategy=strategy,
+        chunk_size=settings.CHUNK_SIZE,
+        chunk_overlap=settings.CHUNK_OVERLAP
+    )
+    for strategy in text_chunker.strategies
+}
+
+# File signatures, as (mask, value, mime type) over the first 8 bytes read as
+# a little-endian integer, so each check is a single mask and compare
+MAGIC_BYTES_LENGTH = 8
+PDF_MIME_TYPE = "application/pdf"
+DOCX_MIME_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+_FILE_SIGNATURES = [
+    (0xFFFFFFFFFF, int.from_bytes(b"%PDF-", "little"), PDF_MIME_TYPE),
+    (0xFFFFFFFF, int.from_bytes(b"PK\x03\x04", "little"), DOCX_MIME_TYPE),
+    (0xFFFFFF, int.from_bytes(b"\xef\xbb\xbf", "little"), "text/plain"),
+]
+# Types that are only accepted when their signature is present
+_SIGNED_TYPES = {PDF_MIME_TYPE: ".pdf", DOCX_MIME_TYPE: ".docx"}
+
 
 # ===== Helper Functions =====
 
-def validate_file(file: UploadFile) -> None:
+def detect_file_type(head: bytes) -> Optional[str]:
     """
-    Validate uploaded file for size and type constraints.
+    Detect a file's type from its leading bytes.
+    
+    Args:
+        head: The first bytes of the file (at most MAGIC_BYTES_LENGTH are used)
+        
+    Returns:
+        The MIME type matching the file signature, or None if none matches
+    """
+    (word,) = struct.unpack("<Q", head[:MAGIC_BYTES_LENGTH].ljust(MAGIC_BYTES_LENGTH, b"\0"))
+    for mask, value, mime_type in _FILE_SIGNATURES:
+        if word & mask == value:
+            return mime_type
+    return None
+
+
+def validate_file_size(file: UploadFile, size: Optional[int] = None) -> None:
+    """
+    Check that an uploaded file is neither too large nor empty.
     
     Args:
         file: The uploaded file to validate
+        size: Actual number of bytes received, once the upload has been
+              streamed. When omitted, the Content-Length based size is used.
         
     Raises:
-        HTTPException: If file validation fails
+        HTTPException: If the file is too large (413) or empty (400)
     """
-    # Check file size (using Content-Length header if available)
+    # Check file size (actual size if known, else Content-Length header if available)
     max_size = settings.MAX_FILE_SIZE_MB * 1024 * 1024
-    if file.size and file.size > max_size:
+    file_size = size if size is not None else file.size
+    if file_size and file_size > max_size:
         raise HTTPException(
             status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
             detail=f"File size exceeds maximum allowed size of {settings.MAX_FILE_SIZE_MB}MB"
         )
     
+    if size == 0:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Uploaded file is empty"
+        )
+
+
+def validate_file(
+    file: UploadFile,
+    size: Optional[int] = None,
+    head: Optional[bytes] = None
+) -> Optional[str]:
+    """
+    Validate uploaded file for size and type constraints.
+    
+    When the leading bytes of the file are given, the type is decided from
+    its signature rather than from the client-supplied content type, and
+    files claiming to be PDF or DOCX without the matching signature are
+    rejected before any processing is queued.
+    
+    Args:
+        file: The uploaded file to validate
+        size: Actual number of bytes received, once the upload has been
+              streamed. When omitted, the Content-Length based size is used.
+        head: The first bytes of the file, for signature detection
+        
+    Returns:
+        The content type to use for the file: the detected type if the
+        signature is known, otherwise the declared content type
+        
+    Raises:
+        HTTPException: If file validation fails
+    """
+    validate_file_size(file, size=size)
+    
+    if head == b"":
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Uploaded file is empty"
+        )
+    
+    file_ext = os.path.splitext(file.filename or "")[1].lower()
+    content_type = file.content_type
+    
+    # Check the file signature, when the content is available
+    if head is not None:
+        detected_type = detect_file_type(head)
+        if detected_type in _SIGNED_TYPES:
+            content_type = detected_type
+        elif detected_type and not (content_type or "").startswith("text/"):
+            # A UTF-8 BOM marks text; keep a more specific declared text type
+            content_type = detected_type
+        elif content_type in _SIGNED_TYPES or file_ext in _SIGNED_TYPES.values():
+            raise HTTPException(
+                status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+                detail="File content does not match its declared type"
+            )
+    
     # Check file type
-    if file.content_type not in settings.ALLOWED_FILE_TYPES:
+    if content_type not in settings.ALLOWED_FILE_TYPES:
         # Also check by extension as fallback
-        file_ext = os.path.splitext(file.filename)[1].lower()
         allowed_extensions = ['.pdf', '.txt', '.md', '.docx']
         if file_ext not in allowed_extensions:
             raise HTTPException(
                 status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
-                detail=f"File type '{file.content_type}' is not supported. "
+                detail=f"File type '{content_type}' is not supported. "
                        f"Allowed types: PDF, TXT, MD, DOCX"
             )
+    
+    return content_type
+
+
+def _get_chunker(chunking_config: Dict[str, Any]) -> functools.partial:
+    """
+    Return the chunking function for a chunking configuration.
+    
+    Configurations using the default chunk size and overlap get one of the
+    pre-built SPECIALIZED_CHUNKERS; others get a partial built on the spot.
+    
+    Args:
+        chunking_config: Configuration for text chunking
+        
+    Returns:
+        A picklable function taking `text` and `metadata`
+    """
+    strategy = chunking_config.get('strategy', settings.CHUNKING_STRATEGY)
+    chunk_size = chunking_config.get('chunk_size', settings.CHUNK_SIZE)
+    chunk_overlap = chunking_config.get('chunk_overlap', settings.CHUNK_OVERLAP)
+    
+    if chunk_size == settings.CHUNK_SIZE and chunk_overlap == settings.CHUNK_OVERLAP:
+        chunk_fn = SPECIALIZED_CHUNKERS.get(strategy)
+        if chunk_fn is not None:
+            return chunk_fn
+    
+    return functools.partial(
+        chunk_text,
+        strategy=strategy,
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap
+    )
+
+
+def _parse_if_none_match(header: Optional[str]) -> List[str]:
+    """
+    Split an If-None-Match header into its entity tags.
+    
+    Args:
+        header: The raw header value, if any
+        
+    Returns:
+        The list of entity tags (empty when the header is missing)
+    """
+    if not header:
+        return []
+    return [tag.strip() for tag in header.split(",") if tag.strip()]
+
+
+async def spool_upload(file: UploadFile) -> Tuple[str, int, str]:
+    """
+    Stream an uploaded file to a temporary file on disk.
+    
+    The upload is read in fixed-size blocks; the size and SHA-256 hash are
+    computed on the fly, so the file never has to be held in memory nor
+    read a second time. The size limit is enforced while streaming.
+    
+    Args:
+        file: The uploaded file
+        
+    Returns:
+        A tuple of (temporary_file_path, size_in_bytes, sha256_hex_digest).
+        The caller owns the temporary file and must delete it.
+        
+    Raises:
+        HTTPException: If the file exceeds the maximum allowed size
+    """
+    max_size = settings.MAX_FILE_SIZE_MB * 1024 * 1024
+    suffix = os.path.splitext(file.filename or "")[1].lower()
+    hasher = hashlib.sha256()
+    size = 0
+    
+    tmp = tempfile.NamedTemporaryFile(prefix="eleva-upload-", suffix=suffix, delete=False)
+    try:
+        with tmp:
+            while chunk := await file.read(UPLOAD_READ_CHUNK_SIZE):
+                size += len(chunk)
+                if size > max_size:
+                    validate_file_size(file, size=size)
+                hasher.update(chunk)
+                tmp.write(chunk)
+    except BaseException:
+        os.unlink(tmp.name)
+        raise
+    
+    return tmp.name, size, hasher.hexdigest()
+
+
+async def _cleanup_processing(document_id: UUID, file_path: str):
+    """Forget the progress of a document and delete its temporary upload."""
+    await progress.clear_progress(document_id)
+    try:
+        os.unlink(file_path)
+    except OSError:
+        logger.warning(f"Could not remove temporary upload file {file_path}")
+
+
+async def _mark_dropped(document_id: UUID):
+    """Mark a document whose queued processing was dropped on shutdown as failed."""
+    from app.db.session import AsyncSessionLocal
+    
+    async with AsyncSessionLocal() as db:
+        document = await document_crud.get(db, document_id)
+        if document and document.processing_status == ProcessingStatus.PENDING:
+            document.processing_status = ProcessingStatus.FAILED
+            document.processing_error = "Processing was interrupted by a server shutdown"
+            document.processing_completed_at = datetime.now(timezone.utc)
+            await db.commit()
+
+
+async def enqueue_document_processing(
+    document_id: UUID,
+    file_path: str,
+    filename: str,
+    mime_type: str,
+    chunking_config: Dict[str, Any],
+    file_hash: Optional[str] = None
+):
+    """
+    Queue a document for processing on the ingest queue.
+    
+    The temporary upload file is deleted after the last processing attempt.
+    If the queue is stopped before the job runs, the document is marked as
+    failed instead of being left pending.
+    
+    Args:
+        document_id: The UUID of the document to process
+        file_path: Path of the temporary file holding the upload
+        filename: Original filename
+        mime_type: MIME type of the file
+        chunking_config: Configuration for text chunking
+        file_hash: SHA-256 of the file computed while streaming the upload
+    """
+    await get_ingest_queue().enqueue(IngestJob(
+        name=f"document:{document_id}",
+        func=process_document_background,
+        kwargs={
+            'document_id': document_id,
+            'file_path': file_path,
+            'filename': filename,
+            'mime_type': mime_type,
+            'chunking_config': chunking_config,
+            'file_hash': file_hash
+        },
+        cleanup=functools.partial(_cleanup_processing, document_id, file_path),
+        on_drop=functools.partial(_mark_dropped, document_id)
+    ))
 
 
 async def process_document_background(
     document_id: UUID,
-    file_content: bytes,
+    file_path: str,
     filename: str,
     mime_type: str,
-    chunking_config: Dict[str, Any]
+    chunking_config: Dict[str, Any],
+    file_hash: Optional[str] = None
 ):
     """
     Background task to process a document (parsing, chunking, embedding).
     
-    This function runs asynchronously after the upload endpoint returns,
+    This function runs on the ingest queue after the upload endpoint returns,
     allowing for long-running processing without blocking the API response.
+    Parsing and chunking run in the CPU process pool, where the uploaded file
+    is read (memory-mapped). Intermediate stages are reported to the progress
+    store; the database is only written after the chunks are created and when
+    the document reaches a terminal state.
+    
+    Transient infrastructure errors (e.g. a lost database connection) are
+    raised after the document is marked as failed, so that the ingest queue
+    retries the whole pipeline.
     
     Args:
         document_id: The UUID of the document to process
-        file_content: The raw file content
+        file_path: Path of the temporary file holding the upload
         filename: Original filename
         mime_type: MIME type of the file
         chunking_config: Configuration for text chunking
+        file_hash: SHA-256 of the file computed while streaming the upload
     """
     # Create a new database session for the background task
     from app.db.session import AsyncSessionLocal
@@ -113,18 +411,29 @@ async def process_document_background(
                 logger.error(f"Document {document_id} not found for processing")
                 return
             
-            # Update status to parsing
+            # A retried attempt starts over from a clean state
+            if document.processing_status != ProcessingStatus.PENDING:
+                await document_chunk_crud.delete_by_document(db, document_id)
+                document.processing_error = None
+                document.processing_completed_at = None
+            
+            # Update status to parsing; persisted together with the chunks
             document.processing_status = ProcessingStatus.PARSING
             document.processing_started_at = datetime.now(timezone.utc)
-            await db.commit()
+            await progress.set_progress(document_id, ProcessingStatus.PARSING)
             
             # Step 1: Parse the document
             logger.info(f"Parsing document {document_id}")
+            loop = asyncio.get_running_loop()
             try:
-                text, metadata = await document_parser.parse_document(
-                    file_content=file_content,
-                    filename=filename,
-                    mime_type=mime_type
+                # Only the path crosses the process boundary, not the file
+                text, metadata = await loop.run_in_executor(
+                    get_cpu_pool(),
+                    parse_document_file,
+                    file_path,
+                    filename,
+                    mime_type,
+                    file_hash
                 )
                 
                 # Update document with parsing metadata
@@ -132,7 +441,6 @@ async def process_document_background(
                     **(document.metadata_ or {}),
                     **metadata
                 }
-                await db.commit()
                 
             except DocumentParsingError as e:
                 logger.error(f"Failed to parse document {document_id}: {e}")
@@ -145,17 +453,19 @@ async def process_document_background(
             # Step 2: Chunk the text
             logger.info(f"Chunking document {document_id}")
             document.processing_status = ProcessingStatus.CHUNKING
-            await db.commit()
+            await progress.set_progress(document_id, ProcessingStatus.CHUNKING)
             
-            chunks = text_chunker.chunk_text(
-                text=text,
-                strategy=chunking_config.get('strategy', settings.CHUNKING_STRATEGY),
-                chunk_size=chunking_config.get('chunk_size', settings.CHUNK_SIZE),
-                chunk_overlap=chunking_config.get('chunk_overlap', settings.CHUNK_OVERLAP),
-                metadata={'document_id': str(document_id)}
+            chunk_fn = _get_chunker(chunking_config)
+            chunks = await loop.run_in_executor(
+                get_cpu_pool(),
+                functools.partial(
+                    chunk_fn,
+                    text=text,
+                    metadata={'document_id': str(document_id)}
+                )
             )
             
-            # Save chunks to database
+            # Save chunks to database (this also persists the parsing metadata)
             chunk_dicts = [chunk.to_dict() for chunk in chunks]
             db_chunks = await document_chunk_crud.create_batch(
                 db=db,
@@ -167,16 +477,18 @@ async def process_document_background(
             
             # Step 3: Generate embeddings
             logger.info(f"Generating embeddings for document {document_id}")
-            document.processing_status = ProcessingStatus.EMBEDDING
-            await db.commit()
+            await progress.set_progress(
+                document_id, ProcessingStatus.EMBEDDING, 0, len(db_chunks)
+            )
             
             embedding_service = get_embedding_service()
             
             # Process embeddings with progress tracking
             async def progress_callback(processed, total, message):
                 logger.debug(f"Embedding progress for {document_id}: {message}")
-                # In a real implementation, you might send this to a websocket
-                # or store in Redis for the client to poll
+                await progress.set_progress(
+                    document_id, ProcessingStatus.EMBEDDING, processed, total
+                )
             
             embedding_results = await embedding_service.embed_document_chunks(
                 db=db,
@@ -198,37 +510,49 @@ async def process_document_background(
             
             # Try to update document status to failed
             try:
+                # The failed statement may have aborted the transaction:
+                # start over before reading the document again
+                await db.rollback()
                 document = await document_crud.get(db, document_id)
                 if document:
                     document.processing_status = ProcessingStatus.FAILED
                     document.processing_error = str(e)
                     document.processing_completed_at = datetime.now(timezone.utc)
                     await db.commit()
-            except:
-                pass  # Best effort - don't fail the background task
+            except Exception as mark_error:
+                # Best effort - don't fail the background task
+                logger.error(f"Could not mark document {document_id} as failed: {mark_error}")
+            
+            # Let the ingest queue retry failures that may not happen again
+            if isinstance(e, TRANSIENT_PROCESSING_ERRORS):
+                raise
+
+
+def _violated_constraint(error: IntegrityError) -> Optional[str]:
+    """Return the name of the constraint an IntegrityError violated, if the driver reports it."""
+    # asyncpg's exception (with constraint_name) is chained behind the DBAPI error
+    return getattr(error.orig.__cause__, "constraint_name", None)
 
 
 # ===== API Endpoints =====
 
 @router.post("/subjects/{subject_id}/documents", response_model=DocumentUploadResponse)
 async def upload_document(
-    subject_id: int,
-    background_tasks: BackgroundTasks,
+    subject_id: int = Depends(require_subject_owner),
     file: UploadFile = File(...),
     db: AsyncSession = Depends(get_db),
-    current_user: UserModel = Depends(get_current_active_user)
+    current_user: CurrentIdentity = Depends(get_current_active_user)
 ):
     """
     Upload a document to a subject for processing.
     
     This endpoint handles file upload and initiates the processing pipeline
-    (parsing, chunking, embedding) as a background task. The response includes
+    (parsing, chunking, embedding) on the ingest queue. The response includes
     a document ID that can be used to track processing status.
     
     Args:
         subject_id: The ID of the subject to attach the document to
         file: The uploaded file (PDF, TXT, MD, or DOCX)
-        background_tasks: FastAPI background task manager
         db: Database session
         current_user: The authenticated user
         
@@ -238,61 +562,81 @@ async def upload_document(
     Raises:
         HTTPException: If subject not found, unauthorized, or file validation fails
     """
-    # Verify subject exists and user has access
-    subject = await subject_crud.get(db, subject_id=subject_id)
-    if not subject:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Subject not found"
-        )
+    # Validate file (declared size, and type from the file signature)
+    head = await file.read(MAGIC_BYTES_LENGTH)
+    await file.seek(0)
+    content_type = validate_file(file, head=head)
     
-    if not subject_crud.is_owner(subject, current_user.id):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not authorized to upload documents to this subject"
-        )
-    
-    # Validate file
-    validate_file(file)
-    
-    # Read file content
-    file_content = await file.read()
-    
-    # Check for duplicates
-    existing = await document_crud.check_duplicate(
-        db=db,
-        subject_id=subject_id,
-        filename=file.filename
-    )
+    # Stream the upload to disk, computing its size and hash on the way
+    file_path, file_size, file_hash = await spool_upload(file)
     
-    if existing:
-        raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail=f"A document with the name '{file.filename}' already exists in this subject"
+    try:
+        # The type was already decided from the signature: only the
+        # received size is left to check
+        validate_file_size(file, size=file_size)
+        
+        # Check for duplicates
+        existing = await document_crud.check_duplicate(
+            db=db,
+            subject_id=subject_id,
+            filename=file.filename,
+            file_hash=file_hash
         )
-    
-    # Create document record
-    document_data = {
-        'filename': file.filename,
-        'file_type': file.content_type or 'application/octet-stream',
-        'file_size': len(file_content),
-        'file_url': None,  # Will be set when we implement S3 upload
-        'processing_status': ProcessingStatus.PENDING,
-        'metadata_': {
-            'uploaded_at': datetime.now(timezone.utc).isoformat(),
-            'original_filename': file.filename
+        
+        if existing:
+            if existing.filename == file.filename:
+                detail = f"A document with the name '{file.filename}' already exists in this subject"
+            else:
+                detail = f"This file has already been uploaded to this subject as '{existing.filename}'"
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=detail
+            )
+        
+        # Create document record
+        document_data = {
+            'filename': file.filename,
+            'file_type': content_type or 'application/octet-stream',
+            'file_size': file_size,
+            'file_url': None,  # Will be set when we implement S3 upload
+            'file_hash': file_hash,
+            'processing_status': ProcessingStatus.PENDING,
+            'metadata_': {
+                'uploaded_at': datetime.now(timezone.utc).isoformat(),
+                'original_filename': file.filename,
+                'file_hash': file_hash
+            }
         }
-    }
-    
-    document = await document_crud.create(
-        db=db,
-        document_data=document_data,
-        subject_id=subject_id,
-        owner_id=current_user.id
-    )
+        
+        try:
+            document = await document_crud.create(
+                db=db,
+                document_data=document_data,
+                subject_id=subject_id,
+                owner_id=current_user.id
+            )
+        except IntegrityError as e:
+            await db.rollback()
+            constraint = _violated_constraint(e)
+            if constraint == DUPLICATE_FILE_CONSTRAINT:
+                # The same file was uploaded concurrently and committed first
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail="This file has already been uploaded to this subject"
+                )
+            if constraint == SUBJECT_FOREIGN_KEY:
+                # The subject was deleted after the (cached) ownership check
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Subject not found"
+                )
+            raise
+    except BaseException:
+        os.unlink(file_path)
+        raise
     
     # TODO: Upload file to S3 and update file_url
-    # For now, we'll process the file directly from memory
+    # For now, the ingest queue processes the temporary file and removes it
     
     # Start background processing
     chunking_config = {
@@ -301,13 +645,13 @@ async def upload_document(
         'chunk_overlap': settings.CHUNK_OVERLAP
     }
     
-    background_tasks.add_task(
-        process_document_background,
+    await enqueue_document_processing(
         document_id=document.id,
-        file_content=file_content,
+        file_path=file_path,
         filename=file.filename,
-        mime_type=file.content_type,
-        chunking_config=chunking_config
+        mime_type=content_type,
+        chunking_config=chunking_config,
+        file_hash=file_hash
     )
     
     logger.info(f"Document {document.id} uploaded and queued for processing")
@@ -322,23 +666,47 @@ async def upload_document(
     )
 
 
+def _encode_cursor(document: Document) -> str:
+    """Encode a document's (created_at, id) position as an opaque cursor."""
+    raw = f"{document.created_at.isoformat()}|{document.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    """Decode a cursor produced by `_encode_cursor`, or raise 400."""
+    try:
+        created_at, document_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(created_at), UUID(document_id)
+    except ValueError:  # also covers binascii.Error and UnicodeDecodeError
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
 @router.get("/subjects/{subject_id}/documents", response_model=DocumentListResponse)
 async def list_subject_documents(
-    subject_id: int,
+    subject_id: int = Depends(require_subject_owner),
     page: int = Query(1, ge=1, description="Page number"),
     size: int = Query(20, ge=1, le=100, description="Items per page"),
     include_failed: bool = Query(False, description="Include failed documents"),
+    cursor: Optional[str] = Query(None, description="Cursor returned as next_cursor by the previous page"),
     db: AsyncSession = Depends(get_db),
-    current_user: UserModel = Depends(get_current_active_user)
+    current_user: CurrentIdentity = Depends(get_current_active_user)
 ):
     """
     List all documents for a subject with pagination.
     
+    Pass the `next_cursor` of the previous response as `cursor` to fetch
+    the next page with keyset pagination, which costs the same at any
+    depth; `page` is then only echoed back.
+    
     Args:
         subject_id: The ID of the subject
         page: Page number (1-based)
         size: Number of items per page
         include_failed: Whether to include documents with failed processing
+        cursor: Optional keyset cursor from the previous page
         db: Database session
         current_user: The authenticated user
         
@@ -346,46 +714,36 @@ async def list_subject_documents(
         Paginated list of documents
         
     Raises:
-        HTTPException: If subject not found or unauthorized
+        HTTPException: If subject not found or unauthorized, or the cursor is invalid
     """
-    # Verify subject exists and user has access
-    subject = await subject_crud.get(db, subject_id=subject_id)
-    if not subject:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Subject not found"
-        )
-    
-    if not subject_crud.is_owner(subject, current_user.id):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not authorized to view documents for this subject"
-        )
-    
     # Calculate offset
     skip = (page - 1) * size
     
-    # Get documents
+    # Get documents (one extra row tells whether there is a next page)
     documents = await document_crud.get_by_subject(
         db=db,
         subject_id=subject_id,
         skip=skip,
-        limit=size,
-        include_failed=include_failed
+        limit=size + 1,
+        include_failed=include_failed,
+        cursor=_decode_cursor(cursor) if cursor else None
     )
+    has_more = len(documents) > size
+    documents = documents[:size]
     
     # Get total count for pagination
     stats = await document_crud.get_statistics(db=db, subject_id=subject_id)
     total = stats['total_documents']
     
     # Convert to response models
-    items = [DocumentResponse.from_orm(doc) for doc in documents]
+    items = _DOCUMENTS_ADAPTER.validate_python(documents, from_attributes=True)
     
     return DocumentListResponse(
         items=items,
         total=total,
         page=page,
-        size=size
+        size=size,
+        next_cursor=_encode_cursor(documents[-1]) if has_more else None
     )
 
 
@@ -393,7 +751,7 @@ async def list_subject_documents(
 async def get_document(
     document_id: UUID,
     db: AsyncSession = Depends(get_db),
-    current_user: UserModel = Depends(get_current_active_user)
+    current_user: CurrentIdentity = Depends(get_current_active_user)
 ):
     """
     Get detailed information about a specific document.
@@ -426,22 +784,35 @@ async def get_document(
     return DocumentResponse.from_orm(document)
 
 
-@router.get("/documents/{document_id}/status", response_model=DocumentProcessingStatus)
+@router.get(
+    "/documents/{document_id}/status",
+    response_model=DocumentProcessingStatus,
+    response_model_exclude_none=True
+)
 async def get_document_status(
     document_id: UUID,
+    request: Request,
+    response: Response,
     db: AsyncSession = Depends(get_db),
-    current_user: UserModel = Depends(get_current_active_user)
+    document: Row = Depends(require_document_access)
 ):
     """
     Get the processing status of a document.
     
     This endpoint is designed for polling to track document processing progress.
     It provides detailed information about the current processing state.
+    Responses carry a weak ETag built from the status and chunk counts (or,
+    once processing has settled, from the status and the row's updated_at);
+    a request whose If-None-Match matches it gets an empty 304 response
+    without loading the document or counting its chunks.
     
     Args:
         document_id: The UUID of the document
+        request: The incoming request, for the If-None-Match header
+        response: The outgoing response, for the ETag header
         db: Database session
-        current_user: The authenticated user
+        document: The verified document's id, owner, status and updated_at,
+                  from `require_document_access`
         
     Returns:
         Current processing status with progress information
@@ -449,44 +820,62 @@ async def get_document_status(
     Raises:
         HTTPException: If document not found or unauthorized
     """
-    document = await document_crud.get(db, document_id=document_id)
+    counts = None
     
-    if not document:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Document not found"
-        )
+    # Documents being processed report their progress outside the database
+    current = await progress.get_progress(document_id)
+    if current:
+        processing_status = current['stage']
+        counts = (current['processed'], current['total'])
+        etag = f'W/"{processing_status.value}:{counts[0]}:{counts[1]}"'
+    elif document.processing_status in SETTLED_STATUSES:
+        # Chunks only change while a document is processed, so a settled
+        # document changes only together with its row
+        processing_status = document.processing_status
+        etag = f'W/"{processing_status.value}:{document.updated_at.timestamp()}"'
+    else:
+        # Processed by another worker: the progress is only in the database
+        processing_status = document.processing_status
+        counts = await document_chunk_crud.count_progress(db=db, document_id=document_id)
+        etag = f'W/"{processing_status.value}:{counts[0]}:{counts[1]}"'
     
-    if not document_crud.is_owner(document, current_user.id):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not authorized to view this document"
+    # Pollers get a bodiless 304 while nothing has changed
+    if etag in _parse_if_none_match(request.headers.get("if-none-match")):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED,
+            headers={"ETag": etag, "Cache-Control": "no-cache"}
         )
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"
     
-    # Get chunks with embeddings to calculate progress
-    chunks = await document_chunk_crud.get_by_document(
-        db=db,
-        document_id=document_id,
-        include_embeddings=True
-    )
+    if counts is None:
+        counts = await document_chunk_crud.count_progress(db=db, document_id=document_id)
+    processed_chunks, total_chunks = counts
+    if not current and not total_chunks:
+        processed_chunks = total_chunks = None
     
-    processed_chunks = sum(1 for chunk in chunks if chunk.embedding is not None)
+    full_document = await document_crud.get(db, document_id=document_id)
+    if not full_document:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Document not found"
+        )
     
     # Estimate time remaining (simple heuristic)
     estimated_time = None
-    if document.processing_status == ProcessingStatus.EMBEDDING and chunks:
+    if processing_status == ProcessingStatus.EMBEDDING and total_chunks:
         # Assume 0.5 seconds per chunk as a rough estimate
-        remaining_chunks = len(chunks) - processed_chunks
+        remaining_chunks = total_chunks - (processed_chunks or 0)
         estimated_time = int(remaining_chunks * 0.5)
     
     return DocumentProcessingStatus(
-        document_id=document.id,
-        status=document.processing_status,
-        total_chunks=len(chunks) if chunks else None,
-        processed_chunks=processed_chunks if chunks else None,
-        processing_started_at=document.processing_started_at,
-        processing_completed_at=document.processing_completed_at,
-        processing_error=document.processing_error,
+        document_id=full_document.id,
+        status=processing_status,
+        total_chunks=total_chunks,
+        processed_chunks=processed_chunks,
+        processing_started_at=full_document.processing_started_at,
+        processing_completed_at=full_document.processing_completed_at,
+        processing_error=full_document.processing_error,
         estimated_time_remaining=estimated_time
     )
 
@@ -496,8 +885,9 @@ async def get_document_chunks(
     document_id: UUID,
     include_text: bool = Query(True, description="Include chunk text in response"),
     only_without_embeddings: bool = Query(False, description="Only return chunks without embeddings"),
+    include_embeddings: bool = Query(False, description="Include the embedding vector of each chunk"),
     db: AsyncSession = Depends(get_db),
-    current_user: UserModel = Depends(get_current_active_user)
+    document: Row = Depends(require_document_access)
 ):
     """
     Get all chunks for a document.
@@ -509,8 +899,9 @@ async def get_document_chunks(
         document_id: The UUID of the document
         include_text: Whether to include the full text of each chunk
         only_without_embeddings: Filter to only show chunks without embeddings
+        include_embeddings: Whether to load and return the embedding vectors
         db: Database session
-        current_user: The authenticated user
+        document: The verified document's id and owner, from `require_document_access`
         
     Returns:
         List of document chunks
@@ -518,20 +909,6 @@ async def get_document_chunks(
     Raises:
         HTTPException: If document not found or unauthorized
     """
-    document = await document_crud.get(db, document_id=document_id)
-    
-    if not document:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Document not found"
-        )
-    
-    if not document_crud.is_owner(document, current_user.id):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not authorized to view this document"
-        )
-    
     # Get chunks based on filter
     if only_without_embeddings:
         chunks = await document_chunk_crud.get_chunks_without_embeddings(
@@ -542,16 +919,18 @@ async def get_document_chunks(
         chunks = await document_chunk_crud.get_by_document(
             db=db,
             document_id=document_id,
-            include_embeddings=True
+            include_embeddings=include_embeddings
         )
     
     # Convert to response model
-    responses = []
-    for chunk in chunks:
-        response = DocumentChunkResponse.from_orm_with_embedding(chunk)
-        if not include_text:
-            response.chunk_text = f"[Text hidden - {len(chunk.chunk_text)} characters]"
-        responses.append(response)
+    responses = _CHUNKS_ADAPTER.validate_python(chunks, from_attributes=True)
+    if not include_text:
+        for response in responses:
+            response.chunk_text = f"[Text hidden - {len(response.chunk_text)} characters]"
+    if include_embeddings and not only_without_embeddings:
+        for response, chunk in zip(responses, chunks):
+            if chunk.embedding is not None:
+                response.embedding_vector = chunk.embedding.embedding_vector.to_list()
     
     return responses
 
@@ -561,11 +940,12 @@ async def generate_quiz_for_document(
     document_id: UUID,
     request: QuizGenerationRequest,
     db: AsyncSession = Depends(get_db),
-    current_user: UserModel = Depends(get_current_active_user)
+    current_user: CurrentIdentity = Depends(get_current_active_user)
 ):
     """Generate a multiple-choice quiz from a processed document."""
 
-    document = await document_crud.get(db, document_id=document_id)
+    # The quiz is generated from the text of the chunks
+    document = await document_crud.get(db, document_id=document_id, load_chunks=True)
 
     if not document:
         raise HTTPException(
@@ -602,7 +982,7 @@ async def generate_quiz_for_document(
 async def delete_document(
     document_id: UUID,
     db: AsyncSession = Depends(get_db),
-    current_user: UserModel = Depends(get_current_active_user)
+    current_user: CurrentIdentity = Depends(get_current_active_user)
 ):
     """
     Delete a document and all its associated data.
@@ -657,7 +1037,7 @@ async def delete_document(
 async def get_my_document_statistics(
     subject_id: Optional[int] = Query(None, description="Filter by subject"),
     db: AsyncSession = Depends(get_db),
-    current_user: UserModel = Depends(get_current_active_user)
+    current_user: CurrentIdentity = Depends(get_current_active_user)
 ):
     """
     Get document statistics for the current user.
@@ -675,12 +1055,7 @@ async def get_my_document_statistics(
     """
     # If subject_id provided, verify ownership
     if subject_id:
-        subject = await subject_crud.get(db, subject_id=subject_id)
-        if not subject or not subject_crud.is_owner(subject, current_user.id):
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Not authorized to view statistics for this subject"
-            )
+        await require_subject_owner(subject_id, db=db, current_user=current_user)
     
     stats = await document_crud.get_statistics(
         db=db,
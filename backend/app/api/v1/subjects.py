@@ -1,87 +1,64 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Query, Response
+from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
-from app.core.dependencies import get_db, get_current_active_user
+from typing import Optional
+from app.api.owned_router import make_owned_router
+from app.core.dependencies import CurrentIdentity, get_db, get_current_active_user
+from app.core.ownership_cache import forget_subject
 from app.crud.subject import subject_crud
-from app.schemas.subject import Subject, SubjectCreate, SubjectUpdate
-from app.models.user import User as UserModel
+from app.schemas.subject import Subject, SubjectCreate, SubjectList, SubjectUpdate
 
 
 router = APIRouter()
 
+# Compiled once: validates and serializes a whole page in pydantic-core
+_SUBJECT_LIST_ADAPTER = TypeAdapter(SubjectList)
 
-@router.get("/", response_model=List[Subject])
+
+@router.get("/", response_model=SubjectList)
 async def read_subjects(
-    skip: int = 0,
-    limit: int = 100,
+    cursor_id: Optional[int] = None,
+    limit: int = Query(100, ge=1, le=100),
     include_archived: bool = False,
+    skip: int = Query(0, ge=0, deprecated=True),
     db: AsyncSession = Depends(get_db),
-    current_user: UserModel = Depends(get_current_active_user)
+    current_user: CurrentIdentity = Depends(get_current_active_user)
 ):
-    """Get all subjects for current user"""
+    """
+    Get the current user's subjects, newest first.
+
+    Pass the `next_cursor_id` of the previous response as `cursor_id` to
+    fetch the next page with keyset pagination. `skip` is kept for backward
+    compatibility but is deprecated and ignored when a cursor is provided.
+    """
+    # Fetch one extra row to know whether there is a next page
     subjects = await subject_crud.get_by_owner(
-        db, owner_id=current_user.id, skip=skip, limit=limit,
-        include_archived=include_archived
+        db, owner_id=current_user.id, skip=skip, limit=limit + 1,
+        include_archived=include_archived, cursor_id=cursor_id
     )
-    return subjects
-
-
-@router.post("/", response_model=Subject)
-async def create_subject(
-    subject_in: SubjectCreate,
-    db: AsyncSession = Depends(get_db),
-    current_user: UserModel = Depends(get_current_active_user)
-):
-    """Create a new subject"""
-    subject = await subject_crud.create(db, obj_in=subject_in, owner_id=current_user.id)
-    return subject
-
-
-@router.get("/{subject_id}", response_model=Subject)
-async def read_subject(
-    subject_id: int,
-    db: AsyncSession = Depends(get_db),
-    current_user: UserModel = Depends(get_current_active_user)
-):
-    """Get a specific subject"""
-    subject = await subject_crud.get(db, subject_id=subject_id)
-    if not subject:
-        raise HTTPException(status_code=404, detail="Subject not found")
-    if not subject_crud.is_owner(subject, current_user.id):
-        raise HTTPException(status_code=403, detail="Not enough permissions")
-    return subject
-
-
-@router.put("/{subject_id}", response_model=Subject)
-async def update_subject(
-    subject_id: int,
-    subject_in: SubjectUpdate,
-    db: AsyncSession = Depends(get_db),
-    current_user: UserModel = Depends(get_current_active_user)
-):
-    """Update a subject"""
-    subject = await subject_crud.get(db, subject_id=subject_id)
-    if not subject:
-        raise HTTPException(status_code=404, detail="Subject not found")
-    if not subject_crud.is_owner(subject, current_user.id):
-        raise HTTPException(status_code=403, detail="Not enough permissions")
+    has_more = len(subjects) > limit
+    subjects = subjects[:limit]
     
-    subject = await subject_crud.update(db, db_obj=subject, obj_in=subject_in)
-    return subject
+    # Serialize straight to JSON bytes: returning the ORM objects would make
+    # FastAPI validate them, dump them to Python values and encode those again
+    page = _SUBJECT_LIST_ADAPTER.validate_python(
+        {
+            "items": subjects,
+            "next_cursor_id": subjects[-1].id if has_more else None
+        },
+        from_attributes=True
+    )
+    return Response(content=_SUBJECT_LIST_ADAPTER.dump_json(page), media_type="application/json")
 
 
-@router.delete("/{subject_id}") 
-async def delete_subject(
-    subject_id: int,
-    db: AsyncSession = Depends(get_db),
-    current_user: UserModel = Depends(get_current_active_user)
-):
-    """Delete a subject"""
-    subject = await subject_crud.get(db, subject_id=subject_id)
-    if not subject:
-        raise HTTPException(status_code=404, detail="Subject not found")
-    if not subject_crud.is_owner(subject, current_user.id):
-        raise HTTPException(status_code=403, detail="Not enough permissions")
-    
-    await subject_crud.delete(db, db_obj=subject)
-    return {"msg": "Subject deleted successfully"}
\ No newline at end of file
+# Create, read, update and delete are the generic owned-resource endpoints
+router.include_router(
+    make_owned_router(
+        schema_read=Subject,
+        schema_create=SubjectCreate,
+        schema_update=SubjectUpdate,
+        crud=subject_crud,
+        resource_name="Subject",
+        on_delete=forget_subject
+    )
+)
@@ -1,15 +1,22 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, UploadFile, File, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
-from app.core.dependencies import get_db, get_current_active_user
+from app.core.dependencies import CurrentIdentity, get_db, get_current_active_user, get_current_active_user_db
 from app.crud.user import user_crud
-from app.schemas.user import User, UserUpdate
+from app.schemas.user import User, UserUpdate, ProfilePictureUploadTarget, ProfilePictureConfirm
 from app.models.user import User as UserModel
-import boto3
-from PIL import Image
-import io
+import asyncio
 import uuid
+from botocore.exceptions import ClientError
 from app.core.config import settings
+from app.services.storage import delete_object_quietly, get_s3_client
+from app.services.image_processing import (
+    detect_image_type,
+    make_profile_picture,
+    IMAGE_SIGNATURE_LENGTH,
+    PROFILE_PICTURE_CONTENT_TYPE,
+    PROFILE_PICTURE_EXTENSION
+)
 
 
 router = APIRouter()
@@ -17,7 +24,7 @@ router = APIRouter()
 
 @router.get("/me", response_model=User)
 async def read_current_user(
-    current_user: UserModel = Depends(get_current_active_user)
+    current_user: UserModel = Depends(get_current_active_user_db)
 ):
     """Get current user profile"""
     return current_user
@@ -27,66 +34,165 @@ async def read_current_user(
 async def update_current_user(
     user_update: UserUpdate,
     db: AsyncSession = Depends(get_db),
-    current_user: UserModel = Depends(get_current_active_user)
+    current_user: UserModel = Depends(get_current_active_user_db)
 ):
     """Update current user profile"""
     user = await user_crud.update(db, db_obj=current_user, obj_in=user_update)
     return user
 
 
-@router.post("/me/profile-picture", response_model=User)
+# Legacy uploads are read in fixed-size chunks so the size cap is enforced
+# before the whole file is held in memory
+UPLOAD_READ_CHUNK_SIZE = 64 * 1024
+
+# Content type of pictures uploaded directly to S3, resized by the client
+DIRECT_UPLOAD_CONTENT_TYPE = "image/jpeg"
+
+
+def _profile_picture_prefix(user_id: int) -> str:
+    """Return the S3 key prefix under which a user's pictures are stored."""
+    return f"profile-pictures/{user_id}/"
+
+
+@router.get("/me/profile-picture/presign", response_model=ProfilePictureUploadTarget)
+async def presign_profile_picture_upload(
+    current_user: CurrentIdentity = Depends(get_current_active_user)
+):
+    """
+    Get a presigned S3 form for uploading a profile picture directly.
+
+    The client resizes the picture itself, POSTs it to S3 with the returned
+    URL and fields, then calls `/me/profile-picture/confirm` with the key.
+    The image bytes never go through the API. S3 enforces the content type
+    and the size limit.
+    """
+    file_key = f"{_profile_picture_prefix(current_user.id)}{uuid.uuid4()}.jpg"
+    max_bytes = settings.PROFILE_PICTURE_MAX_UPLOAD_MB * 1024 * 1024
+    
+    presigned = get_s3_client().generate_presigned_post(
+        Bucket=settings.AWS_BUCKET_NAME,
+        Key=file_key,
+        Fields={"Content-Type": DIRECT_UPLOAD_CONTENT_TYPE},
+        Conditions=[
+            ["content-length-range", 1, max_bytes],
+            {"Content-Type": DIRECT_UPLOAD_CONTENT_TYPE}
+        ],
+        ExpiresIn=settings.PROFILE_PICTURE_UPLOAD_EXPIRES
+    )
+    
+    return ProfilePictureUploadTarget(
+        url=presigned["url"],
+        fields=presigned["fields"],
+        key=file_key,
+        expires_in=settings.PROFILE_PICTURE_UPLOAD_EXPIRES
+    )
+
+
+@router.post("/me/profile-picture/confirm", response_model=User)
+async def confirm_profile_picture_upload(
+    picture: ProfilePictureConfirm,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_db),
+    current_user: UserModel = Depends(get_current_active_user_db)
+):
+    """Set a picture uploaded with a presigned form as the profile picture"""
+    if not picture.key.startswith(_profile_picture_prefix(current_user.id)) or ".." in picture.key:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid picture key")
+    
+    try:
+        head = await asyncio.to_thread(
+            get_s3_client().head_object,
+            Bucket=settings.AWS_BUCKET_NAME,
+            Key=picture.key
+        )
+    except ClientError as e:
+        if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Uploaded picture not found")
+        raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail="Failed to verify uploaded picture")
+    
+    if head.get("ContentType") != DIRECT_UPLOAD_CONTENT_TYPE:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Uploaded file must be a JPEG image")
+    
+    old_key = current_user.profile_picture_key
+    current_user.profile_picture_key = picture.key
+    db.add(current_user)
+    await db.commit()
+    
+    # The replaced picture is no longer referenced: remove it after responding
+    if old_key and old_key != picture.key:
+        background_tasks.add_task(delete_object_quietly, old_key)
+    
+    return current_user
+
+
+@router.post("/me/profile-picture", response_model=User, deprecated=True)
 async def upload_profile_picture(
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     db: AsyncSession = Depends(get_db),
-    current_user: UserModel = Depends(get_current_active_user)
+    current_user: UserModel = Depends(get_current_active_user_db)
 ):
-    """Upload user profile picture"""
-    # Validate file type
-    if not file.content_type.startswith("image/"):
+    """
+    Upload user profile picture through the API.
+
+    Deprecated: kept for older clients. New clients upload directly to S3
+    via `/me/profile-picture/presign` and `/me/profile-picture/confirm`.
+    """
+    # Validate the declared type first: rejects obvious non-images for free
+    if not file.content_type or not file.content_type.startswith("image/"):
         raise HTTPException(status_code=400, detail="File must be an image")
     
-    # Read and process image
-    contents = await file.read()
-    image = Image.open(io.BytesIO(contents))
-    
-    # Resize image to max 500x500
-    image.thumbnail((500, 500), Image.Resampling.LANCZOS)
+    # Read in bounded chunks so an oversized upload is rejected before it is
+    # held in memory, and sniff the format from the first chunk
+    max_bytes = settings.MAX_FILE_SIZE_MB * 1024 * 1024
+    buffer = bytearray()
+    signature_checked = False
+    while chunk := await file.read(UPLOAD_READ_CHUNK_SIZE):
+        buffer += chunk
+        if len(buffer) > max_bytes:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"Image exceeds maximum size of {settings.MAX_FILE_SIZE_MB}MB"
+            )
+        if not signature_checked and len(buffer) >= IMAGE_SIGNATURE_LENGTH:
+            if detect_image_type(bytes(buffer[:IMAGE_SIGNATURE_LENGTH])) is None:
+                raise HTTPException(status_code=400, detail="File is not a supported image")
+            signature_checked = True
     
-    # Convert to RGB if necessary
-    if image.mode != 'RGB':
-        image = image.convert('RGB')
+    if not signature_checked:
+        raise HTTPException(status_code=400, detail="File is not a supported image")
     
-    # Save to bytes
-    img_byte_arr = io.BytesIO()
-    image.save(img_byte_arr, format='JPEG', quality=85)
-    img_byte_arr = img_byte_arr.getvalue()
+    # Process image (resize + encode) off the event loop
+    loop = asyncio.get_running_loop()
+    try:
+        img_byte_arr = await loop.run_in_executor(None, make_profile_picture, buffer)
+    except OSError:  # also raised by Pillow for unreadable or truncated images
+        raise HTTPException(status_code=400, detail="File is not a valid image")
     
     # Upload to S3
-    s3_client = boto3.client(
-        's3',
-        aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-        aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-        region_name=settings.AWS_REGION
-    )
+    s3_client = get_s3_client()
     
-    file_key = f"profile-pictures/{current_user.id}/{uuid.uuid4()}.jpg"
+    file_key = f"{_profile_picture_prefix(current_user.id)}{uuid.uuid4()}.{PROFILE_PICTURE_EXTENSION}"
     
     try:
-        s3_client.put_object(
+        # boto3 is synchronous: run the PUT in a thread so it does not block the loop
+        await asyncio.to_thread(
+            s3_client.put_object,
             Bucket=settings.AWS_BUCKET_NAME,
             Key=file_key,
             Body=img_byte_arr,
-            ContentType='image/jpeg'
+            ContentType=PROFILE_PICTURE_CONTENT_TYPE
         )
         
-        # Generate public URL
-        profile_picture_url = f"https://{settings.AWS_BUCKET_NAME}.s3.{settings.AWS_REGION}.amazonaws.com/{file_key}"
-        
-        # Update user profile picture URL
-        current_user.profile_picture_url = profile_picture_url
+        # Update user profile picture (the URL is derived from the key)
+        old_key = current_user.profile_picture_key
+        current_user.profile_picture_key = file_key
         db.add(current_user)
         await db.commit()
-        await db.refresh(current_user)
+        
+        # The replaced picture is no longer referenced: remove it after responding
+        if old_key:
+            background_tasks.add_task(delete_object_quietly, old_key)
         
         return current_user
     except Exception as e:
@@ -95,34 +201,21 @@ async def upload_profile_picture(
 
 @router.delete("/me/profile-picture", response_model=User)
 async def delete_profile_picture(
+    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
-    current_user: UserModel = Depends(get_current_active_user)
+    current_user: UserModel = Depends(get_current_active_user_db)
 ):
     """Delete user profile picture"""
-    if current_user.profile_picture_url:
-        # Delete from S3
-        s3_client = boto3.client(
-            's3',
-            aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-            aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-            region_name=settings.AWS_REGION
-        )
-        
-        # Extract key from URL
-        file_key = current_user.profile_picture_url.split('.com/')[-1]
-        
-        try:
-            s3_client.delete_object(
-                Bucket=settings.AWS_BUCKET_NAME,
-                Key=file_key
-            )
-        except:
-            pass  # Continue even if S3 deletion fails
-        
-        # Remove URL from database
-        current_user.profile_picture_url = None
-        db.add(current_user)
-        await db.commit()
-        await db.refresh(current_user)
+    file_key = current_user.profile_picture_key
+    if not file_key:
+        return current_user
+    
+    # Remove the key from database
+    current_user.profile_picture_key = None
+    db.add(current_user)
+    await db.commit()
     
-    return current_user
\ No newline at end of file
+    # The response does not depend on the S3 delete: run it after responding
+    background_tasks.add_task(delete_object_quietly, file_key)
+    
+    return current_user
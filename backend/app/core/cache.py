@@ -0,0 +1,86 @@
+"""
+In-process caching utilities.
+
+This module provides a small time-to-live (TTL) cache used to avoid
+recomputing expensive, slowly-changing values (e.g. admin dashboard
+aggregates) on every request. Entries live in the worker process memory,
+so each Uvicorn worker keeps its own copy: use it only for data that can
+tolerate being a few seconds stale.
+"""
+
+import threading
+import time
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+class TTLCache:
+    """
+    A thread-safe mapping whose entries expire after a fixed number of seconds.
+
+    Attributes:
+        ttl_seconds (float): Default lifetime of an entry in seconds.
+        max_entries (int): Maximum number of entries kept. When the limit is
+                           reached, expired entries are purged first and then
+                           the oldest ones are evicted.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int = 1024):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: Dict[Hashable, Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Return the cached value for `key`, or None if missing or expired.
+
+        Args:
+            key (Hashable): The cache key.
+
+        Returns:
+            Optional[Any]: The cached value, or None.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        """
+        Store `value` under `key`.
+
+        Args:
+            key (Hashable): The cache key.
+            value (Any): The value to cache.
+            ttl_seconds (Optional[float]): Overrides the default lifetime.
+        """
+        expires_at = time.monotonic() + (ttl_seconds if ttl_seconds is not None else self.ttl_seconds)
+        with self._lock:
+            self._entries.pop(key, None)
+            if len(self._entries) >= self.max_entries:
+                self._evict()
+            self._entries[key] = (expires_at, value)
+
+    def delete(self, key: Hashable) -> None:
+        """Remove `key` from the cache if present."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove all entries from the cache."""
+        with self._lock:
+            self._entries.clear()
+
+    def _evict(self) -> None:
+        """Drop expired entries, then the oldest ones, until there is room."""
+        now = time.monotonic()
+        for key in [k for k, (expires_at, _) in self._entries.items() if expires_at <= now]:
+            del self._entries[key]
+        while len(self._entries) >= self.max_entries:
+            # dicts preserve insertion order, so the first key is the oldest
+            del self._entries[next(iter(self._entries))]
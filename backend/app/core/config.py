@@ -6,10 +6,10 @@ It uses pydantic-settings to load settings from environment variables
 and/or a .env file, providing type validation and a single source of truth for configuration values.
 """
 
-from pydantic_settings import BaseSettings
-from typing import List, Union
+import functools
+from pydantic_settings import BaseSettings, SettingsConfigDict
+from typing import List, Optional, Union
 from pydantic import AnyHttpUrl, field_validator
-import os
 
 class Settings(BaseSettings):
     """
@@ -59,11 +59,33 @@ class Settings(BaseSettings):
 
     # Database connection
     DATABASE_URL: str
+    # Connection pool: 20 persistent connections plus up to 40 for bursts,
+    # recycled every 30 minutes and checked out most-recently-used first
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 40
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_POOL_USE_LIFO: bool = True
+    # Seconds a request waits for a free connection before failing
+    DB_POOL_TIMEOUT: int = 30
+    # TCP keepalives on the server side of each connection, so idle
+    # connections are not silently dropped by load balancers or NAT
+    DB_TCP_KEEPALIVES_IDLE: int = 60
+    DB_TCP_KEEPALIVES_INTERVAL: int = 10
+    DB_TCP_KEEPALIVES_COUNT: int = 3
+    # Set when connecting through PgBouncer in transaction mode, which cannot
+    # keep asyncpg's per-connection prepared statements
+    DB_USE_PGBOUNCER: bool = False
+    # Statements asyncpg keeps prepared per connection (when not behind PgBouncer)
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = 500
+    # Log every SQL statement (debugging only; bound values are never logged)
+    SQL_ECHO: bool = False
 
     # CORS (Cross-Origin Resource Sharing)
     BACKEND_CORS_ORIGINS: List[AnyHttpUrl] = []
 
     @field_validator("BACKEND_CORS_ORIGINS", mode="before")
+    @classmethod
     def assemble_cors_origins(cls, v: Union[str, List[str]]) -> Union[List[str], str]:
         """
         Allow parsing a comma-separated string of origins from environment variables.
@@ -101,11 +123,25 @@ class Settings(BaseSettings):
     AWS_SECRET_ACCESS_KEY: str = ""
     AWS_BUCKET_NAME: str = ""
     AWS_REGION: str = "us-east-1"
+    # Largest profile picture accepted by presigned uploads
+    PROFILE_PICTURE_MAX_UPLOAD_MB: int = 2
+    # Lifetime of presigned upload forms, in seconds
+    PROFILE_PICTURE_UPLOAD_EXPIRES: int = 300
+    # Lifetime of the presigned URLs profile pictures are served from, in seconds
+    PROFILE_PICTURE_URL_EXPIRES: int = 3600
 
     # OpenAI settings for embeddings
-    OPENAI_API_KEY: str = os.getenv("OPENAI_API_KEY", "")
+    OPENAI_API_KEY: str = ""
     EMBEDDING_MODEL: str = "text-embedding-3-small"
     EMBEDDING_DIMENSIONS: int = 1536
+    # Number of chunks sent to the embeddings API in a single request
+    EMBEDDING_BATCH_SIZE: int = 100
+    # Token budget of a single embeddings request (10% is kept as a safety margin)
+    EMBEDDING_BATCH_MAX_TOKENS: int = 8191
+    # Number of embeddings requests sent concurrently for one document
+    EMBEDDING_BATCH_CONCURRENCY: int = 4
+    # Attempts per embeddings request on rate limits, 5xx responses and timeouts
+    EMBEDDING_BATCH_MAX_ATTEMPTS: int = 3
 
     QUIZ_GENERATION_MODEL: str = "gpt-4o-mini"
     QUIZ_GENERATION_TEMPERATURE: float = 0.2
@@ -129,13 +165,44 @@ class Settings(BaseSettings):
     CHUNK_SIZE: int = 1000
     CHUNK_OVERLAP: int = 200
     CHUNKING_STRATEGY: str = "sentence"  # fixed_size, sentence, paragraph
-
-    class Config:
-        """Pydantic model configuration."""
+    # Documents processed concurrently per worker, and retries of a failed pipeline
+    INGEST_MAX_CONCURRENT_JOBS: int = 4
+    INGEST_MAX_RETRIES: int = 3
+    # Processes used for parsing and chunking (None = number of CPUs)
+    CPU_POOL_WORKERS: Optional[int] = None
+
+    # Vector search settings
+    # When enabled, candidates are prefiltered on the binary-quantized column
+    # and then rescored with the full halfvec embeddings.
+    VECTOR_SEARCH_BINARY_PREFILTER: bool = False
+    VECTOR_SEARCH_RESCORE_CANDIDATES: int = 200
+    # Default hnsw.ef_search applied per transaction to ANN queries
+    VECTOR_SEARCH_EF_SEARCH: int = 100
+
+    model_config = SettingsConfigDict(
         # Specifies the .env file to load environment variables from
-        env_file = ".env"
+        env_file=".env",
         # Ensures that environment variable names match the field names case-sensitively
-        case_sensitive = True
+        case_sensitive=True,
+        # Variables meant for other tools (e.g. WEB_CONCURRENCY) may share the .env file
+        extra="ignore",
+        # Settings are read-only once loaded
+        frozen=True,
+    )
+
+
+@functools.lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Load the application settings once.
+
+    Can also be used as a FastAPI dependency (`Depends(get_settings)`).
+
+    Returns:
+        Settings: The shared, immutable settings instance.
+    """
+    return Settings()
+
 
 # Instantiate the settings object to be used throughout the application
-settings = Settings()
+settings = get_settings()
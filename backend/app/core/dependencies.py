@@ -2,11 +2,18 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from typing import AsyncGenerator
+from sqlalchemy.orm import raiseload
+from sqlalchemy.engine import Row
+from dataclasses import dataclass
+from typing import AsyncGenerator, Awaitable, Callable, Optional
+from uuid import UUID
 from app.db.session import AsyncSessionLocal
 from app.core.config import settings
 from app.core.security import decode_token
-from app.models.user import User
+from app.models.user import User, UserRole
+from app.models.document import Document
+from app.crud.subject import subject_crud
+from app.core.ownership_cache import get_cached_owner, remember_owner
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login")
 
@@ -27,78 +34,203 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
-async def get_current_user(
-    db: AsyncSession = Depends(get_db),
-    token: str = Depends(oauth2_scheme)
-) -> User:
+@dataclass(frozen=True)
+class CurrentIdentity:
     """
-    A dependency to get the current user from a JWT access token.
+    The authenticated user as described by the claims of their access token.
+
+    Most endpoints only need the user's ID and role, which the access token
+    carries, so they are authorized without loading the user from the
+    database. Endpoints that read or modify the user's profile use
+    `get_current_active_user_db` instead.
+
+    Attributes:
+        id (int): The user's ID ("sub" claim).
+        is_active (bool): Whether the account was active when the token was issued.
+        role (UserRole): The user's role when the token was issued.
+        token_version (int): The user's token version when the token was issued.
+    """
+    id: int
+    is_active: bool
+    role: UserRole
+    token_version: int
+
+    @property
+    def is_admin(self) -> bool:
+        """Check if user has admin privileges"""
+        return self.role in (UserRole.ADMIN, UserRole.SUPER_ADMIN)
+
+    @property
+    def is_super_admin(self) -> bool:
+        """Check if user is a super admin"""
+        return self.role == UserRole.SUPER_ADMIN
 
-    This function is responsible for validating the authentication token provided
-    in the request's "Authorization: Bearer <token>" header. It decodes the token,
-    verifies that it is an "access" token, extracts the user identifier ("sub" claim),
-    and retrieves the corresponding user object from the database.
+
+def _credentials_exception() -> HTTPException:
+    """Build the 401 error returned for any invalid access token."""
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+def _identity_from_token(token: str) -> CurrentIdentity:
+    """Decode an access token into a `CurrentIdentity`, or raise 401."""
+    payload = decode_token(token)
+    if payload is None or payload.get("type") != "access":
+        raise _credentials_exception()
+    
+    try:
+        return CurrentIdentity(
+            id=int(payload["sub"]),
+            is_active=bool(payload["act"]),
+            role=UserRole(payload["rol"]),
+            token_version=int(payload.get("tv", 0))
+        )
+    except (KeyError, ValueError, TypeError):
+        raise _credentials_exception()
+
+
+async def get_current_identity(token: str = Depends(oauth2_scheme)) -> CurrentIdentity:
+    """
+    A dependency to get the current user's identity from a JWT access token.
+
+    The token is decoded and verified, and its claims are returned as a
+    `CurrentIdentity`; the database is not queried. Role or status changes
+    therefore take effect when the access token is next refreshed.
 
     Note: JWT 'sub' claim is always a string per JWT standard, 
     but our database uses integer IDs, so we convert here.
 
     Args:
-        db (Session): The database session, injected by the `get_db` dependency.
         token (str): The OAuth2 bearer token, automatically extracted from the
                     request header by the `oauth2_scheme` dependency.
 
     Raises:
         HTTPException(401): If the token is invalid, expired, of the wrong type
-                            (e.g., a refresh token), does not contain a valid user
-                            ID, or if the user no longer exists in the database.
+                            (e.g., a refresh token), or lacks the identity claims
+                            (tokens issued before they were introduced).
+
+    Returns:
+        CurrentIdentity: The identity of the authenticated user.
+    """
+    return _identity_from_token(token)
+
+
+async def get_current_active_user(
+    identity: CurrentIdentity = Depends(get_current_identity)
+) -> CurrentIdentity:
+    """
+    A dependency to get the identity of the current, active user.
+
+    This is the dependency most endpoints use: it only reads the claims of
+    the access token and ensures the `is_active` claim is True.
+
+    Args:
+        identity (CurrentIdentity): The identity, injected by the
+                                    `get_current_identity` dependency.
+
+    Raises:
+        HTTPException(400): If the user is inactive.
+
+    Returns:
+        CurrentIdentity: The identity of the authenticated, active user.
+    """
+    if not identity.is_active:
+        raise HTTPException(status_code=400, detail="Inactive user")
+    return identity
+
+
+# Roles in increasing order of privilege
+_ROLE_RANK = {
+    UserRole.USER: 0,
+    UserRole.ADMIN: 1,
+    UserRole.SUPER_ADMIN: 2,
+}
+
+
+def require_user(
+    min_role: UserRole = UserRole.USER,
+    detail: Optional[str] = None
+) -> Callable[[str], Awaitable[CurrentIdentity]]:
+    """
+    Build a dependency that authorizes an active user with at least `min_role`.
+
+    The returned dependency decodes the token, checks the `is_active` claim
+    and compares the role claim in a single function, instead of chaining
+    `get_current_identity` -> `get_current_active_user` -> a role guard.
+    Like `get_current_active_user`, it does not query the database.
+
+    Usage: `Depends(require_user(UserRole.ADMIN))`
+
+    Args:
+        min_role (UserRole): The least privileged role that is allowed.
+        detail (Optional[str]): The error message returned when the role is
+                                insufficient.
+
+    Returns:
+        Callable: An async dependency returning the user's `CurrentIdentity`.
+    """
+    min_rank = _ROLE_RANK[min_role]
+    forbidden_detail = detail or "Not enough permissions"
+
+    async def dependency(token: str = Depends(oauth2_scheme)) -> CurrentIdentity:
+        identity = _identity_from_token(token)
+        if not identity.is_active:
+            raise HTTPException(status_code=400, detail="Inactive user")
+        if _ROLE_RANK[identity.role] < min_rank:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=forbidden_detail
+            )
+        return identity
+
+    return dependency
+
+
+async def get_current_user_db(
+    db: AsyncSession = Depends(get_db),
+    identity: CurrentIdentity = Depends(get_current_identity)
+) -> User:
+    """
+    A dependency to load the current user from the database.
+
+    Used by endpoints that return or modify the user itself. The token's
+    version must still match the user's, so revoked sessions cannot use
+    these endpoints.
+
+    Args:
+        db (AsyncSession): The database session, injected by the `get_db` dependency.
+        identity (CurrentIdentity): The identity from the access token.
+
+    Raises:
+        HTTPException(401): If the user no longer exists or the token was revoked.
 
     Returns:
         User: The authenticated user's SQLAlchemy model instance.
     """
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
+    # Role checks and the user schemas only read columns: forbid relationship
+    # loads so that one added later fails loudly instead of adding queries
+    result = await db.execute(
+        select(User).options(raiseload('*')).filter(User.id == identity.id)
     )
-    
-    payload = decode_token(token)
-    if payload is None or payload.get("type") != "access":
-        raise credentials_exception
-    
-    # Extract user ID from 'sub' claim
-    # JWT standard requires 'sub' to be a string, so we convert to int for DB query
-    user_id_str = payload.get("sub")
-    if not user_id_str:
-        raise credentials_exception
-    
-    try:
-        user_id = int(user_id_str)
-    except (ValueError, TypeError):
-        # Invalid user ID format in token
-        raise credentials_exception
-
-    result = await db.execute(select(User).filter(User.id == user_id))
     user = result.scalar_one_or_none()
 
-    if user is None:
-        raise credentials_exception
+    if user is None or user.token_version != identity.token_version:
+        raise _credentials_exception()
     
     return user
 
 
-async def get_current_active_user(
-    current_user: User = Depends(get_current_user)
+async def get_current_active_user_db(
+    current_user: User = Depends(get_current_user_db)
 ) -> User:
     """
-    A dependency to get the current, active user.
-
-    This function builds upon `get_current_user`. It first retrieves the authenticated
-    user and then performs an additional check to ensure that the user's `is_active`
-    flag is True. This is useful for endpoints that should only be accessible to
-    users who have not been deactivated.
+    A dependency to load the current, active user from the database.
 
     Args:
-        current_user (User): The user object, injected by the `get_current_user`
+        current_user (User): The user object, injected by the `get_current_user_db`
                             dependency.
 
     Raises:
@@ -109,4 +241,95 @@ async def get_current_active_user(
     """
     if not current_user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
-    return current_user
\ No newline at end of file
+    return current_user
+
+
+async def require_document_access(
+    document_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    current_user: CurrentIdentity = Depends(get_current_active_user)
+) -> Row:
+    """
+    A dependency that verifies the current user may access a document.
+
+    Only the columns needed for the check (and for deciding whether the
+    document can be used) are selected, so no ORM object or relationship is
+    loaded. Endpoints that need the full document can load it afterwards.
+
+    Args:
+        document_id (UUID): The document to check, taken from the path.
+        db (AsyncSession): The database session.
+        current_user (CurrentIdentity): The authenticated, active user.
+
+    Raises:
+        HTTPException(404): If the document does not exist.
+        HTTPException(403): If the user neither owns the document nor is an admin.
+
+    Returns:
+        Row: A row with the document's `id`, `owner_id`, `processing_status`
+             and `updated_at`.
+    """
+    result = await db.execute(
+        select(Document.id, Document.owner_id, Document.processing_status, Document.updated_at)
+        .where(Document.id == document_id)
+    )
+    document = result.one_or_none()
+
+    if document is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Document not found"
+        )
+
+    if document.owner_id != current_user.id and not current_user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to access this document"
+        )
+
+    return document
+
+
+async def require_subject_owner(
+    subject_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: CurrentIdentity = Depends(get_current_active_user)
+) -> int:
+    """
+    A dependency that verifies the current user owns a subject.
+
+    Only the subject's owner ID is selected, so handlers that merely need to
+    know the subject is theirs do not load the full row. Owners are cached
+    for a few seconds (see `app.core.ownership_cache`), and FastAPI runs the
+    dependency once per request however many times it is declared.
+
+    Args:
+        subject_id (int): The subject to check, taken from the path.
+        db (AsyncSession): The database session.
+        current_user (CurrentIdentity): The authenticated, active user.
+
+    Raises:
+        HTTPException(404): If the subject does not exist.
+        HTTPException(403): If the user does not own the subject.
+
+    Returns:
+        int: The ID of the verified subject.
+    """
+    owner_id = get_cached_owner(subject_id)
+    if owner_id is None:
+        owner_id = await subject_crud.get_owner_id(db, subject_id=subject_id)
+
+        if owner_id is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Subject not found"
+            )
+        remember_owner(subject_id, owner_id)
+
+    if owner_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+
+    return subject_id
@@ -0,0 +1,49 @@
+"""
+Process pool for CPU-bound work.
+
+Document parsing and chunking are pure-Python CPU work: running them on the
+event loop blocks every other request served by the same worker. This module
+owns a process pool those steps are offloaded to with `run_in_executor`.
+The pool is created lazily on first use and shut down with the application.
+"""
+
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_cpu_pool: Optional[ProcessPoolExecutor] = None
+
+
+def get_cpu_pool() -> ProcessPoolExecutor:
+    """
+    Get or create the process pool for CPU-bound tasks.
+
+    Workers are started with the "spawn" method so that they never inherit
+    the event loop, threads or open connections of the API process. Functions
+    submitted to the pool must be importable top-level functions, and their
+    arguments and results must be picklable.
+
+    Returns:
+        ProcessPoolExecutor: The shared process pool.
+    """
+    global _cpu_pool
+    if _cpu_pool is None:
+        _cpu_pool = ProcessPoolExecutor(
+            max_workers=settings.CPU_POOL_WORKERS,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+        logger.info(f"Started CPU process pool with {_cpu_pool._max_workers} workers")
+    return _cpu_pool
+
+
+def shutdown_cpu_pool() -> None:
+    """Shut down the process pool if it was started."""
+    global _cpu_pool
+    if _cpu_pool is not None:
+        _cpu_pool.shutdown(wait=True, cancel_futures=True)
+        _cpu_pool = None
@@ -0,0 +1,54 @@
+"""
+Short-lived cache of subject ownership.
+
+Most subject-scoped endpoints start by checking that the subject belongs to
+the current user, and a dashboard typically fires several of them for the
+same subject in quick succession. The owner of each subject is remembered
+for a few seconds so those checks do not hit the database every time.
+
+A subject never changes owner, so an entry can only go stale when the
+subject is deleted; the delete endpoint forgets it explicitly. Like every
+in-process cache, each worker keeps its own copy.
+"""
+
+from typing import Optional
+
+from app.core.cache import TTLCache
+
+OWNERSHIP_TTL_SECONDS = 30
+
+_owners = TTLCache(ttl_seconds=OWNERSHIP_TTL_SECONDS, max_entries=10000)
+
+
+def get_cached_owner(subject_id: int) -> Optional[int]:
+    """
+    Return the cached owner ID of a subject, if known.
+
+    Args:
+        subject_id (int): The ID of the subject.
+
+    Returns:
+        Optional[int]: The owner's user ID, or None on a cache miss.
+    """
+    return _owners.get(subject_id)
+
+
+def remember_owner(subject_id: int, owner_id: int) -> None:
+    """
+    Cache the owner ID of a subject.
+
+    Args:
+        subject_id (int): The ID of the subject.
+        owner_id (int): The ID of the user owning it.
+    """
+    _owners.set(subject_id, owner_id)
+
+
+def forget_subject(subject_id: int) -> None:
+    """
+    Drop a subject from the cache, e.g. after it has been deleted.
+
+    Args:
+        subject_id (int): The ID of the subject.
+    """
+    _owners.delete(subject_id)
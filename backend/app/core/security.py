@@ -1,11 +1,23 @@
+import time
 from datetime import datetime, timedelta
-from typing import Optional, Union
+from typing import Optional, Tuple, Union
 from jose import JWTError, jwt
 from passlib.context import CryptContext
+from app.core.cache import TTLCache
 from app.core.config import settings
 
+# Hashing is deliberately slow (~100-300 ms of CPU per call): call the
+# password functions below through asyncio.to_thread from async code.
+# Hashes using deprecated schemes or settings are upgraded on login via
+# `verify_and_update_password`.
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# Verified token payloads, keyed by the raw token. A token's payload cannot
+# change, so it is reused until the token expires (at most TOKEN_CACHE_TTL
+# seconds) instead of re-verifying the signature on every request.
+TOKEN_CACHE_TTL = 60
+_token_cache = TTLCache(ttl_seconds=TOKEN_CACHE_TTL, max_entries=8192)
+
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """
@@ -77,6 +89,26 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verifies a password and re-hashes it if its stored hash is outdated.
+
+    When the stored hash uses a scheme or cost the passlib context marks as
+    deprecated, a fresh hash with the current settings is returned along
+    with the result, so the caller can replace it.
+
+    Args:
+        plain_password (str): The password provided by the user during login.
+        hashed_password (str): The password hash stored in the database.
+
+    Returns:
+        Tuple[bool, Optional[str]]: Whether the password is correct, and the
+                                    replacement hash if the stored one should
+                                    be updated (None otherwise).
+    """
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
 def get_password_hash(password: str) -> str:
     """
     Hashes a plain-text password using bcrypt.
@@ -100,7 +132,9 @@ def decode_token(token: str) -> Optional[dict]:
 
     This function attempts to decode the given token using the application's
     SECRET_KEY and algorithm. It implicitly verifies the token's signature and
-    expiration time.
+    expiration time. Valid payloads are cached for up to a minute (never past
+    the token's expiration), so repeated requests with the same token skip
+    the signature check and JSON parsing.
 
     Args:
         token (str): The JWT to decode.
@@ -110,8 +144,33 @@ def decode_token(token: str) -> Optional[dict]:
                         or None if validation fails (due to an invalid signature,
                         expiration, or any other JWT-related error).
     """
+    payload = _token_cache.get(token)
+    if payload is not None:
+        if payload.get("exp", 0) > time.time():
+            return payload
+        _token_cache.delete(token)
+
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        return payload
     except JWTError:
-        return None
\ No newline at end of file
+        return None
+
+    expires_in = payload.get("exp", 0) - time.time()
+    if expires_in > 0:
+        _token_cache.set(token, payload, ttl_seconds=min(TOKEN_CACHE_TTL, expires_in))
+    return payload
+
+
+def warm_up() -> None:
+    """
+    Loads the password hashing and JWT backends ahead of the first request.
+
+    passlib only loads and self-tests the bcrypt backend on first use, and
+    python-jose resolves its algorithm implementation on first encode, which
+    would otherwise add their cost to the first login or authenticated
+    request served by each worker. Called once at startup; like the password
+    functions, it is CPU-bound and should run in a thread.
+    """
+    pwd_context.hash("warm-up")
+    token = jwt.encode({"sub": "0", "type": "warm-up"}, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
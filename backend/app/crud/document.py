@@ -7,11 +7,17 @@ following the same patterns as the existing CRUD modules in the application.
 
 from typing import List, Optional, Dict, Any, Sequence, Tuple
 from uuid import UUID
+from datetime import datetime
+import asyncio
+import json
 import logging
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_, or_
-from sqlalchemy.orm import selectinload
+from sqlalchemy import Integer, any_, bindparam, select, func, or_, cast, delete, event, exists, literal, text, tuple_, update
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, UUID as PG_UUID, insert as pg_insert
+from sqlalchemy.orm import selectinload, with_expression
+from sqlalchemy.orm.attributes import set_committed_value
+from pgvector.sqlalchemy import HALFVEC
 
 from app.models.document import (
     Document,
@@ -20,9 +26,63 @@ from app.models.document import (
     ProcessingStatus
 )
 from app.schemas.document import DocumentCreate, DocumentUpdate
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.db.bulk import copy_records
 
 logger = logging.getLogger(__name__)
 
+# Document statistics change slowly but are polled by dashboards and used as
+# the total of every list page: cache them briefly per (owner_id, subject_id)
+STATISTICS_CACHE_TTL = 60
+_statistics_cache = TTLCache(ttl_seconds=STATISTICS_CACHE_TTL, max_entries=4096)
+# Statistics being computed, per cache key: concurrent callers on a cold
+# cache await the same computation instead of each running the GROUP BY
+_statistics_in_flight: Dict[Tuple[Optional[int], Optional[int]], asyncio.Future] = {}
+
+
+@event.listens_for(Document, "after_insert")
+@event.listens_for(Document, "after_update")
+@event.listens_for(Document, "after_delete")
+def _invalidate_statistics_cache(mapper, connection, target):
+    """Drop the cached statistics a document row contributes to whenever it changes."""
+    invalidate_statistics_cache(target.owner_id, target.subject_id)
+
+
+def invalidate_statistics_cache(owner_id: Optional[int], subject_id: Optional[int]) -> None:
+    """
+    Drop the cached statistics of an owner's subject.
+    
+    ORM flushes invalidate the cache through the mapper events above; Core
+    statements that change documents (bulk UPDATEs, cascading DELETEs) bypass
+    those events and must call this after committing.
+    """
+    for key in (
+        (owner_id, subject_id),
+        (owner_id, None),
+        (None, subject_id),
+        (None, None),
+    ):
+        _statistics_cache.delete(key)
+
+
+async def set_ef_search(db: AsyncSession, ef_search: int = 100) -> None:
+    """
+    Set the HNSW candidate list size for the current transaction only.
+    
+    Higher values improve recall of approximate nearest neighbour searches
+    at the cost of latency. `SET LOCAL` does not accept bind parameters,
+    so the transaction-local `set_config` equivalent is used instead.
+    
+    Args:
+        db: Database session whose transaction will run the ANN query
+        ef_search: Size of the dynamic candidate list (pgvector default is 40)
+    """
+    await db.execute(
+        text("SELECT set_config('hnsw.ef_search', :ef_search, true)"),
+        {"ef_search": str(int(ef_search))}
+    )
+
 
 class CRUDDocument:
     """
@@ -32,41 +92,106 @@ class CRUDDocument:
     operations, maintaining consistency with the existing CRUD patterns.
     """
     
-    async def get(self, db: AsyncSession, document_id: UUID) -> Optional[Document]:
+    async def get(
+        self,
+        db: AsyncSession,
+        document_id: UUID,
+        *,
+        load_chunks: bool = False
+    ) -> Optional[Document]:
         """
         Retrieve a single document by its ID.
         
+        A document can have thousands of chunks, so they are only loaded
+        when asked for.
+        
         Args:
             db: Database session
             document_id: The UUID of the document
+            load_chunks: Whether to eager load the document's chunks
             
         Returns:
             The Document object if found, otherwise None
         """
-        result = await db.execute(
-            select(Document)
-            .filter(Document.id == document_id)
-            .options(selectinload(Document.chunks))  # Eager load chunks
-        )
+        query = select(Document).filter(Document.id == document_id)
+        if load_chunks:
+            query = query.options(selectinload(Document.chunks))
+        
+        result = await db.execute(query)
         return result.scalar_one_or_none()
     
+    async def get_many(
+        self,
+        db: AsyncSession,
+        document_ids: Sequence[UUID],
+        *,
+        load_chunks: bool = False
+    ) -> List[Optional[Document]]:
+        """
+        Retrieve several documents by ID in a single query.
+        
+        Use this instead of calling `get` in a loop when rendering a list of
+        documents that don't share a subject or owner.
+        
+        Args:
+            db: Database session
+            document_ids: The UUIDs of the documents
+            load_chunks: Whether to eager load the documents' chunks
+            
+        Returns:
+            The documents in the order of `document_ids`, with None for IDs
+            that don't exist
+        """
+        if not document_ids:
+            return []
+        
+        query = select(Document).where(
+            Document.id == any_(bindparam('document_ids', list(document_ids), type_=ARRAY(PG_UUID(as_uuid=True))))
+        )
+        if load_chunks:
+            query = query.options(selectinload(Document.chunks))
+        
+        result = await db.execute(query)
+        by_id = {document.id: document for document in result.scalars()}
+        return [by_id.get(document_id) for document_id in document_ids]
+    
+    @staticmethod
+    def _paginate(query, skip: int, limit: int, cursor: Optional[Tuple[datetime, UUID]]):
+        """Order newest first and apply keyset (cursor) or OFFSET pagination."""
+        if cursor is not None:
+            query = query.filter(
+                tuple_(Document.created_at, Document.id) < tuple_(cursor[0], cursor[1])
+            )
+        query = query.order_by(Document.created_at.desc(), Document.id.desc())
+        if cursor is None and skip:
+            query = query.offset(skip)
+        return query.limit(limit)
+    
     async def get_by_subject(
         self,
         db: AsyncSession,
         subject_id: int,
         skip: int = 0,
         limit: int = 100,
-        include_failed: bool = False
+        include_failed: bool = False,
+        cursor: Optional[Tuple[datetime, UUID]] = None
     ) -> List[Document]:
         """
         Retrieve all documents for a specific subject with pagination.
         
+        Documents are ordered by (created_at, id), newest first. Pass the
+        (created_at, id) of the last document of the previous page as
+        `cursor` for keyset pagination, which uses the
+        (subject_id, created_at, id) index and costs the same at any page
+        depth; `skip` is ignored in that case.
+        
         Args:
             db: Database session
             subject_id: The ID of the subject
             skip: Number of records to skip
             limit: Maximum number of records to return
             include_failed: Whether to include documents with failed processing
+            cursor: Optional (created_at, id) to continue after
             
         Returns:
             List of Document objects for the subject
@@ -78,8 +203,7 @@ class CRUDDocument:
                 Document.processing_status != ProcessingStatus.FAILED
             )
         
-        query = query.order_by(Document.created_at.desc())
-        query = query.offset(skip).limit(limit)
+        query = self._paginate(query, skip, limit, cursor)
         
         result = await db.execute(query)
         return result.scalars().all()
@@ -90,17 +214,22 @@ class CRUDDocument:
         owner_id: int,
         skip: int = 0,
         limit: int = 100,
-        processing_status: Optional[ProcessingStatus] = None
+        processing_status: Optional[ProcessingStatus] = None,
+        cursor: Optional[Tuple[datetime, UUID]] = None
     ) -> List[Document]:
         """
         Retrieve all documents for a specific user with optional filtering.
         
+        Ordering and keyset pagination work as in `get_by_subject`, using
+        the (owner_id, created_at, id) index.
+        
         Args:
             db: Database session
             owner_id: The ID of the document owner
             skip: Number of records to skip
             limit: Maximum number of records to return
             processing_status: Optional filter by processing status
+            cursor: Optional (created_at, id) to continue after
             
         Returns:
             List of Document objects owned by the user
@@ -110,8 +239,7 @@ class CRUDDocument:
         if processing_status:
             query = query.filter(Document.processing_status == processing_status)
         
-        query = query.order_by(Document.created_at.desc())
-        query = query.offset(skip).limit(limit)
+        query = self._paginate(query, skip, limit, cursor)
         
         result = await db.execute(query)
         return result.scalars().all()
@@ -143,7 +271,6 @@ class CRUDDocument:
         
         db.add(document)
         await db.commit()
-        await db.refresh(document)
         
         logger.info(f"Created document {document.id} for subject {subject_id}")
         return document
@@ -160,6 +287,10 @@ class CRUDDocument:
         Only allows updating of metadata_ field, not processing status
         or file information.
         
+        The new keys are merged into the stored metadata by PostgreSQL
+        (jsonb `||`) in a single UPDATE ... RETURNING, so the current value
+        does not have to be loaded and written back whole.
+        
         Args:
             db: Database session
             document: The document to update
@@ -168,16 +299,20 @@ class CRUDDocument:
         Returns:
             The updated Document object
         """
-        if update_data.metadata_ is not None:
-            # Merge new metadata_ with existing
-            document.metadata_ = {
-                **(document.metadata_ or {}),
-                **update_data.metadata_
-            }
-        
-        db.add(document)
-        await db.commit()
-        await db.refresh(document)
+        if update_data.metadata is not None:
+            merged = func.coalesce(Document.metadata_, cast({}, JSONB)).op('||')(
+                cast(update_data.metadata, JSONB)
+            )
+            result = await db.execute(
+                update(Document)
+                .where(Document.id == document.id)
+                .values(metadata_=merged)
+                .returning(Document.metadata_)
+                .execution_options(synchronize_session=False)
+            )
+            # Reflect the stored value without marking the document dirty
+            set_committed_value(document, 'metadata_', result.scalar_one())
+            await db.commit()
         
         logger.info(f"Updated document {document.id}")
         return document
@@ -220,51 +355,91 @@ class CRUDDocument:
             owner_id: Optional user ID to filter by
             subject_id: Optional subject ID to filter by
             
+        Results are cached for up to `STATISTICS_CACHE_TTL` seconds and
+        dropped as soon as a matching document is created, updated (e.g. a
+        status transition) or deleted through the ORM. Concurrent calls on
+        a cold cache share a single query. Treat the returned dictionary as
+        read-only, as it may be shared with other callers.
+        
         Returns:
             Dictionary containing various statistics
         """
-        base_query = select(Document)
+        cache_key = (owner_id or None, subject_id or None)
+        cached = _statistics_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        in_flight = _statistics_in_flight.get(cache_key)
+        if in_flight is not None:
+            # shield: a cancelled follower must not cancel the shared result
+            statistics = await asyncio.shield(in_flight)
+            if statistics is not None:
+                return statistics
+            # The request computing them was cancelled: compute them here
+            return await self.get_statistics(db, owner_id=owner_id, subject_id=subject_id)
+        
+        future = asyncio.get_running_loop().create_future()
+        _statistics_in_flight[cache_key] = future
+        try:
+            statistics = await self._compute_statistics(db, owner_id, subject_id)
+        except BaseException as e:
+            if isinstance(e, asyncio.CancelledError):
+                # Only the leader's request was cancelled: wake the followers
+                # with None so that they retry instead of being cancelled too
+                future.set_result(None)
+            else:
+                future.set_exception(e)
+                # Mark it retrieved: there may be no follower to await it
+                future.exception()
+            raise
+        else:
+            _statistics_cache.set(cache_key, statistics)
+            future.set_result(statistics)
+            return statistics
+        finally:
+            _statistics_in_flight.pop(cache_key, None)
+    
+    async def _compute_statistics(
+        self,
+        db: AsyncSession,
+        owner_id: Optional[int],
+        subject_id: Optional[int]
+    ) -> Dict[str, Any]:
+        """Run the statistics query behind `get_statistics`."""
+        # One GROUP BY scan yields the per-status counts and the totals
+        query = select(
+            Document.processing_status,
+            func.count(Document.id),
+            func.coalesce(func.sum(Document.file_size), 0),
+            func.coalesce(func.sum(Document.total_chunks), 0)
+        ).group_by(Document.processing_status)
         
         if owner_id:
-            base_query = base_query.filter(Document.owner_id == owner_id)
+            query = query.filter(Document.owner_id == owner_id)
         if subject_id:
-            base_query = base_query.filter(Document.subject_id == subject_id)
-        
-        # Get counts by status
-        status_counts = {}
-        for status in ProcessingStatus:
-            count_query = base_query.filter(Document.processing_status == status)
-            result = await db.execute(select(func.count()).select_from(count_query.subquery()))
-            status_counts[status.value] = result.scalar()
-        
-        # Get total document count
-        total_result = await db.execute(
-            select(func.count()).select_from(base_query.subquery())
-        )
-        total_documents = total_result.scalar()
+            query = query.filter(Document.subject_id == subject_id)
         
-        # Get total file size
-        size_result = await db.execute(
-            select(func.sum(Document.file_size)).select_from(base_query.subquery())
-        )
-        total_size = size_result.scalar() or 0
-        
-        # Get total chunks count
-        chunks_query = (
-            select(func.sum(Document.total_chunks))
-            .select_from(base_query.subquery())
-        )
-        chunks_result = await db.execute(chunks_query)
-        total_chunks = chunks_result.scalar() or 0
+        result = await db.execute(query)
         
-        return {
+        status_counts = {status.value: 0 for status in ProcessingStatus}
+        total_documents = 0
+        total_size = 0
+        total_chunks = 0
+        for status, count, size, chunks in result.all():
+            status_counts[status.value] = count
+            total_documents += count
+            total_size += size
+            total_chunks += chunks
+        
+        statistics = {
             'total_documents': total_documents,
             'total_size_bytes': total_size,
             'total_chunks': total_chunks,
             'status_breakdown': status_counts,
             'average_size_bytes': total_size // total_documents if total_documents > 0 else 0,
-            'ready_for_search': status_counts.get(ProcessingStatus.COMPLETED, 0)
+            'ready_for_search': status_counts[ProcessingStatus.COMPLETED.value]
         }
+        return statistics
     
     def is_owner(self, document: Document, user_id: int) -> bool:
         """
@@ -289,27 +464,27 @@ class CRUDDocument:
         """
         Check if a duplicate document already exists.
         
-        Can check by filename or file hash for more accurate detection.
+        A document is a duplicate if it has the same filename or, when a
+        file hash is given, the same content as an existing document of the
+        subject (e.g. the same file uploaded under another name).
         
         Args:
             db: Database session
             subject_id: The subject to check within
             filename: The filename to check
-            file_hash: Optional file hash for exact matching
+            file_hash: Optional SHA-256 of the file content
             
         Returns:
             Existing document if duplicate found, otherwise None
         """
+        match = Document.filename == filename
+        if file_hash:
+            match = or_(match, Document.file_hash == file_hash)
+        
         query = select(Document).filter(
             Document.subject_id == subject_id,
-            Document.filename == filename
-        )
-        
-        if file_hash:
-            # Check in metadata_ for file hash
-            query = query.filter(
-                Document.metadata_['file_hash'].astext == file_hash
-            )
+            match
+        ).limit(1)
         
         result = await db.execute(query)
         return result.scalar_one_or_none()
@@ -323,6 +498,19 @@ class CRUDDocumentChunk:
     and batch creation.
     """
     
+    # Rows per multi-row INSERT statement in create_batch
+    INSERT_BATCH_SIZE = 1000
+    
+    # Above this many chunks, create_batch streams rows with COPY instead
+    COPY_THRESHOLD = 1000
+    COPY_COLUMNS = (
+        'id', 'document_id', 'chunk_index', 'chunk_text', 'start_char',
+        'end_char', 'metadata_'
+    )
+    
+    # Minimum hnsw.ef_search per requested result in search_similar_chunks
+    EF_SEARCH_PER_RESULT = 4
+    
     async def get_by_document(
         self,
         db: AsyncSession,
@@ -332,6 +520,10 @@ class CRUDDocumentChunk:
         """
         Get all chunks for a document.
         
+        The `has_embedding` flag of every chunk is always populated with an
+        EXISTS subquery, so callers only need `include_embeddings` when they
+        actually use the vectors.
+        
         Args:
             db: Database session
             document_id: The document UUID
@@ -340,9 +532,12 @@ class CRUDDocumentChunk:
         Returns:
             List of DocumentChunk objects ordered by chunk_index
         """
+        has_embedding = exists().where(DocumentEmbedding.chunk_id == DocumentChunk.id)
         query = select(DocumentChunk).filter(
             DocumentChunk.document_id == document_id
-        ).order_by(DocumentChunk.chunk_index)
+        ).order_by(DocumentChunk.chunk_index).options(
+            with_expression(DocumentChunk.has_embedding, has_embedding)
+        )
         
         if include_embeddings:
             query = query.options(selectinload(DocumentChunk.embedding))
@@ -350,6 +545,50 @@ class CRUDDocumentChunk:
         result = await db.execute(query)
         return result.scalars().all()
     
+    async def count_progress(
+        self,
+        db: AsyncSession,
+        document_id: UUID
+    ) -> Tuple[int, int]:
+        """
+        Count the embedded and total chunks of a document in a single query.
+        
+        Args:
+            db: Database session
+            document_id: The document UUID
+            
+        Returns:
+            A tuple of (chunks_with_embeddings, total_chunks)
+        """
+        query = (
+            select(
+                func.count(DocumentEmbedding.chunk_id),
+                func.count()
+            )
+            .select_from(DocumentChunk)
+            .outerjoin(DocumentEmbedding, DocumentEmbedding.chunk_id == DocumentChunk.id)
+            .where(DocumentChunk.document_id == document_id)
+        )
+        
+        result = await db.execute(query)
+        processed, total = result.one()
+        return processed, total
+    
+    async def delete_by_document(self, db: AsyncSession, document_id: UUID) -> None:
+        """
+        Delete all chunks of a document (their embeddings cascade in the database).
+        
+        The deletion is not committed, so it can share a transaction with the
+        chunks that replace them.
+        
+        Args:
+            db: Database session
+            document_id: The document UUID
+        """
+        await db.execute(
+            delete(DocumentChunk).where(DocumentChunk.document_id == document_id)
+        )
+    
     async def create_batch(
         self,
         db: AsyncSession,
@@ -359,38 +598,150 @@ class CRUDDocumentChunk:
         """
         Create multiple chunks for a document in a single operation.
         
+        Up to `COPY_THRESHOLD` chunks are inserted with multi-row INSERTs;
+        larger documents are streamed with COPY, which avoids building and
+        parsing huge statements.
+        
+        The insert is idempotent: chunks whose (document_id, chunk_index)
+        already exists, e.g. when an ingestion is retried after a partial
+        failure, are skipped and returned with their stored id.
+        
         Args:
             db: Database session
             document_id: The document these chunks belong to
             chunks: List of chunk data dictionaries
             
         Returns:
-            List of created DocumentChunk objects
+            List of created DocumentChunk objects (not attached to the session)
         """
-        chunk_objects = []
-        
+        rows = []
         for chunk_data in chunks:
-            chunk = DocumentChunk(
-                document_id=document_id,
-                **chunk_data
-            )
-            db.add(chunk)
-            chunk_objects.append(chunk)
-        
-        # Update document total chunks count
-        document = await db.get(Document, document_id)
-        if document:
-            document.total_chunks = len(chunks)
+            row = {'document_id': document_id, **chunk_data}
+            # TextChunk.to_dict() uses the "metadata" key; the column is metadata_
+            if 'metadata' in row:
+                row['metadata_'] = row.pop('metadata')
+            rows.append(row)
+        
+        # COPY cannot skip conflicting rows: only use it for a document
+        # that has no chunks yet
+        if len(rows) > self.COPY_THRESHOLD and not await self._has_chunks(db, document_id):
+            chunk_objects = await self._copy_rows(db, rows)
+        else:
+            chunk_objects = await self._insert_rows(db, rows)
+        
+        # Update document total chunks count in the same transaction, without
+        # loading the document (the chunks replace any previous ones, so the
+        # count is set rather than incremented). The default session
+        # synchronization also updates a Document the caller already holds.
+        result = await db.execute(
+            update(Document)
+            .where(Document.id == document_id)
+            .values(total_chunks=len(chunks))
+            .returning(Document.owner_id, Document.subject_id)
+        )
+        owner = result.one_or_none()
         
         await db.commit()
-        
-        # Refresh all chunks to get their IDs
-        for chunk in chunk_objects:
-            await db.refresh(chunk)
+        # The Core UPDATE does not fire the mapper events
+        if owner is not None:
+            invalidate_statistics_cache(owner.owner_id, owner.subject_id)
         
         logger.info(f"Created {len(chunk_objects)} chunks for document {document_id}")
         return chunk_objects
     
+    async def _insert_rows(
+        self,
+        db: AsyncSession,
+        rows: List[Dict[str, Any]]
+    ) -> List[DocumentChunk]:
+        """Insert chunk rows with multi-row INSERT ... RETURNING statements."""
+        # One multi-row INSERT ... RETURNING per slice instead of one INSERT
+        # per chunk plus one SELECT per refresh; slicing keeps each statement
+        # well below PostgreSQL's 65535 bind parameter limit
+        chunk_objects = []
+        for start in range(0, len(rows), self.INSERT_BATCH_SIZE):
+            batch = rows[start:start + self.INSERT_BATCH_SIZE]
+            result = await db.execute(
+                pg_insert(DocumentChunk)
+                .values(batch)
+                .on_conflict_do_nothing(index_elements=['document_id', 'chunk_index'])
+                .returning(DocumentChunk.id, DocumentChunk.chunk_index)
+            )
+            ids_by_index = {chunk_index: chunk_id for chunk_id, chunk_index in result.all()}
+            
+            if len(ids_by_index) < len(batch):
+                # Some chunks already existed (a retried ingestion): only then
+                # look up their ids
+                existing = await db.execute(
+                    select(DocumentChunk.id, DocumentChunk.chunk_index).where(
+                        DocumentChunk.document_id == batch[0]['document_id'],
+                        DocumentChunk.chunk_index == any_(bindparam(
+                            'chunk_indexes',
+                            [row['chunk_index'] for row in batch
+                             if row['chunk_index'] not in ids_by_index],
+                            type_=ARRAY(Integer)
+                        ))
+                    )
+                )
+                ids_by_index.update(
+                    (chunk_index, chunk_id) for chunk_id, chunk_index in existing.all()
+                )
+            
+            # Build the chunk objects from the returned ids without re-selecting them
+            chunk_objects.extend(
+                DocumentChunk(id=ids_by_index[row['chunk_index']], **row)
+                for row in batch
+            )
+        return chunk_objects
+    
+    async def _has_chunks(self, db: AsyncSession, document_id: UUID) -> bool:
+        """Check whether a document already has any chunk."""
+        result = await db.execute(
+            select(exists().where(DocumentChunk.document_id == document_id))
+        )
+        return result.scalar()
+    
+    async def _copy_rows(
+        self,
+        db: AsyncSession,
+        rows: List[Dict[str, Any]]
+    ) -> List[DocumentChunk]:
+        """
+        Insert chunk rows through the COPY protocol.
+        
+        COPY cannot return the generated ids, so they are reserved from the
+        table's sequence first (one query), then sent along with the rows.
+        The timestamps are left to the columns' server defaults.
+        """
+        ids_result = await db.execute(
+            text("SELECT nextval('document_chunks_id_seq') FROM generate_series(1, :count)"),
+            {"count": len(rows)}
+        )
+        ids = ids_result.scalars().all()
+        
+        await copy_records(
+            db,
+            DocumentChunk.__tablename__,
+            columns=self.COPY_COLUMNS,
+            records=(
+                (
+                    chunk_id,
+                    row['document_id'],
+                    row['chunk_index'],
+                    row['chunk_text'],
+                    row.get('start_char'),
+                    row.get('end_char'),
+                    json.dumps(row.get('metadata_') or {}),
+                )
+                for chunk_id, row in zip(ids, rows)
+            )
+        )
+        
+        return [
+            DocumentChunk(id=chunk_id, **row)
+            for chunk_id, row in zip(ids, rows)
+        ]
+    
     async def get_chunks_without_embeddings(
         self,
         db: AsyncSession,
@@ -408,16 +759,17 @@ class CRUDDocumentChunk:
         Returns:
             List of DocumentChunk objects without embeddings
         """
-        # Subquery to find chunks with embeddings
-        has_embedding = select(DocumentEmbedding.chunk_id).subquery()
+        # NOT EXISTS is planned as an anti-join probing the unique chunk_id
+        # index, instead of materializing every embedded chunk id (NOT IN)
+        has_embedding = exists().where(DocumentEmbedding.chunk_id == DocumentChunk.id)
         
         # Main query to find chunks without embeddings
         query = select(DocumentChunk).filter(
-            and_(
-                DocumentChunk.document_id == document_id,
-                DocumentChunk.id.notin_(has_embedding)
-            )
-        ).order_by(DocumentChunk.chunk_index)
+            DocumentChunk.document_id == document_id,
+            ~has_embedding
+        ).order_by(DocumentChunk.chunk_index).options(
+            with_expression(DocumentChunk.has_embedding, literal(False))
+        )
         
         result = await db.execute(query)
         return result.scalars().all()
@@ -428,9 +780,28 @@ class CRUDDocumentChunk:
         document_id: UUID,
         query_embedding: Sequence[float],
         limit: int,
+        ef_search: Optional[int] = None,
     ) -> List[Tuple[DocumentChunk, float]]:
         """Return document chunks ordered by vector similarity."""
 
+        # The HNSW scan yields at most ef_search candidates, and the
+        # document_id filter is applied to them afterwards: keep the
+        # candidate list a few times larger than the requested limit
+        ef_search = max(
+            ef_search or settings.VECTOR_SEARCH_EF_SEARCH,
+            limit * self.EF_SEARCH_PER_RESULT
+        )
+        if settings.VECTOR_SEARCH_BINARY_PREFILTER:
+            # The bit index scan is cut off at ef_search rows as well, so it
+            # must be able to return the full rescore candidate set
+            ef_search = max(ef_search, settings.VECTOR_SEARCH_RESCORE_CANDIDATES)
+        await set_ef_search(db, ef_search)
+
+        if settings.VECTOR_SEARCH_BINARY_PREFILTER:
+            return await self._search_with_binary_prefilter(
+                db, document_id, query_embedding, limit
+            )
+
         distance_metric = DocumentEmbedding.embedding_vector.cosine_distance(query_embedding)
 
         stmt = (
@@ -444,6 +815,41 @@ class CRUDDocumentChunk:
         result = await db.execute(stmt)
         return result.all()
 
+    async def _search_with_binary_prefilter(
+        self,
+        db: AsyncSession,
+        document_id: UUID,
+        query_embedding: Sequence[float],
+        limit: int,
+    ) -> List[Tuple[DocumentChunk, float]]:
+        """Prefilter by Hamming distance on the binary column, then rescore with halfvec."""
+
+        query_vector = literal(list(query_embedding), HALFVEC(len(query_embedding)))
+        hamming_distance = DocumentEmbedding.embedding_bits.hamming_distance(
+            func.binary_quantize(query_vector)
+        )
+
+        candidates = (
+            select(DocumentEmbedding.chunk_id, DocumentEmbedding.embedding_vector)
+            .join(DocumentChunk, DocumentChunk.id == DocumentEmbedding.chunk_id)
+            .where(DocumentChunk.document_id == document_id)
+            .order_by(hamming_distance)
+            .limit(max(limit, settings.VECTOR_SEARCH_RESCORE_CANDIDATES))
+            .subquery()
+        )
+
+        distance_metric = candidates.c.embedding_vector.cosine_distance(query_embedding)
+
+        stmt = (
+            select(DocumentChunk, distance_metric.label("distance"))
+            .join(candidates, candidates.c.chunk_id == DocumentChunk.id)
+            .order_by(distance_metric)
+            .limit(limit)
+        )
+
+        result = await db.execute(stmt)
+        return result.all()
+
 
 # Create singleton instances
 document_crud = CRUDDocument()
@@ -1,6 +1,8 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, update, delete
+from sqlalchemy.orm import raiseload
 from typing import Optional, List
+from app.crud.document import invalidate_statistics_cache
 from app.models.subject import Subject
 from app.schemas.subject import SubjectCreate, SubjectUpdate
 
@@ -28,16 +30,62 @@ class CRUDSubject:
         )
         return result.scalar_one_or_none()
     
+    async def get_for_owner(
+        self, db: AsyncSession, subject_id: int, owner_id: int
+    ) -> Optional[Subject]:
+        """
+        Retrieves a subject only if it belongs to the given owner.
+
+        The ownership check is part of the query, so fetching a subject the
+        user may access takes a single round-trip.
+
+        Args:
+            db (AsyncSession): The database session.
+            subject_id (int): The ID of the subject to retrieve.
+            owner_id (int): The ID of the user who must own the subject.
+
+        Returns:
+            Optional[Subject]: The Subject object if it exists and belongs to
+                               `owner_id`, otherwise None.
+        """
+        result = await db.execute(
+            select(Subject).where(Subject.id == subject_id, Subject.owner_id == owner_id)
+        )
+        return result.scalar_one_or_none()
+
+    async def get_owner_id(self, db: AsyncSession, subject_id: int) -> Optional[int]:
+        """
+        Retrieves only the owner ID of a subject.
+
+        Ownership checks need a single column, so this avoids hydrating the
+        full Subject object.
+
+        Args:
+            db (AsyncSession): The database session.
+            subject_id (int): The ID of the subject.
+
+        Returns:
+            Optional[int]: The ID of the subject's owner, or None if the subject
+                           does not exist.
+        """
+        return await db.scalar(
+            select(Subject.owner_id).where(Subject.id == subject_id)
+        )
+
     async def get_by_owner(
         self, db: AsyncSession, owner_id: int, skip: int = 0, limit: int = 100,
-        include_archived: bool = False
+        include_archived: bool = False, cursor_id: Optional[int] = None
     ) -> List[Subject]:
         """
-        Retrieves a list of subjects belonging to a specific owner, with pagination.
+        Retrieves a list of subjects belonging to a specific owner, newest first.
 
         By default, this method excludes archived subjects. This behavior can be
         overridden by setting the `include_archived` flag to True.
 
+        Pass the ID of the last subject of the previous page as `cursor_id` to
+        use keyset pagination, which costs the same regardless of page depth;
+        `skip` (OFFSET) is ignored in that case.
+
         Args:
             db (AsyncSession): The database session.
             owner_id (int): The ID of the user whose subjects are to be retrieved.
@@ -45,14 +93,26 @@ class CRUDSubject:
             limit (int): The maximum number of records to return. Defaults to 100.
             include_archived (bool): Whether to include archived subjects in the
                                     result. Defaults to False.
+            cursor_id (Optional[int]): Only return subjects with a lower ID.
 
         Returns:
-            List[Subject]: A list of Subject objects owned by the specified user.
+            List[Subject]: A list of Subject objects owned by the specified user,
+                           ordered by descending ID.
         """
-        query = select(Subject).filter(Subject.owner_id == owner_id)
+        # The Subject schema only reads columns; relationship loads would be N+1
+        query = (
+            select(Subject)
+            .options(raiseload('*'))
+            .filter(Subject.owner_id == owner_id)
+        )
         if not include_archived:
             query = query.filter(Subject.is_archived == False)
-        query = query.offset(skip).limit(limit)
+        if cursor_id is not None:
+            query = query.filter(Subject.id < cursor_id)
+        query = query.order_by(Subject.id.desc())
+        if cursor_id is None and skip:
+            query = query.offset(skip)
+        query = query.limit(limit)
         
         result = await db.execute(query)
         return result.scalars().all()
@@ -76,7 +136,6 @@ class CRUDSubject:
         db_obj = Subject(**obj_in.model_dump(), owner_id=owner_id)
         db.add(db_obj)
         await db.commit()
-        await db.refresh(db_obj)
         return db_obj
     
     async def update(self, db: AsyncSession, db_obj: Subject, obj_in: SubjectUpdate) -> Subject:
@@ -100,9 +159,84 @@ class CRUDSubject:
             setattr(db_obj, field, value)
         db.add(db_obj)
         await db.commit()
-        await db.refresh(db_obj)
         return db_obj
     
+    async def update_by_id(
+        self, db: AsyncSession, subject_id: int, obj_in: SubjectUpdate,
+        owner_id: Optional[int] = None
+    ) -> Optional[Subject]:
+        """
+        Updates a subject by ID in a single UPDATE ... RETURNING statement.
+
+        Like `update`, only the fields set in `obj_in` are written; the subject
+        does not have to be loaded first. When `owner_id` is given, the
+        ownership check is part of the statement.
+
+        Args:
+            db (AsyncSession): The database session.
+            subject_id (int): The ID of the subject to update.
+            obj_in (SubjectUpdate): A Pydantic schema with the fields to update.
+            owner_id (Optional[int]): If set, only update the subject if this
+                                      user owns it.
+
+        Returns:
+            Optional[Subject]: The updated Subject object, or None if it does not
+                               exist (or is not owned by `owner_id`).
+        """
+        update_data = obj_in.model_dump(exclude_unset=True)
+        if not update_data:
+            if owner_id is not None:
+                return await self.get_for_owner(db, subject_id=subject_id, owner_id=owner_id)
+            return await self.get(db, subject_id=subject_id)
+
+        conditions = [Subject.id == subject_id]
+        if owner_id is not None:
+            conditions.append(Subject.owner_id == owner_id)
+
+        result = await db.execute(
+            update(Subject)
+            .where(*conditions)
+            .values(**update_data)
+            .returning(Subject)
+            .execution_options(synchronize_session=False)
+        )
+        subject = result.scalar_one_or_none()
+        await db.commit()
+        return subject
+
+    async def delete_by_id(
+        self, db: AsyncSession, subject_id: int, owner_id: Optional[int] = None
+    ) -> bool:
+        """
+        Deletes a subject by ID without loading it.
+
+        The subject's documents, chunks and embeddings are removed by the
+        database through their ON DELETE CASCADE foreign keys.
+
+        Args:
+            db (AsyncSession): The database session.
+            subject_id (int): The ID of the subject to delete.
+            owner_id (Optional[int]): If set, only delete the subject if this
+                                      user owns it.
+
+        Returns:
+            bool: True if a subject was deleted, False otherwise.
+        """
+        conditions = [Subject.id == subject_id]
+        if owner_id is not None:
+            conditions.append(Subject.owner_id == owner_id)
+
+        result = await db.execute(
+            delete(Subject).where(*conditions).returning(Subject.owner_id)
+        )
+        deleted_owner_id = result.scalar_one_or_none()
+        await db.commit()
+        if deleted_owner_id is None:
+            return False
+        # The database cascades the documents away without the ORM seeing them
+        invalidate_statistics_cache(deleted_owner_id, subject_id)
+        return True
+
     async def delete(self, db: AsyncSession, db_obj: Subject) -> Subject:
         """
         Deletes a subject from the database.
@@ -1,9 +1,10 @@
+import asyncio
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, or_
+from sqlalchemy import select, lambda_stmt
 from typing import Optional, List
 from app.models.user import User, UserRole
 from app.schemas.user import UserCreate, UserUpdate
-from app.core.security import get_password_hash, verify_password
+from app.core.security import get_password_hash, verify_and_update_password
 
 
 class CRUDUser:
@@ -18,7 +19,7 @@ class CRUDUser:
         Retrieves a single user by their unique ID.
 
         Args:
-            db (Session): The database session.
+            db (AsyncSession): The database session.
             user_id (int): The ID of the user to retrieve.
 
         Returns:
@@ -32,13 +33,15 @@ class CRUDUser:
         Retrieves a single user by their email address.
 
         Args:
-            db (Session): The database session.
+            db (AsyncSession): The database session.
             email (str): The email of the user to retrieve.
 
         Returns:
             Optional[User]: The User object if found, otherwise None.
         """
-        result = await db.execute(select(User).filter(User.email == email))
+        # Login hot path: the lambda statement is compiled once and cached,
+        # only the bound email changes between calls
+        result = await db.execute(lambda_stmt(lambda: select(User).filter(User.email == email)))
         return result.scalar_one_or_none()
     
     async def get_by_username(self, db: AsyncSession, username: str) -> Optional[User]:
@@ -46,13 +49,15 @@ class CRUDUser:
         Retrieves a single user by their username.
 
         Args:
-            db (Session): The database session.
+            db (AsyncSession): The database session.
             username (str): The username of the user to retrieve.
 
         Returns:
             Optional[User]: The User object if found, otherwise None.
         """
-        result = await db.execute(select(User).filter(User.username == username))
+        # Login hot path: the lambda statement is compiled once and cached,
+        # only the bound username changes between calls
+        result = await db.execute(lambda_stmt(lambda: select(User).filter(User.username == username)))
         return result.scalar_one_or_none()
     
     async def get_by_email_or_username(self, db: AsyncSession, login: str) -> Optional[User]:
@@ -60,28 +65,32 @@ class CRUDUser:
         Retrieves a single user by either their email or username.
 
         This is primarily used for login where the user can provide either
-        credential.
+        credential. Emails always contain an '@', so the login is routed to a
+        single equality lookup on the matching unique index instead of an OR
+        across both columns. Usernames are not validated against '@', so a
+        login containing one falls back to the username when no email matches.
 
         Args:
-            db (Session): The database session.
+            db (AsyncSession): The database session.
             login (str): The email or username of the user to retrieve.
 
         Returns:
             Optional[User]: The User object if found, otherwise None.
         """
-        result = await db.execute(
-            select(User).filter(
-                or_(User.email == login, User.username == login)
-            )
-        )
-        return result.scalar_one_or_none()
+        if '@' not in login:
+            return await self.get_by_username(db, login)
+        
+        user = await self.get_by_email(db, login)
+        if user is None:
+            user = await self.get_by_username(db, login)
+        return user
     
     async def get_multi(self, db: AsyncSession, skip: int = 0, limit: int = 100) -> List[User]:
         """
         Retrieves a list of users with pagination.
 
         Args:
-            db (Session): The database session.
+            db (AsyncSession): The database session.
             skip (int): The number of records to skip. Defaults to 0.
             limit (int): The maximum number of records to return. Defaults to 100.
 
@@ -102,17 +111,19 @@ class CRUDUser:
         to the database.
 
         Args:
-            db (Session): The database session.
+            db (AsyncSession): The database session.
             obj_in (UserCreate): A Pydantic schema containing the new user's data.
 
         Returns:
             User: The newly created User object.
         """
+        # Hashing is CPU-bound: keep it off the event loop
+        hashed_password = await asyncio.to_thread(get_password_hash, obj_in.password)
         db_obj = User(
             email=obj_in.email,
             username=obj_in.username,
             full_name=obj_in.full_name,
-            hashed_password=get_password_hash(obj_in.password),
+            hashed_password=hashed_password,
             academic_level=obj_in.academic_level,
             bio=obj_in.bio,
             show_profile_publicly=obj_in.show_profile_publicly,
@@ -120,7 +131,6 @@ class CRUDUser:
         )
         db.add(db_obj)
         await db.commit()
-        await db.refresh(db_obj)
         return db_obj
     
     async def update(self, db: AsyncSession, db_obj: User, obj_in: UserUpdate) -> User:
@@ -132,7 +142,7 @@ class CRUDUser:
         to the provided database object.
 
         Args:
-            db (Session): The database session.
+            db (AsyncSession): The database session.
             db_obj (User): The existing User object to be updated.
             obj_in (UserUpdate): A Pydantic schema with the fields to update.
 
@@ -144,7 +154,6 @@ class CRUDUser:
             setattr(db_obj, field, value)
         db.add(db_obj)
         await db.commit()
-        await db.refresh(db_obj)
         return db_obj
     
     async def authenticate(self, db: AsyncSession, username: str, password: str) -> Optional[User]:
@@ -152,10 +161,12 @@ class CRUDUser:
         Authenticates a user by checking their credentials.
 
         It first finds the user by their email or username and then verifies that
-        the provided password matches the stored hash.
+        the provided password matches the stored hash. The check runs in a worker
+        thread, and an outdated hash is replaced with one using the current
+        hashing settings.
 
         Args:
-            db (Session): The database session.
+            db (AsyncSession): The database session.
             username (str): The user's email or username.
             password (str): The user's plain-text password.
 
@@ -166,8 +177,14 @@ class CRUDUser:
         user = await self.get_by_email_or_username(db, username)
         if not user:
             return None
-        if not verify_password(password, user.hashed_password):
+        verified, new_hash = await asyncio.to_thread(
+            verify_and_update_password, password, user.hashed_password
+        )
+        if not verified:
             return None
+        if new_hash:
+            user.hashed_password = new_hash
+            await db.commit()
         return user
     
     def is_active(self, user: User) -> bool:
@@ -222,7 +239,6 @@ class CRUDUser:
         user.role = new_role
         db.add(user)
         await db.commit()
-        await db.refresh(user)
         return user
     
     async def count_by_role(self, db: AsyncSession, role: UserRole) -> int:
@@ -1,7 +1,7 @@
 from app.db.base import Base, TimestampMixin
 from app.models.user import User
 from app.models.subject import Subject
-from app.models.document import Document, DocumentChunk, DocumentEmbedding
+from app.models.document import Document, DocumentChunk, DocumentEmbedding, EmbeddingCache
 
 __all__ = [
     "Base",
@@ -11,4 +11,5 @@ __all__ = [
     "Document",
     "DocumentChunk",
     "DocumentEmbedding",
+    "EmbeddingCache",
 ]
\ No newline at end of file
@@ -1,7 +1,6 @@
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy import Column, DateTime
+from sqlalchemy import Column, DateTime, func
 from sqlalchemy.ext.asyncio import AsyncAttrs
-from datetime import datetime, timezone
 
 """
 Configures the declarative base for asynchronous SQLAlchemy operations.
@@ -22,29 +21,30 @@ class TimestampMixin:
     """
     A mixin that adds `created_at` and `updated_at` timestamp columns.
 
-    - `created_at`: Automatically set to the current UTC time when a record
-      is first created.
-    - `updated_at`: Automatically set to the current UTC time whenever a
-      record is updated.
+    - `created_at`: Set by PostgreSQL (`now()`) when a record is first created.
+    - `updated_at`: Set by PostgreSQL when a record is created, and to `now()`
+      by every UPDATE issued through SQLAlchemy (ORM flushes and `update()`
+      statements alike).
 
-    **Note on `lambda` usage**:
-    The `default` and `onupdate` parameters are passed a `lambda` function
-    to ensure `datetime.now()` is called at the moment of the database
-    event (insertion or update), not when the application starts.
-
-    Passing the function itself (`lambda: ...`) defers its execution,
-    whereas passing a direct call (`datetime.now()`) would capture
-    the timestamp only once, when the model class is first defined,
-    and reuse that same value for all subsequent records.
+    **Note on server-side timestamps**:
+    The values are computed by the database rather than in Python, so
+    inserts and updates do not send them as bound parameters and bulk
+    inserts (multi-row INSERT, COPY) can leave the columns out entirely.
+    `eager_defaults` makes the ORM read the generated values back through
+    the INSERT/UPDATE's RETURNING clause, so they are available on the
+    object without an extra SELECT (or a lazy load, which would fail under
+    asyncio).
     """
     created_at = Column(
         DateTime(timezone=True), 
-        default=lambda: datetime.now(timezone.utc), 
+        server_default=func.now(), 
         nullable=False
     )
     updated_at = Column(
         DateTime(timezone=True), 
-        default=lambda: datetime.now(timezone.utc), 
-        onupdate=lambda: datetime.now(timezone.utc), 
+        server_default=func.now(), 
+        onupdate=func.now(), 
         nullable=False
-    )
\ No newline at end of file
+    )
+
+    __mapper_args__ = {"eager_defaults": True}
@@ -0,0 +1,79 @@
+"""
+Bulk-ingest helpers built on PostgreSQL's COPY protocol.
+
+Row-by-row (or ORM unit-of-work) inserts cap ingestion throughput at a few
+thousand rows per second, while COPY streams whole batches to the server in
+a single command. These helpers expose asyncpg's `copy_records_to_table`
+through an `AsyncSession`, so they take part in the session's current
+transaction.
+
+Guidelines:
+    - Gains flatten out beyond ~1k rows per batch; aim for 5k-10k records
+      per COPY call and split larger inputs with `batch_size`.
+    - COPY bypasses the ORM: Python-side column defaults (e.g.
+      `default=dict` on the metadata_ columns) are not applied, so every NOT
+      NULL column without a server default must be included in `columns`.
+    - Vector columns (vector/halfvec/bit) need the pgvector codecs, which
+      are registered on the raw connection on demand.
+"""
+
+from typing import Any, Iterable, List, Sequence, Tuple
+import logging
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_COPY_BATCH_SIZE = 5000
+
+
+async def copy_records(
+    db: AsyncSession,
+    table_name: str,
+    columns: Sequence[str],
+    records: Iterable[Tuple[Any, ...]],
+    batch_size: int = DEFAULT_COPY_BATCH_SIZE,
+    register_vector_types: bool = False,
+) -> int:
+    """
+    Insert `records` into `table_name` using COPY, in batches.
+
+    Args:
+        db: Database session; the COPY runs on its current connection/transaction
+        table_name: Target table name
+        columns: Column names, in the same order as the values of each record
+        records: Iterable of tuples to insert
+        batch_size: Number of records sent per COPY command
+        register_vector_types: Register pgvector codecs before copying
+                               (required when a vector column is included)
+
+    Returns:
+        The number of records copied
+    """
+    connection = await db.connection()
+    raw_connection = await connection.get_raw_connection()
+    driver_connection = raw_connection.driver_connection
+
+    if register_vector_types:
+        from pgvector.asyncpg import register_vector
+        await register_vector(driver_connection)
+
+    total = 0
+    batch: List[Tuple[Any, ...]] = []
+    for record in records:
+        batch.append(record)
+        if len(batch) >= batch_size:
+            await driver_connection.copy_records_to_table(
+                table_name, records=batch, columns=list(columns)
+            )
+            total += len(batch)
+            batch = []
+
+    if batch:
+        await driver_connection.copy_records_to_table(
+            table_name, records=batch, columns=list(columns)
+        )
+        total += len(batch)
+
+    logger.debug(f"Copied {total} records into {table_name}")
+    return total
@@ -8,18 +8,37 @@ Attributes:
     engine (sqlalchemy.ext.asyncio.AsyncEngine):
         The main SQLAlchemy engine, configured for asynchronous communication
         with the PostgreSQL database. Key parameters include:
-        - echo=True: Logs all generated SQL statements to the console. Useful for
-          debugging but should be disabled in production.
+        - echo=SQL_ECHO: Logs all generated SQL statements. Off by default, as
+          formatting every statement costs CPU on each query; enable it only
+          for debugging.
+        - hide_parameters=True: Bound values are left out of logged statements
+          and error messages, so embedding vectors (and user data) are never
+          formatted into them.
         - future=True: Enables SQLAlchemy 2.0 style usage, which is now the
           standard API.
-        - pool_pre_ping=True: The connection pool will "ping" the database
-          before handing out a connection, preventing errors from stale or
-          disconnected connections.
-        - pool_size=10: The number of connections to keep open in the pool,
-          ready for use.
-        - max_overflow=20: The number of additional connections that can be
-          temporarily opened beyond `pool_size` to handle peak load. The
-          total simultaneous connections can be up to 30 (10 + 20).
+        - pool_size / max_overflow: DB_POOL_SIZE persistent connections (20
+          by default) plus up to DB_MAX_OVERFLOW (40) temporary ones, so bursts
+          of concurrent requests do not queue on the pool and time out.
+        - pool_recycle=DB_POOL_RECYCLE: Connections older than 30 minutes are
+          replaced, which keeps them from being dropped by the server or a
+          proxy while idle.
+        - pool_timeout=DB_POOL_TIMEOUT: How long a request waits for a
+          connection when the pool and its overflow are exhausted.
+        - pool_pre_ping=DB_POOL_PRE_PING: The pool checks a connection is
+          alive before handing it out, so stale connections are replaced
+          transparently instead of failing a request.
+        - pool_use_lifo=DB_POOL_USE_LIFO: The most recently returned
+          connection is reused first, keeping a small set of connections hot
+          and letting the rest sit idle until they are recycled.
+        - connect_args: Each connection keeps up to
+          DB_PREPARED_STATEMENT_CACHE_SIZE prepared statements, so repeated
+          queries skip parsing and planning on the server. When
+          DB_USE_PGBOUNCER is set, asyncpg's prepared statement caches are
+          disabled, as PgBouncer in transaction mode does not pin a client
+          to one server connection. Otherwise the connections are named
+          in pg_stat_activity, run with JIT compilation off, and enable
+          TCP keepalives (DB_TCP_KEEPALIVES_*) so that connections dropped
+          while idle are detected by the server.
 
     AsyncSessionLocal (sqlalchemy.orm.sessionmaker):
         A factory for creating new `AsyncSession` instances. This ensures all
@@ -40,23 +59,48 @@ Attributes:
 
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from app.core.config import settings
+from app.db.url import to_asyncpg_url
 import logging 
 
 logger = logging.getLogger(__name__)
 
-database_url = settings.DATABASE_URL
-if database_url.startswith("postgresql://"):
-    database_url = database_url.replace("postgresql://", "postgresql+asyncpg://", 1)
+# Identifies the API's connections in pg_stat_activity
+DB_APPLICATION_NAME = "eleva-api"
+
+database_url = to_asyncpg_url(settings.DATABASE_URL)
+if database_url != settings.DATABASE_URL:
     logger.info("Converted DATABASE_URL to use asyncpg driver")
 
+if settings.DB_USE_PGBOUNCER:
+    # PgBouncer rejects unknown startup parameters, so no server_settings
+    connect_args = {"statement_cache_size": 0, "prepared_statement_cache_size": 0}
+else:
+    connect_args = {
+        "prepared_statement_cache_size": settings.DB_PREPARED_STATEMENT_CACHE_SIZE,
+        "server_settings": {
+            "application_name": DB_APPLICATION_NAME,
+            # JIT compilation only pays off for long analytical queries and
+            # adds tens of milliseconds to short ones
+            "jit": "off",
+            "tcp_keepalives_idle": str(settings.DB_TCP_KEEPALIVES_IDLE),
+            "tcp_keepalives_interval": str(settings.DB_TCP_KEEPALIVES_INTERVAL),
+            "tcp_keepalives_count": str(settings.DB_TCP_KEEPALIVES_COUNT),
+        },
+    }
+
 engine = create_async_engine(
     url=database_url,
-    echo=False,
+    echo=settings.SQL_ECHO,
+    hide_parameters=True,
     future=True,
-    pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20
-)    
+    pool_pre_ping=settings.DB_POOL_PRE_PING,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_use_lifo=settings.DB_POOL_USE_LIFO,
+    connect_args=connect_args
+)
 
 AsyncSessionLocal = async_sessionmaker(
     engine,
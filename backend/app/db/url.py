@@ -0,0 +1,29 @@
+"""
+Database URL normalization.
+
+The engines are asynchronous and must use the asyncpg driver. Hosting
+providers commonly hand out `postgres://` or `postgresql://` URLs (or ones
+naming a synchronous driver such as psycopg2), so both the application and
+Alembic rewrite the configured URL before creating their engine.
+"""
+
+from sqlalchemy.engine import make_url
+
+ASYNC_DRIVERNAME = "postgresql+asyncpg"
+
+
+def to_asyncpg_url(database_url: str) -> str:
+    """
+    Return `database_url` with its PostgreSQL driver set to asyncpg.
+
+    Args:
+        database_url (str): A PostgreSQL connection URL, with or without a driver.
+
+    Returns:
+        str: The same URL using the `postgresql+asyncpg` driver. URLs of other
+             databases are returned unchanged.
+    """
+    url = make_url(database_url)
+    if url.get_backend_name() not in ("postgresql", "postgres") or url.drivername == ASYNC_DRIVERNAME:
+        return database_url
+    return url.set(drivername=ASYNC_DRIVERNAME).render_as_string(hide_password=False)
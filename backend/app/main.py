@@ -1,19 +1,54 @@
+import asyncio
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+from sqlalchemy import text
 from app.core.config import settings
+from app.core.security import warm_up as warm_up_security
+from app.core.responses import FastJSONResponse
 from app.api.router import api_router
 from app.db.session import engine
+from app.core.executors import shutdown_cpu_pool
 from app.services.embedding_service import get_embedding_service
+from app.services.quiz_explanation import close_quiz_explanation_service
 from app.services.task_queue.base_task_queue import get_task_queue, cleanup_task_queue
+from app.services.ingest_queue import get_ingest_queue, shutdown_ingest_queue
 
 from app.db import Base
 
 async def init_db():
     """Initialize database tables"""
     async with engine.begin() as conn:
+        # Fail fast at startup if the database is unreachable
+        await conn.execute(text("SELECT 1"))
+        # The embedding columns and their HNSW indexes need pgvector
+        await conn.execute(text("CREATE EXTENSION IF NOT EXISTS vector"))
         # Create all tables
         await conn.run_sync(Base.metadata.create_all)
+        await check_embedding_dimensions(conn)
+
+
+async def check_embedding_dimensions(conn):
+    """
+    Fail fast if the vector columns were created with another dimension.
+    
+    The models size their vectors from EMBEDDING_DIMENSIONS, but the schema
+    comes from the migrations; a mismatch would otherwise only surface as
+    failing inserts once documents are processed.
+    """
+    result = await conn.execute(text(
+        "SELECT attrelid::regclass::text AS table_name, atttypmod AS dimensions "
+        "FROM pg_attribute "
+        "WHERE attrelid IN ('document_embeddings'::regclass, 'embedding_cache'::regclass) "
+        "AND attname = 'embedding_vector'"
+    ))
+    for row in result:
+        if row.dimensions != settings.EMBEDDING_DIMENSIONS:
+            raise RuntimeError(
+                f"{row.table_name}.embedding_vector has {row.dimensions} dimensions, "
+                f"but EMBEDDING_DIMENSIONS is {settings.EMBEDDING_DIMENSIONS}: "
+                "add a migration that resizes the vector columns"
+            )
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -23,17 +58,24 @@ async def lifespan(app: FastAPI):
     # Startup
     await init_db()
     
+    # Load the crypto backends now rather than on the first login
+    await asyncio.to_thread(warm_up_security)
+    
     # Initialize services
     embedding_service = get_embedding_service()
     task_queue = get_task_queue()
+    get_ingest_queue().start()
     
     print(f"{settings.PROJECT_NAME} started successfully")
     
     yield
     
     # Shutdown
+    await shutdown_ingest_queue()
     await embedding_service.close()
+    await close_quiz_explanation_service()
     await cleanup_task_queue()
+    shutdown_cpu_pool()
     await engine.dispose()
     print(f"{settings.PROJECT_NAME} shutting down")
 
@@ -42,6 +84,7 @@ app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.VERSION,
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    default_response_class=FastJSONResponse,
     lifespan=lifespan  
 )
 
@@ -70,4 +113,9 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy"}
\ No newline at end of file
+    return {"status": "healthy"}
+
+
+@app.get("/health/ingest")
+async def ingest_health_check():
+    return {"status": "healthy", **get_ingest_queue().stats()}
\ No newline at end of file
@@ -6,15 +6,19 @@ and associated vector embeddings. It's designed to work with pgvector for
 efficient similarity search operations.
 """
 
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, JSON, Enum as SQLEnum
-from sqlalchemy.orm import relationship
-from sqlalchemy.dialects.postgresql import UUID
-from pgvector.sqlalchemy import Vector
+from sqlalchemy import BigInteger, Column, Computed, DDL, Index, Integer, String, Text, ForeignKey, DateTime, UniqueConstraint, Enum as SQLEnum, event, func, text
+from sqlalchemy.orm import deferred, query_expression, relationship
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR, UUID
+from pgvector.sqlalchemy import BIT, HALFVEC
 import enum
 import uuid
-from datetime import datetime, timezone
+from app.core.config import settings
 from app.db.base import Base, TimestampMixin
 
+# Vector columns are sized for the configured embedding model. Changing it
+# on an existing database needs a migration that alters the columns.
+EMBEDDING_DIMENSIONS = settings.EMBEDDING_DIMENSIONS
+
 
 class ProcessingStatus(str, enum.Enum):
     """
@@ -48,6 +52,8 @@ class Document(Base, TimestampMixin):
         file_type (str): MIME type or extension of the file
         file_size (int): Size of the original file in bytes
         file_url (str): S3 or storage URL for the original file
+        file_hash (str): SHA-256 hex digest of the file content, used for
+                         duplicate detection
         
         total_chunks (int): Number of chunks created from this document
         processing_status (ProcessingStatus): Current processing state
@@ -55,7 +61,7 @@ class Document(Base, TimestampMixin):
         processing_started_at (DateTime): When processing began
         processing_completed_at (DateTime): When processing finished
         
-        metadata (JSON): Additional metadata (page count, author, etc.)
+        metadata (JSONB): Additional metadata (page count, author, etc.)
         
     Relationships:
         subject: Many-to-one relationship with Subject
@@ -63,9 +69,33 @@ class Document(Base, TimestampMixin):
         chunks: One-to-many relationship with DocumentChunk
     """
     __tablename__ = "documents"
+    __table_args__ = (
+        # Keyset pagination of a subject's / user's documents, newest first
+        Index("ix_documents_subject_created_id", "subject_id", text("created_at DESC"), text("id DESC")),
+        # Default subject listing, which hides failed documents
+        Index(
+            "ix_documents_subject_active_created_id",
+            "subject_id", text("created_at DESC"), text("id DESC"),
+            postgresql_where=text("processing_status <> 'failed'")
+        ),
+        Index("ix_documents_owner_created_id", "owner_id", text("created_at DESC"), text("id DESC")),
+        # Per-status statistics of a subject / user as index-only scans
+        Index(
+            "ix_documents_subject_status",
+            "subject_id", "processing_status",
+            postgresql_include=["file_size", "total_chunks"]
+        ),
+        Index(
+            "ix_documents_owner_status",
+            "owner_id", "processing_status",
+            postgresql_include=["file_size", "total_chunks"]
+        ),
+        # Duplicate upload check; also stops concurrent uploads of the same file
+        Index("ix_documents_subject_file_hash", "subject_id", "file_hash", unique=True),
+    )
     
     # Use UUID for documents to avoid enumeration attacks
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     
     # Foreign Keys
     subject_id = Column(Integer, ForeignKey("subjects.id", ondelete="CASCADE"), nullable=False)
@@ -76,6 +106,7 @@ class Document(Base, TimestampMixin):
     file_type = Column(String(50), nullable=False)  # e.g., "application/pdf", "text/plain"
     file_size = Column(Integer, nullable=False)  # Size in bytes
     file_url = Column(String(500))  # S3 URL or local path
+    file_hash = Column(String(64))  # SHA-256 of the content
     
     # Processing Information
     total_chunks = Column(Integer, default=0)
@@ -91,7 +122,7 @@ class Document(Base, TimestampMixin):
     
     # Flexible metadata storage for document-specific information
     # Can store: {"pages": 10, "author": "John Doe", "language": "en", etc.}
-    metadata_ = Column(JSON, default={})
+    metadata_ = Column(JSONB, default=dict)
     
     # Relationships
     subject = relationship("Subject", back_populates="documents")
@@ -100,16 +131,23 @@ class Document(Base, TimestampMixin):
         "DocumentChunk",
         back_populates="document",
         cascade="all, delete-orphan",
-        order_by="DocumentChunk.chunk_index"
+        order_by="DocumentChunk.chunk_index",
+        # Deleting a document leaves its chunks to ON DELETE CASCADE instead
+        # of loading them first just to delete them one by one
+        passive_deletes=True
     )
     
     def __repr__(self):
-        return f"<Document(filename='{self.filename}', status={self.processing_status.value if self.processing_status else 'None'})>"
+        # Read loaded values only: touching an expired attribute would emit
+        # a query (and fail outside the async greenlet) just to log the row
+        filename = self.__dict__.get('filename')
+        status = self.__dict__.get('processing_status')
+        return f"<Document(filename='{filename}', status={status.value if status else 'None'})>"
     
     @property
     def is_ready(self) -> bool:
         """Check if the document is ready for vector search."""
-        return self.processing_status == ProcessingStatus.COMPLETED
+        return self.processing_status is ProcessingStatus.COMPLETED
     
     @property
     def processing_duration(self) -> float | None:
@@ -137,15 +175,22 @@ class DocumentChunk(Base, TimestampMixin):
         start_char (int): Starting character position in original document
         end_char (int): Ending character position in original document
         
-        metadata (JSON): Chunk-specific metadata (page number, section, etc.)
+        metadata (JSONB): Chunk-specific metadata (page number, section, etc.)
+        chunk_tsv (TSVECTOR): Full-text search vector generated from chunk_text
         
     Relationships:
         document: Many-to-one relationship with Document
         embedding: One-to-one relationship with DocumentEmbedding
     """
     __tablename__ = "document_chunks"
+    __table_args__ = (
+        # One row per position: makes re-inserting a document's chunks idempotent
+        UniqueConstraint("document_id", "chunk_index", name="uq_document_chunks_document_chunk_index"),
+        Index("ix_document_chunks_tsv", "chunk_tsv", postgresql_using="gin"),
+    )
     
-    id = Column(Integer, primary_key=True, index=True)
+    # BigInteger: chunks are created in bulk and can outgrow 32-bit ids
+    id = Column(BigInteger, primary_key=True)
     document_id = Column(UUID(as_uuid=True), ForeignKey("documents.id", ondelete="CASCADE"), nullable=False)
     
     # Chunk positioning and content
@@ -158,7 +203,19 @@ class DocumentChunk(Base, TimestampMixin):
     
     # Flexible metadata for chunk-specific information
     # Can store: {"page": 3, "section": "Introduction", "paragraph": 2, etc.}
-    metadata_ = Column(JSON, default={})
+    metadata_ = Column(JSONB, default=dict)
+    
+    # Full-text search vector, generated by Postgres and indexed with GIN.
+    # Deferred so regular chunk loads don't fetch it.
+    chunk_tsv = deferred(Column(
+        TSVECTOR,
+        Computed("to_tsvector('english', chunk_text)", persisted=True)
+    ))
+    
+    # Whether the chunk has an embedding, computed in SQL on demand
+    # (see CRUDDocumentChunk.get_by_document) so listing chunks doesn't
+    # require loading their vectors
+    has_embedding = query_expression()
     
     # Relationships
     document = relationship("Document", back_populates="chunks")
@@ -174,6 +231,10 @@ class DocumentChunk(Base, TimestampMixin):
         return f"<DocumentChunk(index={self.chunk_index}, text='{preview}')>"
 
 
+# document_embeddings is hash-partitioned on chunk_id (see migration 001)
+DOCUMENT_EMBEDDING_PARTITIONS = 8
+
+
 class DocumentEmbedding(Base):
     """
     Stores vector embeddings for document chunks.
@@ -185,7 +246,8 @@ class DocumentEmbedding(Base):
     Attributes:
         id (int): Unique identifier for the embedding
         chunk_id (int): Foreign key to the associated chunk
-        embedding_vector (Vector): The actual embedding vector (dimension set by model)
+        embedding_vector (HALFVEC): The embedding vector, stored as FP16 (dimension set by model)
+        embedding_bits (BIT): Binary-quantized copy of the vector, generated by Postgres
         
         model_name (str): Name of the model used to generate embedding
         model_version (str): Version of the embedding model
@@ -199,25 +261,60 @@ class DocumentEmbedding(Base):
         - OpenAI ada-002: 1536
         - sentence-transformers/all-MiniLM-L6-v2: 384
         - sentence-transformers/all-mpnet-base-v2: 768
+        
+        The table is hash-partitioned on chunk_id so that each partition keeps
+        its own, smaller HNSW graph. Postgres requires the partition key to be
+        part of the primary key, hence the composite (id, chunk_id) key.
     """
     __tablename__ = "document_embeddings"
+    __table_args__ = (
+        # ANN indexes, matching migration 001 so that schemas built with
+        # metadata.create_all search with HNSW too (partitions inherit them)
+        Index(
+            "ix_document_embeddings_vector",
+            "embedding_vector",
+            postgresql_using="hnsw",
+            postgresql_with={"m": 24, "ef_construction": 128},
+            postgresql_ops={"embedding_vector": "halfvec_cosine_ops"},
+        ),
+        Index(
+            "ix_document_embeddings_bits",
+            "embedding_bits",
+            postgresql_using="hnsw",
+            postgresql_ops={"embedding_bits": "bit_hamming_ops"},
+        ),
+        {"postgresql_partition_by": "HASH (chunk_id)"},
+    )
+    # Read created_at back with RETURNING, as in TimestampMixin
+    __mapper_args__ = {"eager_defaults": True}
+    
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    chunk_id = Column(BigInteger, ForeignKey("document_chunks.id", ondelete="CASCADE"), primary_key=True, unique=True)
     
-    id = Column(Integer, primary_key=True, index=True)
-    chunk_id = Column(Integer, ForeignKey("document_chunks.id", ondelete="CASCADE"), nullable=False, unique=True)
+    # Vector embedding using pgvector, stored in half precision (halfvec)
+    # to halve memory and index size with negligible recall loss.
+    # The dimension comes from the EMBEDDING_DIMENSIONS setting
+    embedding_vector = Column(HALFVEC(EMBEDDING_DIMENSIONS), nullable=False)
     
-    # Vector embedding using pgvector
-    # Dimension will be set based on the embedding model used
-    embedding_vector = Column(Vector(1536), nullable=False)  # TODO vector dim should be passed from config
+    # Binary-quantized shadow of embedding_vector used to prefilter candidates
+    # by Hamming distance before rescoring with the full-precision column
+    embedding_bits = Column(
+        BIT(EMBEDDING_DIMENSIONS),
+        Computed(
+            f"binary_quantize(embedding_vector)::bit({EMBEDDING_DIMENSIONS})",
+            persisted=True
+        )
+    )
     
     # Model information for reproducibility and versioning
     model_name = Column(String(100), nullable=False, default="text-embedding-ada-002")
     model_version = Column(String(50))
-    embedding_dimension = Column(Integer, nullable=False, default=1536)
+    embedding_dimension = Column(Integer, nullable=False, default=EMBEDDING_DIMENSIONS)
     
     # Timestamp for embedding generation
     created_at = Column(
         DateTime(timezone=True),
-        default=lambda: datetime.now(timezone.utc),
+        server_default=func.now(),
         nullable=False
     )
     
@@ -225,4 +322,50 @@ class DocumentEmbedding(Base):
     chunk = relationship("DocumentChunk", back_populates="embedding")
     
     def __repr__(self):
-        return f"<DocumentEmbedding(chunk_id={self.chunk_id}, model={self.model_name})>"
\ No newline at end of file
+        return f"<DocumentEmbedding(chunk_id={self.chunk_id}, model={self.model_name})>"
+
+
+class EmbeddingCache(Base):
+    """
+    Cache of embeddings keyed by chunk content.
+    
+    Chunks with the same text always get the same embedding from a given
+    model, so re-uploads and documents sharing content reuse cached vectors
+    instead of calling the embedding provider again.
+    
+    Attributes:
+        content_hash (str): SHA-256 hex digest of the chunk text
+        model_name (str): Name of the model that generated the embedding
+        embedding_dimension (int): Dimension of the vector
+        embedding_vector (HALFVEC): The cached embedding
+        created_at (DateTime): When the entry was cached
+    """
+    __tablename__ = "embedding_cache"
+    
+    content_hash = Column(String(64), primary_key=True)
+    model_name = Column(String(100), primary_key=True)
+    embedding_dimension = Column(Integer, primary_key=True)
+    embedding_vector = Column(HALFVEC(EMBEDDING_DIMENSIONS), nullable=False)
+    
+    created_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False
+    )
+    
+    def __repr__(self):
+        return f"<EmbeddingCache(content_hash={self.content_hash[:12]}, model={self.model_name})>"
+
+
+# Partitions are created right after the parent table when the schema is built
+# with metadata.create_all (migrations create them explicitly)
+for _partition in range(DOCUMENT_EMBEDDING_PARTITIONS):
+    event.listen(
+        DocumentEmbedding.__table__,
+        "after_create",
+        DDL(
+            f"CREATE TABLE IF NOT EXISTS document_embeddings_p{_partition} "
+            f"PARTITION OF document_embeddings "
+            f"FOR VALUES WITH (modulus {DOCUMENT_EMBEDDING_PARTITIONS}, remainder {_partition})"
+        ).execute_if(dialect="postgresql"),
+    )
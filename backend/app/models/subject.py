@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, Boolean, Index, text
 from sqlalchemy.orm import relationship
 from app.db.base import Base, TimestampMixin
 
@@ -37,6 +37,12 @@ class Subject(Base, TimestampMixin):
                             owns this subject.
     """
     __tablename__ = "subjects"
+    __table_args__ = (
+        # Serves "subjects of an owner, newest first" without a sort step
+        Index("ix_subjects_owner_created", "owner_id", text("created_at DESC")),
+        # Keyset pages of an owner's subjects (ordered by id, newest first)
+        Index("ix_subjects_owner_id_desc", "owner_id", text("id DESC")),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(200), nullable=False)
@@ -1,7 +1,8 @@
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field, computed_field
 from typing import List, Optional, Dict
 from datetime import datetime, date
 from app.models.user import UserRole
+from app.services.storage import presigned_get_url
 
 
 class DailyRegistration(BaseModel):
@@ -31,7 +32,8 @@ class UserAdmin(BaseModel):
     is_active: bool
     is_verified: bool
     academic_level: Optional[str]
-    profile_picture_url: Optional[str]
+    # Only the S3 key is stored: the URL is derived from it when serializing
+    profile_picture_key: Optional[str] = Field(default=None, exclude=True)
     show_profile_publicly: bool
     allow_ai_training: bool
     created_at: datetime
@@ -40,13 +42,23 @@ class UserAdmin(BaseModel):
     
     model_config = ConfigDict(from_attributes=True)
 
+    @computed_field
+    @property
+    def profile_picture_url(self) -> Optional[str]:
+        """Short-lived presigned URL of the profile picture, if any."""
+        return presigned_get_url(self.profile_picture_key) if self.profile_picture_key else None
+
 
 class UserList(BaseModel):
     """Paginated list of users"""
     users: List[UserAdmin]
     total: int
-    page: int
+    # None when the page was fetched with a keyset cursor
+    page: Optional[int] = None
     size: int
+    # Keyset cursor for the next page (None when there are no more pages)
+    next_cursor_created_at: Optional[datetime] = None
+    next_cursor_id: Optional[int] = None
 
 
 class UserStatusUpdate(BaseModel):
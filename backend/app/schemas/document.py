@@ -5,7 +5,7 @@ This module defines the request/response models for the document API endpoints,
 ensuring data consistency and providing automatic validation.
 """
 
-from pydantic import BaseModel, Field, ConfigDict, field_validator
+from pydantic import AliasChoices, BaseModel, Field, ConfigDict, field_validator
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 from uuid import UUID
@@ -101,12 +101,37 @@ class DocumentChunkResponse(BaseModel):
     chunk_text: str = Field(..., description="The actual text content of the chunk")
     start_char: Optional[int] = Field(None, description="Starting character position in original")
     end_char: Optional[int] = Field(None, description="Ending character position in original")
-    metadata: Dict[str, Any] = Field(default_factory=dict, description="Chunk-specific metadata")
-    has_embedding: bool = Field(..., description="Whether this chunk has been embedded")
+    # ORM objects expose these as `metadata_` and the `embedding` relationship
+    metadata: Dict[str, Any] = Field(
+        default_factory=dict,
+        validation_alias=AliasChoices("metadata_", "metadata"),
+        description="Chunk-specific metadata"
+    )
+    has_embedding: bool = Field(
+        ...,
+        validation_alias=AliasChoices("has_embedding", "embedding"),
+        description="Whether this chunk has been embedded"
+    )
+    embedding_vector: Optional[List[float]] = Field(
+        None,
+        description="The embedding vector, only included when requested"
+    )
     created_at: datetime
     
     model_config = ConfigDict(from_attributes=True)
     
+    @field_validator('metadata', mode='before')
+    @classmethod
+    def default_metadata(cls, v):
+        """Treat missing (NULL) metadata as an empty dictionary."""
+        return v if v is not None else {}
+    
+    @field_validator('has_embedding', mode='before')
+    @classmethod
+    def embedding_exists(cls, v):
+        """Accept either the flag itself or the (possibly None) embedding."""
+        return v if isinstance(v, bool) else v is not None
+    
     @classmethod
     def from_orm_with_embedding(cls, chunk_obj):
         """
@@ -115,17 +140,7 @@ class DocumentChunkResponse(BaseModel):
         This helper method properly handles the relationship check
         to determine if an embedding exists for this chunk.
         """
-        data = {
-            "id": chunk_obj.id,
-            "chunk_index": chunk_obj.chunk_index,
-            "chunk_text": chunk_obj.chunk_text,
-            "start_char": chunk_obj.start_char,
-            "end_char": chunk_obj.end_char,
-            "metadata": chunk_obj.metadata_ or {},
-            "has_embedding": chunk_obj.embedding is not None,
-            "created_at": chunk_obj.created_at
-        }
-        return cls(**data)
+        return cls.model_validate(chunk_obj)
 
 
 class DocumentProcessingStatus(BaseModel):
@@ -181,8 +196,11 @@ class DocumentResponse(BaseModel):
     processing_completed_at: Optional[datetime] = None
     processing_duration: Optional[float] = Field(None, description="Processing time in seconds")
     
-    # Metadata and timestamps
-    metadata: Dict[str, Any] = Field(default_factory=dict)
+    # Metadata and timestamps (the ORM attribute is `metadata_`)
+    metadata: Dict[str, Any] = Field(
+        default_factory=dict,
+        validation_alias=AliasChoices("metadata_", "metadata")
+    )
     created_at: datetime
     updated_at: datetime
     
@@ -191,33 +209,23 @@ class DocumentResponse(BaseModel):
     
     model_config = ConfigDict(from_attributes=True)
     
+    @field_validator('metadata', 'total_chunks', mode='before')
+    @classmethod
+    def default_when_null(cls, v, info):
+        """Replace NULL metadata / chunk counts with their defaults."""
+        if v is None:
+            return {} if info.field_name == 'metadata' else 0
+        return v
+    
     @classmethod
     def from_orm(cls, obj):
         """
         Create response from ORM object with computed fields.
         
         This method handles the conversion from SQLAlchemy model to
-        Pydantic schema, including computed properties.
+        Pydantic schema, including computed properties (read as attributes).
         """
-        return cls(
-            id=obj.id,
-            subject_id=obj.subject_id,
-            owner_id=obj.owner_id,
-            filename=obj.filename,
-            file_type=obj.file_type,
-            file_size=obj.file_size,
-            file_url=obj.file_url,
-            processing_status=obj.processing_status,
-            total_chunks=obj.total_chunks or 0,
-            processing_error=obj.processing_error,
-            processing_started_at=obj.processing_started_at,
-            processing_completed_at=obj.processing_completed_at,
-            processing_duration=obj.processing_duration,
-            metadata=obj.metadata_ or {},
-            created_at=obj.created_at,
-            updated_at=obj.updated_at,
-            is_ready=obj.is_ready
-        )
+        return cls.model_validate(obj)
 
 
 class DocumentListResponse(BaseModel):
@@ -230,6 +238,9 @@ class DocumentListResponse(BaseModel):
     total: int = Field(..., description="Total number of documents")
     page: int = Field(..., ge=1, description="Current page number")
     size: int = Field(..., ge=1, le=100, description="Items per page")
+    next_cursor: Optional[str] = Field(
+        None, description="Cursor for the next page (None when there are no more pages)"
+    )
     
     @property
     def pages(self) -> int:
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field, ConfigDict
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
 
@@ -43,3 +43,10 @@ class SubjectInDB(SubjectBase):
 class Subject(SubjectInDB):
     pass
 
+
+
+class SubjectList(BaseModel):
+    """A page of subjects, newest first"""
+    items: List[Subject]
+    # Keyset cursor for the next page (None when there are no more pages)
+    next_cursor_id: Optional[int] = None
@@ -1,7 +1,8 @@
-from pydantic import BaseModel, EmailStr, Field, ConfigDict
-from typing import Optional
+from pydantic import BaseModel, EmailStr, Field, ConfigDict, computed_field
+from typing import Dict, Optional
 from datetime import datetime
 from app.models.user import UserRole
+from app.services.storage import presigned_get_url
 
 
 class UserBase(BaseModel):
@@ -31,12 +32,32 @@ class UserInDB(UserBase):
     role: UserRole
     is_active: bool
     is_verified: bool
-    profile_picture_url: Optional[str]
+    # Only the S3 key is stored: the URL is derived from it when serializing
+    profile_picture_key: Optional[str] = Field(default=None, exclude=True)
     created_at: datetime
     updated_at: datetime
     
     model_config = ConfigDict(from_attributes=True)
 
+    @computed_field
+    @property
+    def profile_picture_url(self) -> Optional[str]:
+        """Short-lived presigned URL of the profile picture, if any."""
+        return presigned_get_url(self.profile_picture_key) if self.profile_picture_key else None
+
 
 class User(UserInDB):
-    pass
\ No newline at end of file
+    pass
+
+
+class ProfilePictureUploadTarget(BaseModel):
+    """Presigned S3 POST form the client uploads a profile picture with."""
+    url: str
+    fields: Dict[str, str]
+    key: str
+    expires_in: int
+
+
+class ProfilePictureConfirm(BaseModel):
+    """Key of a profile picture uploaded through a presigned form."""
+    key: str = Field(..., max_length=512)
@@ -7,8 +7,10 @@ and metadata where possible.
 """
 
 import io
+import mmap
+import asyncio
 import logging
-from typing import Dict, Any, Optional, Tuple
+from typing import Dict, Any, Optional, Tuple, Union
 from pathlib import Path
 import hashlib
 import mimetypes
@@ -21,6 +23,14 @@ import chardet
 
 logger = logging.getLogger(__name__)
 
+# Parsers accept raw bytes or a zero-copy view (e.g. over an mmap'ed upload)
+FileContent = Union[bytes, memoryview]
+
+
+def _as_bytes(file_content: FileContent) -> bytes:
+    """Return `file_content` as bytes, copying only when it is a view."""
+    return file_content if isinstance(file_content, bytes) else bytes(file_content)
+
 
 class DocumentParsingError(Exception):
     """
@@ -83,9 +93,10 @@ class DocumentParser:
     
     async def parse_document(
         self,
-        file_content: bytes,
+        file_content: FileContent,
         filename: str,
-        mime_type: Optional[str] = None
+        mime_type: Optional[str] = None,
+        file_hash: Optional[str] = None
     ) -> Tuple[str, Dict[str, Any]]:
         """
         Parse a document and extract its text content and metadata.
@@ -94,9 +105,11 @@ class DocumentParser:
         detects the file type and routes to the appropriate parser.
         
         Args:
-            file_content: The raw bytes of the document
+            file_content: The raw bytes of the document (or a memoryview over them)
             filename: Original filename (used for type detection)
             mime_type: Optional MIME type override
+            file_hash: Optional precomputed SHA-256 hex digest of the content,
+                       e.g. computed while streaming the upload to disk
             
         Returns:
             A tuple of (extracted_text, metadata_dict)
@@ -119,8 +132,9 @@ class DocumentParser:
                 f"Supported types: PDF, DOCX, TXT, MD"
             )
         
-        # Calculate file hash for deduplication
-        file_hash = hashlib.sha256(file_content).hexdigest()
+        # Calculate file hash for deduplication (unless already known)
+        if file_hash is None:
+            file_hash = hashlib.sha256(file_content).hexdigest()
         
         # Parse the document
         try:
@@ -161,7 +175,7 @@ class DocumentParser:
         self,
         filename: str,
         mime_type: Optional[str],
-        file_content: bytes
+        file_content: FileContent
     ):
         """
         Detect the appropriate parser method for a file.
@@ -188,14 +202,14 @@ class DocumentParser:
         
         # Special case: check if it's plain text by trying to decode
         try:
-            file_content.decode('utf-8')
+            _as_bytes(file_content).decode('utf-8')
             return self.parse_text
         except UnicodeDecodeError:
             pass
         
         return None
     
-    async def parse_pdf(self, file_content: bytes, filename: str) -> Tuple[str, Dict[str, Any]]:
+    async def parse_pdf(self, file_content: FileContent, filename: str) -> Tuple[str, Dict[str, Any]]:
         """
         Extract text and metadata from PDF files.
         
@@ -261,7 +275,7 @@ class DocumentParser:
         except Exception as e:
             raise DocumentParsingError(f"Failed to parse PDF: {str(e)}")
     
-    async def parse_docx(self, file_content: bytes, filename: str) -> Tuple[str, Dict[str, Any]]:
+    async def parse_docx(self, file_content: FileContent, filename: str) -> Tuple[str, Dict[str, Any]]:
         """
         Extract text and metadata from Microsoft Word (.docx) files.
         
@@ -327,7 +341,7 @@ class DocumentParser:
         except Exception as e:
             raise DocumentParsingError(f"Failed to parse DOCX: {str(e)}")
     
-    async def parse_text(self, file_content: bytes, filename: str) -> Tuple[str, Dict[str, Any]]:
+    async def parse_text(self, file_content: FileContent, filename: str) -> Tuple[str, Dict[str, Any]]:
         """
         Extract text from plain text files with encoding detection.
         
@@ -347,6 +361,8 @@ class DocumentParser:
         }
         
         try:
+            file_content = _as_bytes(file_content)
+            
             # Detect encoding
             detection = chardet.detect(file_content)
             encoding = detection.get('encoding', 'utf-8')
@@ -376,7 +392,7 @@ class DocumentParser:
         except Exception as e:
             raise DocumentParsingError(f"Failed to parse text file: {str(e)}")
     
-    async def parse_markdown(self, file_content: bytes, filename: str) -> Tuple[str, Dict[str, Any]]:
+    async def parse_markdown(self, file_content: FileContent, filename: str) -> Tuple[str, Dict[str, Any]]:
         """
         Extract text from Markdown files, converting to plain text.
         
@@ -398,7 +414,7 @@ class DocumentParser:
         
         try:
             # Decode markdown content
-            md_text = file_content.decode('utf-8')
+            md_text = _as_bytes(file_content).decode('utf-8')
             
             # Extract some metadata before conversion
             lines = md_text.splitlines()
@@ -437,4 +453,46 @@ class DocumentParser:
 
 
 # Create a global parser instance
-document_parser = DocumentParser()
\ No newline at end of file
+document_parser = DocumentParser()
+
+
+def parse_document_file(
+    file_path: str,
+    filename: str,
+    mime_type: Optional[str] = None,
+    file_hash: Optional[str] = None
+) -> Tuple[str, Dict[str, Any]]:
+    """
+    Parse a document stored on disk, synchronously.
+    
+    This is the entry point used to run parsing in a worker process: it only
+    takes picklable arguments and reads the file itself (memory-mapped), so
+    the file content is never copied between processes. Parsing statistics
+    are tracked by the worker's own parser instance.
+    
+    Args:
+        file_path: Path of the file to parse
+        filename: Original filename (used for type detection)
+        mime_type: Optional MIME type override
+        file_hash: Optional precomputed SHA-256 hex digest of the content
+        
+    Returns:
+        A tuple of (extracted_text, metadata_dict)
+        
+    Raises:
+        DocumentParsingError: If parsing fails or file type is unsupported
+    """
+    with open(file_path, "rb") as f, \
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        # Parsers mostly read front to back: ask the kernel for aggressive
+        # readahead instead of paying one page fault per page (Linux/BSD)
+        if hasattr(mmap, "MADV_SEQUENTIAL"):
+            mapped.madvise(mmap.MADV_SEQUENTIAL)
+        with memoryview(mapped) as file_view:
+            # The parsers never await anything, so a private loop is enough
+            return asyncio.run(document_parser.parse_document(
+                file_content=file_view,
+                filename=filename,
+                mime_type=mime_type,
+                file_hash=file_hash
+            ))
\ No newline at end of file
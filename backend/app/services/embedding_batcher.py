@@ -0,0 +1,84 @@
+"""
+Token-aware batching of texts for embedding requests.
+
+Sending many chunks per embeddings request is what keeps document ingestion
+fast (the pipeline is dominated by network round-trips), but a request must
+stay within the provider's token budget. This module groups texts greedily
+so that each batch carries as many inputs as possible without exceeding a
+token budget (minus a safety reserve) or a maximum number of inputs.
+"""
+
+import logging
+from typing import List, Sequence
+
+logger = logging.getLogger(__name__)
+
+try:  # tiktoken gives exact counts; fall back to a character heuristic without it
+    import tiktoken
+    _ENCODING = tiktoken.get_encoding("cl100k_base")
+except Exception:  # pragma: no cover - optional dependency
+    _ENCODING = None
+
+# Rough average for English text with OpenAI tokenizers
+CHARS_PER_TOKEN = 4
+
+
+def count_tokens(texts: Sequence[str]) -> List[int]:
+    """
+    Estimate the number of tokens of each text.
+
+    Uses tiktoken's cl100k_base encoding when available (the encoding of the
+    OpenAI embedding models), otherwise ~4 characters per token.
+
+    Args:
+        texts: The texts to measure
+
+    Returns:
+        The token count of each text, in input order
+    """
+    if _ENCODING is not None:
+        return [len(tokens) for tokens in _ENCODING.encode_ordinary_batch(list(texts))]
+    return [len(text) // CHARS_PER_TOKEN + 1 for text in texts]
+
+
+def batch_by_tokens(
+    texts: Sequence[str],
+    max_tokens: int,
+    max_items: int,
+    reserve: float = 0.1
+) -> List[List[int]]:
+    """
+    Group texts into batches that fit a per-request token budget.
+
+    Texts are accumulated in order until adding the next one would exceed
+    `max_tokens * (1 - reserve)` tokens or `max_items` inputs. A single text
+    larger than the budget still gets a batch of its own.
+
+    Args:
+        texts: The texts to embed
+        max_tokens: Token budget of a single embeddings request
+        max_items: Maximum number of inputs per request
+        reserve: Fraction of the budget kept free to absorb estimation errors
+
+    Returns:
+        Batches as lists of indices into `texts`, preserving the original order
+    """
+    budget = max(1, int(max_tokens * (1 - reserve)))
+    max_items = max(1, max_items)
+
+    batches: List[List[int]] = []
+    current: List[int] = []
+    current_tokens = 0
+
+    for index, tokens in enumerate(count_tokens(texts)):
+        if current and (current_tokens + tokens > budget or len(current) >= max_items):
+            batches.append(current)
+            current, current_tokens = [], 0
+        current.append(index)
+        current_tokens += tokens
+
+    if current:
+        batches.append(current)
+
+    logger.debug(f"Grouped {len(texts)} texts into {len(batches)} embedding batches")
+    return batches
@@ -6,13 +6,23 @@ for document chunks and manages the storage of these embeddings in
 the database using pgvector.
 """
 
+import hashlib
 import logging
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterable, Optional, Tuple
 from datetime import datetime, timezone
 import asyncio
 
+from openai import APIConnectionError, APIStatusError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update
+from sqlalchemy import BigInteger, String, any_, bindparam, select, update
+from sqlalchemy.dialects.postgresql import ARRAY, insert as pg_insert
+from sqlalchemy.exc import InterfaceError, OperationalError
+from tenacity import (
+    AsyncRetrying,
+    retry_if_exception,
+    stop_after_attempt,
+    wait_exponential_jitter,
+)
 
 from app.services.api_providers.openai_client import OpenAIClient, OpenAIEmbeddingModel
 from app.services.api_providers.exceptions import APIError, RateLimitError
@@ -22,9 +32,11 @@ from app.models.document import (
     Document,
     DocumentChunk,
     DocumentEmbedding,
+    EmbeddingCache,
     ProcessingStatus
 )
 from app.services.text_chunker import TextChunk
+from app.services.embedding_batcher import batch_by_tokens
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
@@ -35,6 +47,28 @@ class EmbeddingServiceError(Exception):
     pass
 
 
+# Database and connection errors that may not happen again: they are raised
+# unwrapped so that callers can retry the whole pipeline
+TRANSIENT_DB_ERRORS = (OperationalError, InterfaceError, ConnectionError, TimeoutError)
+
+
+def _is_transient_api_error(exc: BaseException) -> bool:
+    """
+    Tell whether a failed embeddings request is worth retrying.
+
+    Rate limits, 5xx responses, timeouts and connection errors are transient;
+    other API errors (e.g. invalid input) are not.
+    """
+    if isinstance(exc, RateLimitError):
+        return True
+    if isinstance(exc, APIError):
+        cause = exc.__cause__
+        if isinstance(cause, APIConnectionError):
+            return True
+        return isinstance(cause, APIStatusError) and cause.status_code >= 500
+    return isinstance(exc, TimeoutError)
+
+
 class EmbeddingService:
     """
     Service for generating and managing document embeddings.
@@ -44,13 +78,25 @@ class EmbeddingService:
     It includes batch processing capabilities, progress tracking, and error handling.
     """
     
-    # Default model configuration
-    DEFAULT_MODEL = OpenAIEmbeddingModel.TEXT_EMBEDDING_3_SMALL.value
-    DEFAULT_DIMENSIONS = 1536  # Default for text-embedding-3-small
+    # Default model configuration; the dimension must match the vector
+    # columns, which are sized from the same setting
+    DEFAULT_MODEL = settings.EMBEDDING_MODEL
+    DEFAULT_DIMENSIONS = settings.EMBEDDING_DIMENSIONS
     
     # Batch processing configuration
-    DEFAULT_BATCH_SIZE = 100  # Process 100 chunks at a time
-    MAX_RETRIES = 3
+    # Chunks are embedded many-per-request; the size comes from EMBEDDING_BATCH_SIZE
+    DEFAULT_BATCH_SIZE = settings.EMBEDDING_BATCH_SIZE
+    # Token budget of a single request and number of requests in flight
+    MAX_BATCH_TOKENS = settings.EMBEDDING_BATCH_MAX_TOKENS
+    MAX_PARALLEL_BATCHES = settings.EMBEDDING_BATCH_CONCURRENCY
+    # Content hashes looked up per embedding cache query
+    CACHE_LOOKUP_BATCH_SIZE = 1000
+    # Chunk IDs looked up per existing-embeddings query
+    EXISTING_LOOKUP_BATCH_SIZE = 1000
+    # New embeddings written per multi-row INSERT
+    INSERT_BATCH_SIZE = 1000
+    # Attempts per batch on transient API errors, with jittered exponential backoff
+    MAX_RETRIES = settings.EMBEDDING_BATCH_MAX_ATTEMPTS
     
     def __init__(
         self,
@@ -129,13 +175,16 @@ class EmbeddingService:
         Generate embeddings for all chunks of a document.
         
         This method processes chunks in batches to optimize API usage and
-        provides progress updates through an optional callback.
+        provides progress updates through an optional callback. Chunks whose
+        text is already in the embedding cache are not sent to the API.
         
         Args:
             db: Database session for storing embeddings
             document: The document being processed
             chunks: List of DocumentChunk objects to embed
-            batch_size: Number of chunks to process in each batch
+            batch_size: Maximum number of chunks in each batch
+                       (defaults to the EMBEDDING_BATCH_SIZE setting); batches
+                       are also capped at EMBEDDING_BATCH_MAX_TOKENS tokens
             progress_callback: Optional async function to call with progress updates
                              Should accept (processed, total, status_message)
         
@@ -144,7 +193,11 @@ class EmbeddingService:
             
         Raises:
             EmbeddingServiceError: If embedding generation fails
+            OperationalError, InterfaceError, ConnectionError, TimeoutError:
+                On transient database or connection failures (see
+                `TRANSIENT_DB_ERRORS`); the document status is left to the caller
         """
+        document_id = document.id
         batch_size = batch_size or self.DEFAULT_BATCH_SIZE
         total_chunks = len(chunks)
         processed_chunks = 0
@@ -153,45 +206,134 @@ class EmbeddingService:
         
         logger.info(f"Starting embedding generation for {total_chunks} chunks of document {document.id}")
         
-        # Update document status to embedding
-        await self._update_document_status(db, document, ProcessingStatus.EMBEDDING)
+        # Update document status to embedding; persisted with the first batch
+        await self._update_document_status(
+            db, document, ProcessingStatus.EMBEDDING, commit=False
+        )
+        
+        # Use dimensions parameter if model supports it
+        kwargs = {}
+        if self.model in [
+            OpenAIEmbeddingModel.TEXT_EMBEDDING_3_SMALL.value,
+            OpenAIEmbeddingModel.TEXT_EMBEDDING_3_LARGE.value
+        ]:
+            kwargs['dimensions'] = self.dimensions
+        
+        content_hashes = [
+            hashlib.sha256(chunk.chunk_text.encode('utf-8')).hexdigest()
+            for chunk in chunks
+        ]
+        semaphore = asyncio.Semaphore(self.MAX_PARALLEL_BATCHES)
+        
+        async def embed_batch(indices: List[int]) -> List[EmbeddingResult]:
+            texts = [chunks[index].chunk_text for index in indices]
+            async with semaphore:
+                async for attempt in AsyncRetrying(
+                    stop=stop_after_attempt(self.MAX_RETRIES),
+                    wait=wait_exponential_jitter(initial=1, max=8),
+                    retry=retry_if_exception(_is_transient_api_error),
+                    reraise=True
+                ):
+                    with attempt:
+                        if attempt.retry_state.attempt_number > 1:
+                            logger.warning(
+                                f"Retrying embedding batch of {len(texts)} chunks "
+                                f"(attempt {attempt.retry_state.attempt_number})"
+                            )
+                        return await self.openai_client.get_embeddings_batch(
+                            texts=texts,
+                            model=self.model,
+                            **kwargs
+                        )
         
         try:
-            # Process chunks in batches
-            for i in range(0, total_chunks, batch_size):
-                batch = chunks[i:i + batch_size]
-                batch_texts = [chunk.chunk_text for chunk in batch]
+            # Embeddings the chunks already have (e.g. when re-embedding), loaded
+            # once so storing each result does not need its own SELECT
+            existing = await self._get_existing_embeddings(db, [chunk.id for chunk in chunks])
+            
+            # Reuse cached embeddings for chunks whose text was embedded before
+            cached = await self._get_cached_embeddings(db, set(content_hashes))
+            pending = []
+            new_rows = []
+            for index, chunk in enumerate(chunks):
+                vector = cached.get(content_hashes[index])
+                if vector is None:
+                    pending.append(index)
+                    continue
+                self._store_embedding(
+                    chunk,
+                    EmbeddingResult(embedding=vector, model=self.model, usage={}),
+                    existing,
+                    new_rows
+                )
+                processed_chunks += 1
+            await self._insert_embeddings(db, new_rows)
+            
+            if processed_chunks:
+                logger.info(f"Reused {processed_chunks} cached embeddings for document {document.id}")
+                if progress_callback:
+                    await progress_callback(
+                        processed_chunks,
+                        total_chunks,
+                        f"Embedded {processed_chunks}/{total_chunks} chunks"
+                    )
+                await db.commit()
+            
+            # Group the remaining chunks by estimated token count so each request
+            # stays within the model's budget, then request up to
+            # MAX_PARALLEL_BATCHES at once, retrying transient failures
+            batches = [
+                [pending[position] for position in positions]
+                for positions in batch_by_tokens(
+                    [chunks[index].chunk_text for index in pending],
+                    max_tokens=self.MAX_BATCH_TOKENS,
+                    max_items=batch_size
+                )
+            ]
+            
+            logger.debug(f"Embedding {len(pending)} chunks in {len(batches)} batches")
+            batch_results = await asyncio.gather(
+                *[embed_batch(indices) for indices in batches],
+                return_exceptions=True
+            )
+            
+            # Results come back in batch order, so embeddings are written back
+            # in chunk order; the session is used sequentially from here on
+            for indices, embedding_results in zip(batches, batch_results):
+                batch = [chunks[index] for index in indices]
+                
+                if isinstance(embedding_results, (APIError, RateLimitError)):
+                    logger.error(f"API error processing batch: {embedding_results}")
+                    failed_chunks.extend([c.id for c in batch])
+                    continue
+                if isinstance(embedding_results, Exception):
+                    logger.error(f"Unexpected error processing batch: {embedding_results}")
+                    failed_chunks.extend([c.id for c in batch])
+                    continue
                 
                 try:
-                    # Generate embeddings for this batch
-                    logger.debug(f"Processing batch {i//batch_size + 1} ({len(batch)} chunks)")
-                    
-                    # Use dimensions parameter if model supports it
-                    kwargs = {}
-                    if self.model in [
-                        OpenAIEmbeddingModel.TEXT_EMBEDDING_3_SMALL.value,
-                        OpenAIEmbeddingModel.TEXT_EMBEDDING_3_LARGE.value
-                    ]:
-                        kwargs['dimensions'] = self.dimensions
-                    
-                    # Call the OpenAI client to get embeddings
-                    embedding_results = await self.openai_client.get_embeddings_batch(
-                        texts=batch_texts,
-                        model=self.model,
-                        **kwargs
-                    )
-                    
                     # Store embeddings in database
+                    new_rows = []
                     for chunk, embedding_result in zip(batch, embedding_results):
-                        await self._store_embedding(
-                            db, 
+                        self._store_embedding(
                             chunk, 
-                            embedding_result
+                            embedding_result,
+                            existing,
+                            new_rows
                         )
-                        
-                        # Track token usage if available
-                        if embedding_result.usage:
-                            total_tokens += embedding_result.usage.get('total_tokens', 0)
+                    await self._insert_embeddings(db, new_rows)
+                    
+                    await self._cache_embeddings(
+                        db,
+                        (
+                            (content_hashes[index], embedding_result.embedding)
+                            for index, embedding_result in zip(indices, embedding_results)
+                        )
+                    )
+                    
+                    # Usage is reported once per request, not per input
+                    if embedding_results and embedding_results[0].usage:
+                        total_tokens += embedding_results[0].usage.get('total_tokens', 0)
                     
                     processed_chunks += len(batch)
                     
@@ -206,25 +348,11 @@ class EmbeddingService:
                     # Commit batch to database
                     await db.commit()
                     
-                except (APIError, RateLimitError) as e:
-                    logger.error(f"API error processing batch: {e}")
-                    
-                    # Track failed chunks
-                    failed_chunks.extend([c.id for c in batch])
-                    
-                    # Implement exponential backoff for rate limits
-                    if isinstance(e, RateLimitError):
-                        wait_time = min(2 ** (i // batch_size), 60)  # Max 60 seconds
-                        logger.info(f"Rate limited. Waiting {wait_time} seconds...")
-                        await asyncio.sleep(wait_time)
-                    
-                    # Continue with next batch
-                    continue
-                    
                 except Exception as e:
-                    logger.error(f"Unexpected error processing batch: {e}")
-                    failed_chunks.extend([c.id for c in batch])
-                    continue
+                    # A failed statement aborts the transaction, so the
+                    # remaining batches cannot be stored on this session
+                    logger.error(f"Unexpected error storing batch: {e}")
+                    raise
             
             # Update document with final status
             if failed_chunks:
@@ -268,7 +396,13 @@ class EmbeddingService:
         except Exception as e:
             logger.error(f"Critical error during embedding generation: {e}")
             
-            # Update document status to failed
+            # Discard the failed transaction before using the session again
+            await db.rollback()
+            if isinstance(e, TRANSIENT_DB_ERRORS):
+                raise
+            
+            # Update document status to failed (rollback expired the document)
+            await db.refresh(document)
             await self._update_document_status(
                 db,
                 document,
@@ -277,30 +411,68 @@ class EmbeddingService:
             )
             
             raise EmbeddingServiceError(
-                f"Failed to generate embeddings for document {document.id}: {str(e)}"
-            )
+                f"Failed to generate embeddings for document {document_id}: {str(e)}"
+            ) from e
     
-    async def _store_embedding(
+    async def _get_existing_embeddings(
         self,
         db: AsyncSession,
+        chunk_ids: List[int]
+    ) -> Dict[int, DocumentEmbedding]:
+        """
+        Load the embeddings that already exist for the given chunks.
+        
+        Runs `SELECT ... WHERE chunk_id = ANY(:chunk_ids)` over the chunk_id
+        index, in slices of `EXISTING_LOOKUP_BATCH_SIZE`. The IDs are sent as
+        a single array parameter, so the SQL text does not depend on how
+        many there are and asyncpg reuses one prepared statement.
+        
+        Args:
+            db: Database session
+            chunk_ids: IDs of the chunks about to be embedded
+            
+        Returns:
+            A mapping from chunk ID to its existing embedding
+        """
+        existing = {}
+        for start in range(0, len(chunk_ids), self.EXISTING_LOOKUP_BATCH_SIZE):
+            result = await db.execute(
+                select(DocumentEmbedding).where(
+                    DocumentEmbedding.chunk_id == any_(bindparam(
+                        'chunk_ids',
+                        chunk_ids[start:start + self.EXISTING_LOOKUP_BATCH_SIZE],
+                        type_=ARRAY(BigInteger)
+                    ))
+                )
+            )
+            existing.update(
+                (embedding.chunk_id, embedding) for embedding in result.scalars()
+            )
+        return existing
+    
+    def _store_embedding(
+        self,
         chunk: DocumentChunk,
-        embedding_result: EmbeddingResult
+        embedding_result: EmbeddingResult,
+        existing: Dict[int, DocumentEmbedding],
+        new_rows: List[Dict[str, Any]]
     ):
         """
-        Store a single embedding in the database.
+        Store a single embedding.
+        
+        An existing embedding is updated in place (and flushed with the
+        session); a new one is appended to `new_rows`, to be written with
+        the rest of its batch by `_insert_embeddings`.
         
         Args:
-            db: Database session
             chunk: The chunk this embedding belongs to
             embedding_result: The embedding result from OpenAI
+            existing: Embeddings already stored, by chunk ID (see
+                      `_get_existing_embeddings`)
+            new_rows: Rows of the embeddings to insert
         """
-        # Check if embedding already exists (for idempotency)
-        existing = await db.execute(
-            select(DocumentEmbedding).filter(
-                DocumentEmbedding.chunk_id == chunk.id
-            )
-        )
-        existing_embedding = existing.scalar_one_or_none()
+        # Update the embedding if the chunk already has one (for idempotency)
+        existing_embedding = existing.get(chunk.id)
         
         if existing_embedding:
             # Update existing embedding
@@ -311,22 +483,111 @@ class EmbeddingService:
             logger.debug(f"Updated existing embedding for chunk {chunk.id}")
         else:
             # Create new embedding
-            embedding = DocumentEmbedding(
-                chunk_id=chunk.id,
-                embedding_vector=embedding_result.embedding,
-                model_name=self.model,
-                model_version=embedding_result.model,  # Full model version from API
-                embedding_dimension=len(embedding_result.embedding)
-            )
-            db.add(embedding)
+            new_rows.append({
+                'chunk_id': chunk.id,
+                'embedding_vector': embedding_result.embedding,
+                'model_name': self.model,
+                'model_version': embedding_result.model,  # Full model version from API
+                'embedding_dimension': len(embedding_result.embedding)
+            })
             logger.debug(f"Created new embedding for chunk {chunk.id}")
     
+    async def _insert_embeddings(
+        self,
+        db: AsyncSession,
+        rows: List[Dict[str, Any]]
+    ) -> None:
+        """
+        Insert new embeddings with multi-row INSERT statements.
+        
+        One statement per `INSERT_BATCH_SIZE` rows replaces the ORM's
+        per-object bookkeeping; the rows are not loaded into the session.
+        The insert is not committed.
+        
+        Args:
+            db: Database session
+            rows: Column values of the embeddings to insert
+        """
+        for start in range(0, len(rows), self.INSERT_BATCH_SIZE):
+            await db.execute(
+                pg_insert(DocumentEmbedding)
+                .values(rows[start:start + self.INSERT_BATCH_SIZE])
+            )
+    
+    async def _get_cached_embeddings(
+        self,
+        db: AsyncSession,
+        content_hashes: Iterable[str]
+    ) -> Dict[str, List[float]]:
+        """
+        Look up cached embeddings for the current model and dimension.
+        
+        Args:
+            db: Database session
+            content_hashes: SHA-256 hex digests of the chunk texts
+            
+        Returns:
+            A mapping from content hash to embedding for the cache hits
+        """
+        content_hashes = list(content_hashes)
+        cached: Dict[str, List[float]] = {}
+        
+        for start in range(0, len(content_hashes), self.CACHE_LOOKUP_BATCH_SIZE):
+            result = await db.execute(
+                select(EmbeddingCache.content_hash, EmbeddingCache.embedding_vector).where(
+                    # One array parameter keeps the SQL text (and asyncpg's
+                    # prepared statement) the same for every slice size
+                    EmbeddingCache.content_hash == any_(bindparam(
+                        'content_hashes',
+                        content_hashes[start:start + self.CACHE_LOOKUP_BATCH_SIZE],
+                        type_=ARRAY(String)
+                    )),
+                    EmbeddingCache.model_name == self.model,
+                    EmbeddingCache.embedding_dimension == self.dimensions
+                )
+            )
+            for content_hash, vector in result.all():
+                cached[content_hash] = vector.to_list()
+        
+        return cached
+    
+    async def _cache_embeddings(
+        self,
+        db: AsyncSession,
+        entries: Iterable[Tuple[str, List[float]]]
+    ):
+        """
+        Add embeddings to the cache, keeping existing entries.
+        
+        Args:
+            db: Database session
+            entries: Pairs of (content_hash, embedding)
+        """
+        rows = {
+            content_hash: {
+                'content_hash': content_hash,
+                'model_name': self.model,
+                'embedding_dimension': len(embedding),
+                'embedding_vector': embedding,
+            }
+            for content_hash, embedding in entries
+        }
+        if not rows:
+            return
+        
+        await db.execute(
+            pg_insert(EmbeddingCache)
+            .values(list(rows.values()))
+            .on_conflict_do_nothing()
+        )
+    
     async def _update_document_status(
         self,
         db: AsyncSession,
         document: Document,
         status: ProcessingStatus,
-        error_message: Optional[str] = None
+        error_message: Optional[str] = None,
+        commit: bool = True
     ):
         """
         Update the processing status of a document.
@@ -336,6 +597,8 @@ class EmbeddingService:
             document: The document to update
             status: The new processing status
             error_message: Optional error message if status is FAILED
+            commit: Whether to commit right away. Intermediate statuses are
+                    left to the next commit of the session.
         """
         document.processing_status = status
         
@@ -348,7 +611,8 @@ class EmbeddingService:
             document.processing_error = error_message
         
         db.add(document)
-        await db.commit()
+        if commit:
+            await db.commit()
         
         logger.info(f"Updated document {document.id} status to {status.value}")
     
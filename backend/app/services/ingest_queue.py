@@ -0,0 +1,193 @@
+"""
+In-process ingest queue for document processing.
+
+Uploads used to be processed with FastAPI's BackgroundTasks: every upload
+started its own pipeline right after the response, so a burst of uploads
+ran that many multi-minute pipelines at once and competed with every other
+request for the event loop and the database pool. Jobs now go through a
+queue drained by a fixed number of long-lived worker tasks, which bounds
+how many documents are processed concurrently.
+
+Jobs that raise are retried with exponential backoff; a job's cleanup
+callback runs once, after its last attempt. Jobs still waiting when the
+queue is stopped are never run: their on_drop callback and then their
+cleanup callback run instead.
+"""
+
+import asyncio
+import inspect
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class IngestJob:
+    """
+    A unit of work for the ingest queue.
+
+    Attributes:
+        name (str): Identifier used in logs (e.g. "document:<uuid>").
+        func (Callable): The coroutine function to run.
+        kwargs (Dict[str, Any]): Keyword arguments for `func`.
+        cleanup (Optional[Callable]): Called once after the last attempt,
+                                      whether it succeeded or not.
+        on_drop (Optional[Callable]): Called instead of `func` when the queue
+                                      is stopped before the job ran.
+        attempts (int): Number of attempts made so far.
+    """
+    name: str
+    func: Callable[..., Awaitable[Any]]
+    kwargs: Dict[str, Any] = field(default_factory=dict)
+    cleanup: Optional[Callable[[], Any]] = None
+    on_drop: Optional[Callable[[], Any]] = None
+    attempts: int = 0
+
+
+class IngestQueue:
+    """
+    A bounded pool of worker tasks consuming an asyncio queue.
+
+    Attributes:
+        max_jobs (int): Number of jobs processed concurrently.
+        max_retries (int): Retries after the first failed attempt.
+        backoff_base (float): Delay before the first retry, in seconds;
+                              doubled on each further retry.
+        backoff_max (float): Upper bound of the retry delay, in seconds.
+    """
+
+    def __init__(
+        self,
+        max_jobs: int = 4,
+        max_retries: int = 3,
+        backoff_base: float = 1.0,
+        backoff_max: float = 8.0
+    ):
+        self.max_jobs = max_jobs
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._queue: "asyncio.Queue[IngestJob]" = asyncio.Queue()
+        self._workers: List[asyncio.Task] = []
+        self._active = 0
+
+    def start(self) -> None:
+        """Start the worker tasks (idempotent)."""
+        if self._workers:
+            return
+        self._workers = [
+            asyncio.create_task(self._worker(), name=f"ingest-worker-{i}")
+            for i in range(self.max_jobs)
+        ]
+        logger.info(f"Started ingest queue with {self.max_jobs} workers")
+
+    async def stop(self) -> None:
+        """Cancel the workers, then drop the jobs still queued."""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        
+        while not self._queue.empty():
+            job = self._queue.get_nowait()
+            logger.warning(f"Dropping ingest job {job.name} on shutdown")
+            await self._call(job, job.on_drop, "Drop handler")
+            await self._call(job, job.cleanup, "Cleanup")
+            self._queue.task_done()
+
+    async def enqueue(self, job: IngestJob) -> None:
+        """
+        Add a job to the queue, starting the workers if needed.
+
+        Args:
+            job (IngestJob): The job to run.
+        """
+        self.start()
+        await self._queue.put(job)
+        logger.info(f"Enqueued ingest job {job.name} ({self._queue.qsize()} waiting)")
+
+    def stats(self) -> Dict[str, int]:
+        """Return the number of waiting and running jobs."""
+        return {
+            'queued': self._queue.qsize(),
+            'active': self._active,
+            'workers': len(self._workers),
+        }
+
+    async def _worker(self) -> None:
+        """Run jobs from the queue forever."""
+        while True:
+            job = await self._queue.get()
+            self._active += 1
+            try:
+                await self._run(job)
+            finally:
+                self._active -= 1
+                self._queue.task_done()
+
+    async def _run(self, job: IngestJob) -> None:
+        """Run a job with retries, then its cleanup callback."""
+        try:
+            while True:
+                job.attempts += 1
+                try:
+                    await job.func(**job.kwargs)
+                    return
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    if job.attempts > self.max_retries:
+                        logger.error(f"Ingest job {job.name} failed after {job.attempts} attempts: {e}")
+                        return
+                    delay = min(self.backoff_base * 2 ** (job.attempts - 1), self.backoff_max)
+                    logger.warning(
+                        f"Ingest job {job.name} failed (attempt {job.attempts}): {e}. "
+                        f"Retrying in {delay:.0f}s"
+                    )
+                    await asyncio.sleep(delay)
+        finally:
+            await self._call(job, job.cleanup, "Cleanup")
+
+    @staticmethod
+    async def _call(job: IngestJob, callback: Optional[Callable[[], Any]], label: str) -> None:
+        """Run one of a job's (sync or async) callbacks, logging its failure."""
+        if callback is None:
+            return
+        try:
+            result = callback()
+            if inspect.isawaitable(result):
+                await result
+        except Exception as e:
+            logger.warning(f"{label} of ingest job {job.name} failed: {e}")
+
+
+# Global ingest queue instance
+_ingest_queue: Optional[IngestQueue] = None
+
+
+def get_ingest_queue() -> IngestQueue:
+    """
+    Get or create the global ingest queue.
+
+    Returns:
+        IngestQueue: The shared queue, configured from settings.
+    """
+    global _ingest_queue
+    if _ingest_queue is None:
+        _ingest_queue = IngestQueue(
+            max_jobs=settings.INGEST_MAX_CONCURRENT_JOBS,
+            max_retries=settings.INGEST_MAX_RETRIES
+        )
+    return _ingest_queue
+
+
+async def shutdown_ingest_queue() -> None:
+    """Stop the global ingest queue if it was created."""
+    global _ingest_queue
+    if _ingest_queue is not None:
+        await _ingest_queue.stop()
+        _ingest_queue = None
@@ -0,0 +1,73 @@
+"""
+Ephemeral progress tracking for document processing.
+
+Intermediate pipeline stages (parsing, chunking, embedding progress) change
+several times per document and are only interesting while the document is
+being processed, so they are kept out of the database: the background task
+reports them here and the status endpoint reads them back, falling back to
+the persisted document when no entry exists. Only terminal states
+(COMPLETED/FAILED) are committed to PostgreSQL, which stays the source of
+truth.
+
+Entries live in the memory of the worker process running the background
+task and expire after one hour, so a poll served by another worker simply
+sees the last persisted state.
+"""
+
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+from uuid import UUID
+
+from app.core.cache import TTLCache
+from app.models.document import ProcessingStatus
+
+PROGRESS_TTL_SECONDS = 60 * 60
+
+_progress = TTLCache(ttl_seconds=PROGRESS_TTL_SECONDS, max_entries=10000)
+
+
+async def set_progress(
+    document_id: UUID,
+    stage: ProcessingStatus,
+    processed: Optional[int] = None,
+    total: Optional[int] = None
+) -> None:
+    """
+    Record the current processing stage of a document.
+
+    Args:
+        document_id: The UUID of the document being processed
+        stage: The pipeline stage the document is in
+        processed: Number of chunks processed so far, if known
+        total: Total number of chunks, if known
+    """
+    _progress.set(str(document_id), {
+        'stage': stage,
+        'processed': processed,
+        'total': total,
+        'updated_at': datetime.now(timezone.utc)
+    })
+
+
+async def get_progress(document_id: UUID) -> Optional[Dict[str, Any]]:
+    """
+    Return the last recorded progress of a document, if any.
+
+    Args:
+        document_id: The UUID of the document
+
+    Returns:
+        A dictionary with `stage`, `processed`, `total` and `updated_at`,
+        or None if the document is not being processed by this worker
+    """
+    return _progress.get(str(document_id))
+
+
+async def clear_progress(document_id: UUID) -> None:
+    """
+    Forget the progress of a document once its final state is persisted.
+
+    Args:
+        document_id: The UUID of the document
+    """
+    _progress.delete(str(document_id))
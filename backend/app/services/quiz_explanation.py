@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import functools
 import logging
 import textwrap
 from typing import List, Optional
@@ -168,3 +169,22 @@ class QuizExplanationService:
             "You are a supportive teaching assistant. Ground every claim in the provided chunked context and reference "
             "chunk numbers like [Chunk 2] when citing evidence. Respond concisely without any introductory phrases."
         )
+
+
+@functools.lru_cache(maxsize=1)
+def get_quiz_explanation_service() -> QuizExplanationService:
+    """Return the shared explanation service, created on first use.
+
+    Reusing one instance keeps the OpenAI client's connection pool warm across
+    requests; it is closed on application shutdown.
+    """
+
+    return QuizExplanationService()
+
+
+async def close_quiz_explanation_service() -> None:
+    """Close the shared explanation service if it was ever created."""
+
+    if get_quiz_explanation_service.cache_info().currsize:
+        await get_quiz_explanation_service().aclose()
+        get_quiz_explanation_service.cache_clear()
@@ -0,0 +1,96 @@
+"""
+Object storage (S3) access.
+
+Building a boto3 client is expensive: it loads the service model, resolves
+endpoints and opens fresh TLS connections on first use. The application
+therefore shares a single client, which boto3 documents as safe to use from
+multiple threads, and reuses its pooled HTTPS connections across requests.
+"""
+
+import functools
+import logging
+
+import boto3
+from botocore.config import Config
+from botocore.exceptions import ClientError
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Sized for concurrent uploads/deletes without "Connection pool is full" warnings
+S3_MAX_POOL_CONNECTIONS = 50
+
+# Presigned URLs are reused until shortly before they expire, so a client
+# never receives a URL that is about to stop working
+PRESIGNED_URL_REFRESH_MARGIN = 600
+_presigned_urls = TTLCache(
+    ttl_seconds=max(settings.PROFILE_PICTURE_URL_EXPIRES - PRESIGNED_URL_REFRESH_MARGIN, 0),
+    max_entries=10000
+)
+
+
+@functools.lru_cache(maxsize=1)
+def get_s3_client():
+    """
+    Get or create the shared S3 client.
+
+    Returns:
+        botocore.client.S3: The S3 client configured from settings.
+    """
+    logger.info("Creating shared S3 client")
+    return boto3.client(
+        's3',
+        aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+        aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+        region_name=settings.AWS_REGION,
+        config=Config(
+            max_pool_connections=S3_MAX_POOL_CONNECTIONS,
+            retries={'max_attempts': 3, 'mode': 'adaptive'},
+            signature_version='s3v4'
+        )
+    )
+
+
+def presigned_get_url(key: str) -> str:
+    """
+    Get a short-lived presigned GET URL for an object in the application bucket.
+
+    Signing is a local HMAC computation, but serializing a list of users
+    would repeat it for every row on every request: the URL for a key is
+    cached and reused for most of its lifetime.
+
+    Args:
+        key (str): The object key.
+
+    Returns:
+        str: A URL granting read access to the object for up to
+             `settings.PROFILE_PICTURE_URL_EXPIRES` seconds.
+    """
+    url = _presigned_urls.get(key)
+    if url is None:
+        url = get_s3_client().generate_presigned_url(
+            'get_object',
+            Params={'Bucket': settings.AWS_BUCKET_NAME, 'Key': key},
+            ExpiresIn=settings.PROFILE_PICTURE_URL_EXPIRES
+        )
+        _presigned_urls.set(key, url)
+    return url
+
+
+def delete_object_quietly(key: str) -> None:
+    """
+    Delete an object from the application bucket, logging any failure.
+
+    Meant to run as a background task once the database no longer refers
+    to the object: a failed delete only leaves an orphaned object behind.
+
+    Args:
+        key (str): The key of the object to delete.
+    """
+    _presigned_urls.delete(key)
+    try:
+        get_s3_client().delete_object(Bucket=settings.AWS_BUCKET_NAME, Key=key)
+    except ClientError as e:
+        logger.warning(f"Failed to delete S3 object {key}: {e}")
@@ -8,6 +8,7 @@ are optimized for different types of content and use cases.
 
 import re
 import logging
+import functools
 from typing import List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass
 from abc import ABC, abstractmethod
@@ -58,6 +59,49 @@ class TextChunk:
         }
 
 
+def _find_split_points(
+    text: str,
+    chunk_size: int,
+    stride: int,
+    respect_word_boundaries: bool = True
+) -> List[Tuple[int, int]]:
+    """
+    Compute the (start, end) offsets of fixed-size chunks.
+    
+    Only offsets are computed here; the caller slices the original string.
+    The word-boundary search uses str.rfind, so the scan over each window
+    runs in C rather than in a Python loop.
+    
+    Args:
+        text: The text to split
+        chunk_size: Target size for each chunk
+        stride: Distance between the starts of consecutive chunks
+        respect_word_boundaries: If True, end chunks at a space when one
+                                 exists in the last 20% of the window
+        
+    Returns:
+        List of (start, end) character offsets
+    """
+    text_length = len(text)
+    min_boundary = chunk_size * 0.8
+    split_points = []
+    
+    for chunk_start in range(0, text_length, stride):
+        chunk_end = min(chunk_start + chunk_size, text_length)
+        
+        # Try to find a word boundary near the chunk end
+        if respect_word_boundaries and chunk_end < text_length:
+            space_pos = text.rfind(' ', chunk_start, chunk_end)
+            if space_pos > chunk_start + min_boundary:  # Within 80% of target size
+                chunk_end = space_pos
+        
+        split_points.append((chunk_start, chunk_end))
+        if chunk_end >= text_length:
+            break
+    
+    return split_points
+
+
 class ChunkingStrategy(ABC):
     """
     Abstract base class for text chunking strategies.
@@ -153,21 +197,12 @@ class FixedSizeChunking(ChunkingStrategy):
         if stride <= 0:
             stride = self.chunk_size  # No overlap if misconfigured
         
-        current_pos = 0
         chunk_index = 0
+        split_points = _find_split_points(
+            text, self.chunk_size, stride, self.respect_word_boundaries
+        )
         
-        while current_pos < len(text):
-            # Determine chunk boundaries
-            chunk_start = current_pos
-            chunk_end = min(current_pos + self.chunk_size, len(text))
-            
-            # Adjust for word boundaries if needed
-            if self.respect_word_boundaries and chunk_end < len(text):
-                # Try to find a word boundary near the chunk end
-                space_pos = text.rfind(' ', chunk_start, chunk_end)
-                if space_pos > chunk_start + (self.chunk_size * 0.8):  # Within 80% of target size
-                    chunk_end = space_pos
-            
+        for chunk_start, chunk_end in split_points:
             # Extract chunk text
             chunk_text = text[chunk_start:chunk_end].strip()
             
@@ -181,11 +216,6 @@ class FixedSizeChunking(ChunkingStrategy):
                 )
                 chunks.append(chunk)
                 chunk_index += 1
-            
-            # Move to next chunk position
-            if chunk_end >= len(text):
-                break
-            current_pos += stride
         
         logger.info(f"Created {len(chunks)} chunks using fixed-size strategy")
         return chunks
@@ -254,14 +284,12 @@ class SentenceChunking(ChunkingStrategy):
                 if self.chunk_overlap > 0:
                     # Keep last few sentences for overlap
                     overlap_size = 0
-                    overlap_sentences = []
-                    for sent in reversed(current_chunk):
-                        overlap_size += len(sent)
-                        overlap_sentences.insert(0, sent)
-                        if overlap_size >= self.chunk_overlap:
-                            break
-                    current_chunk = overlap_sentences
-                    current_size = sum(len(s) for s in current_chunk)
+                    overlap_from = len(current_chunk)
+                    while overlap_from > 0 and overlap_size < self.chunk_overlap:
+                        overlap_from -= 1
+                        overlap_size += len(current_chunk[overlap_from])
+                    current_chunk = current_chunk[overlap_from:]
+                    current_size = overlap_size
                     current_start = chunk_end - current_size
                 else:
                     current_chunk = []
@@ -469,9 +497,8 @@ class TextChunker:
         chunk_size = chunk_size or self.default_chunk_size
         chunk_overlap = chunk_overlap or self.default_overlap
         
-        # Create strategy instance
-        strategy_class = self.strategies[strategy]
-        chunker = strategy_class(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+        # Strategy instances are stateless, so one per configuration is reused
+        chunker = self.get_strategy(strategy, chunk_size, chunk_overlap)
         
         # Perform chunking
         chunks = chunker.chunk_text(text, metadata)
@@ -483,6 +510,21 @@ class TextChunker:
         
         return chunks
     
+    @functools.lru_cache(maxsize=32)
+    def get_strategy(self, strategy: str, chunk_size: int, chunk_overlap: int) -> ChunkingStrategy:
+        """
+        Return the strategy instance for a configuration, creating it once.
+        
+        Args:
+            strategy: Name of the chunking strategy
+            chunk_size: Target size for chunks
+            chunk_overlap: Overlap between chunks
+            
+        Returns:
+            The ChunkingStrategy instance
+        """
+        return self.strategies[strategy](chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+    
     def estimate_chunks(self, text_length: int, chunk_size: int = None, chunk_overlap: int = None) -> int:
         """
         Estimate the number of chunks that will be created.
@@ -511,4 +553,26 @@ class TextChunker:
 
 
 # Create a global chunker instance
-text_chunker = TextChunker()
\ No newline at end of file
+text_chunker = TextChunker()
+
+
+def chunk_text(
+    text: str,
+    strategy: str = 'fixed_size',
+    chunk_size: int = None,
+    chunk_overlap: int = None,
+    metadata: Optional[Dict[str, Any]] = None
+) -> List[TextChunk]:
+    """
+    Chunk text with the global chunker.
+    
+    Module-level counterpart of `TextChunker.chunk_text` that can be
+    submitted to a process pool.
+    """
+    return text_chunker.chunk_text(
+        text=text,
+        strategy=strategy,
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
+        metadata=metadata
+    )
\ No newline at end of file
@@ -2,7 +2,8 @@
 set -euo pipefail
 
 # Allow overriding the default command
-DEFAULT_CMD=("uvicorn" "app.main:app" "--host" "0.0.0.0" "--port" "8000")
+# uvicorn reads the number of worker processes from WEB_CONCURRENCY
+DEFAULT_CMD=("uvicorn" "app.main:app" "--host" "0.0.0.0" "--port" "8000" "--loop" "uvloop" "--http" "httptools")
 
 # Wait for the database to be ready before running migrations/app
 python <<'PY'
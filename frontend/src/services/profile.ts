@@ -1,5 +1,9 @@
 import api from './api';
-import { User, UserUpdate } from '@/types';
+import { ProfilePictureUploadTarget, User, UserUpdate } from '@/types';
+
+// dimensione massima (lato) e peso massimo dell'immagine caricata su S3
+const PICTURE_MAX_DIMENSION = 500;
+const PICTURE_MAX_BYTES = 2 * 1024 * 1024;
 
 class ProfileService {
 
@@ -22,18 +26,61 @@ class ProfileService {
             throw new Error('Image must be less than 5MB');
         }
 
-        // FormData per upload multipart
+        // ridimensiona nel browser: al backend non arrivano mai i byte dell'immagine
+        const picture = await this.resizeImage(file);
+
+        // form presigned per caricare direttamente su S3
+        const { data: target } = await api.get<ProfilePictureUploadTarget>(
+            'users/me/profile-picture/presign'
+        );
+
         const formData = new FormData();
-        formData.append('file', file);
+        Object.entries(target.fields).forEach(([name, value]) => formData.append(name, value));
+        formData.append('file', picture);
 
-        const response = await api.post<User>('users/me/profile-picture', formData, {
-            headers: {
-                'Content-Type': undefined as any
-            }
+        // fetch e non l'istanza api: S3 non deve ricevere l'header Authorization
+        const upload = await fetch(target.url, { method: 'POST', body: formData });
+        if (!upload.ok) {
+            throw new Error('Failed to upload image');
+        }
+
+        const response = await api.post<User>('users/me/profile-picture/confirm', {
+            key: target.key
         });
         return response.data;
     }
 
+    // ridimensiona l'immagine entro PICTURE_MAX_DIMENSION e la codifica in JPEG,
+    // abbassando la qualità finché non rientra in PICTURE_MAX_BYTES
+    private async resizeImage(file: File): Promise<Blob> {
+        const bitmap = await createImageBitmap(file);
+        const scale = Math.min(1, PICTURE_MAX_DIMENSION / Math.max(bitmap.width, bitmap.height));
+
+        const canvas = document.createElement('canvas');
+        canvas.width = Math.round(bitmap.width * scale);
+        canvas.height = Math.round(bitmap.height * scale);
+        canvas.getContext('2d')!.drawImage(bitmap, 0, 0, canvas.width, canvas.height);
+        bitmap.close();
+
+        let quality = 0.9;
+        let blob = await this.canvasToJpeg(canvas, quality);
+        while (blob.size > PICTURE_MAX_BYTES && quality > 0.3) {
+            quality -= 0.1;
+            blob = await this.canvasToJpeg(canvas, quality);
+        }
+        return blob;
+    }
+
+    private canvasToJpeg(canvas: HTMLCanvasElement, quality: number): Promise<Blob> {
+        return new Promise((resolve, reject) => {
+            canvas.toBlob(
+                blob => (blob ? resolve(blob) : reject(new Error('Failed to encode image'))),
+                'image/jpeg',
+                quality
+            );
+        });
+    }
+
     async deleteProfilePicture(): Promise<User> {
         const response = await api.delete<User>('users/me/profile-picture');
         return response.data;
@@ -16,7 +16,7 @@
  */
 
 import api from '@/services/api';
-import { Subject, SubjectCreate, SubjectUpdate } from '@/types';
+import { Subject, SubjectCreate, SubjectList, SubjectUpdate } from '@/types';
 
 /**
  * Subject Service Class
@@ -38,12 +38,26 @@ class SubjectService {
    * 
    * DESIGN: Restituiamo sempre una Promise per consistenza,
    * anche se potremmo usare async/await internamente.
+   * 
+   * Il backend pagina con un cursore (keyset): seguiamo `next_cursor_id`
+   * finché ci sono altre pagine.
    */
     async getSubjects(includeArchived: boolean = false): Promise<Subject[]> {
-        const response = await api.get<Subject[]>('/subjects', {
-            params: { include_archived: includeArchived }
-        });
-        return response.data;
+        const subjects: Subject[] = [];
+        let cursorId: number | null = null;
+        
+        do {
+            const { data }: { data: SubjectList } = await api.get<SubjectList>('/subjects', {
+                params: {
+                    include_archived: includeArchived,
+                    ...(cursorId !== null && { cursor_id: cursorId })
+                }
+            });
+            subjects.push(...data.items);
+            cursorId = data.next_cursor_id;
+        } while (cursorId !== null);
+        
+        return subjects;
     }
     
   /**
@@ -35,6 +35,13 @@ export interface UserUpdate {
   allow_ai_training?: boolean;
 }
 
+export interface ProfilePictureUploadTarget {
+  url: string;
+  fields: Record<string, string>;
+  key: string;
+  expires_in: number;
+}
+
 // Auth related types
 export interface LoginCredentials {
   username: string; // Can be email or username
@@ -90,6 +97,11 @@ export interface SubjectUpdate {
   is_archived?: boolean;
 }
 
+export interface SubjectList {
+  items: Subject[];
+  next_cursor_id: number | null;
+}
+
 // API Response types
 export interface ApiError {
   detail: string;